@@ -0,0 +1,321 @@
+"""Benchmarks for the Bingomatic generation pipeline.
+
+Run every benchmark and save the timings as a baseline:
+
+    uv run python benchmarks/bench.py run --output benchmarks/baseline.json
+
+Later, run them again and flag anything slower than the baseline by more
+than the threshold (exits with status 1 if something regressed):
+
+    uv run python benchmarks/bench.py compare benchmarks/baseline.json
+
+Everything runs offline against generated inputs in a temporary directory.
+"""
+
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+import reportlab
+import yaml
+
+from bingomatic import pdf
+from bingomatic.config import load_and_validate_config
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.2  # Fractional slowdown that counts as a regression
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LOGO_PATH = REPO_ROOT / "images" / "bingomatic_logo.png"
+
+# Vocabulary for realistic DevOps conference phrases
+_TERMS = [
+    "Kubernetes", "CI/CD", "GitOps", "Observability", "Terraform", "SRE",
+    "Platform Engineering", "Incident", "Postmortem", "Service mesh", "YAML",
+    "Blameless", "Toil", "Error budget", "On-call", "Chaos engineering",
+    "OpenTelemetry", "Feature flags", "Canary", "Rollback", "Microservices",
+    "Monolith", "DORA metrics", "Shift left", "DevSecOps", "Serverless",
+    "Infrastructure as Code", "Developer experience", "Golden path", "SLO",
+]  # fmt: skip
+_TEMPLATES = [
+    "{a}",
+    "Mentions {a}",
+    "{a} in prod",
+    "{a} vs {b}",
+    "Says {a} is dead",
+    "{a} + {b} = {c}",
+    "Someone asks about {a} during the {b} talk",
+    "Speaker apologizes for the {a} demo",
+]
+
+
+class Benchmark(NamedTuple):
+    """A timed operation and how many times to repeat it."""
+
+    setup: Callable[[Path], Callable[[], object]]
+    repeat: int
+
+
+def phrase_pool(count: int, seed: int = 0) -> list[str]:
+    """Generate a deterministic pool of conference-style phrases.
+
+    Args:
+        count: Number of phrases
+        seed: Seed for the phrase generator
+
+    Returns:
+        Phrases of mixed length, from single words to full sentences
+    """
+    rng = random.Random(seed)
+    return [
+        rng.choice(_TEMPLATES).format(
+            a=rng.choice(_TERMS), b=rng.choice(_TERMS), c=rng.choice(_TERMS)
+        )
+        + (f" #{index}" if index >= len(_TERMS) else "")
+        for index in range(count)
+    ]
+
+
+def _fit_text(cached: bool) -> Callable[[Path], Callable[[], object]]:
+    def setup(workdir: Path) -> Callable[[], object]:
+        pdf.register_fonts()
+        pool = phrase_pool(1000)
+        size = pdf.SQUARE_SIZE - 2 * pdf.SQUARE_PADDING
+
+        def fit_pool() -> None:
+            if not cached:
+                pdf.clear_layout_cache()
+            for phrase in pool:
+                pdf._fit_text_in_square(phrase, size, size)
+
+        fit_pool()
+        return fit_pool
+
+    return setup
+
+
+def _generate(card_count: int) -> Callable[[Path], Callable[[], object]]:
+    def setup(workdir: Path) -> Callable[[], object]:
+        pdf.register_fonts()
+        pool = phrase_pool(200)
+        output_path = workdir / f"cards-{card_count}.pdf"
+
+        def generate() -> Path:
+            return pdf.generate_pdf(
+                output_path,
+                card_count=card_count,
+                event_name="DevOpsDays Benchmark 2026",
+                logo_path=LOGO_PATH,
+                bingo_squares=pool,
+                seed=1,
+            )
+
+        return generate
+
+    return setup
+
+
+def _register_fonts(workdir: Path) -> Callable[[], object]:
+    def register() -> None:
+        pdf._fonts_registered = False
+        pdf.register_fonts()
+
+    return register
+
+
+def _load_config(phrase_count: int) -> Callable[[Path], Callable[[], object]]:
+    def setup(workdir: Path) -> Callable[[], object]:
+        config_path = workdir / f"config-{phrase_count}.yaml"
+        config = {
+            "event_name": "DevOpsDays Benchmark 2026",
+            "logo_location": str(LOGO_PATH),
+            "output_directory": str(workdir),
+            "card_count": 100,
+            "bingo_squares": phrase_pool(phrase_count),
+        }
+        config_path.write_text(yaml.safe_dump(config, sort_keys=False))
+        return lambda: load_and_validate_config(config_path)
+
+    return setup
+
+
+BENCHMARKS = {
+    "fit_text_in_square": Benchmark(_fit_text(cached=False), repeat=5),
+    "fit_text_in_square_cached": Benchmark(_fit_text(cached=True), repeat=5),
+    "generate_pdf_2": Benchmark(_generate(2), repeat=10),
+    "generate_pdf_200": Benchmark(_generate(200), repeat=3),
+    "generate_pdf_20000": Benchmark(_generate(20000), repeat=1),
+    "register_fonts": Benchmark(_register_fonts, repeat=5),
+    "load_config_5k": Benchmark(_load_config(5_000), repeat=5),
+    "load_config_50k": Benchmark(_load_config(50_000), repeat=3),
+}
+
+
+def run_benchmarks(
+    names: list[str], repeat: int | None = None
+) -> dict[str, dict[str, float]]:
+    """Time the named benchmarks.
+
+    Args:
+        names: Benchmarks to run, in order
+        repeat: Optional repeat count overriding each benchmark's own
+
+    Returns:
+        Mapping of benchmark name to its best and median time in seconds
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in names:
+            benchmark = BENCHMARKS[name]
+            operation = benchmark.setup(Path(tmp_dir))
+            timings = []
+            for _ in range(repeat or benchmark.repeat):
+                start = time.perf_counter()
+                operation()
+                timings.append(time.perf_counter() - start)
+            results[name] = {
+                "best": min(timings),
+                "median": statistics.median(timings),
+                "repeat": len(timings),
+            }
+            click.echo(f"{name:<28}{min(timings):>10.4f}s", err=True)
+    return results
+
+
+def environment() -> dict[str, str]:
+    """Describe the machine and library versions the timings came from."""
+    return {
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare_results(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[tuple[str, float, float, bool]]:
+    """Compare best times against a baseline.
+
+    Args:
+        baseline: Results of an earlier run
+        current: Results of this run
+        threshold: Fractional slowdown that counts as a regression
+
+    Returns:
+        (name, baseline seconds, current seconds, regressed) for every
+        benchmark present in both runs
+    """
+    rows = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["best"]
+        after = result["best"]
+        rows.append((name, before, after, after > before * (1 + threshold)))
+    return rows
+
+
+@click.group()
+def main() -> None:
+    """Benchmark the Bingomatic generation pipeline."""
+
+
+_only_option = click.option(
+    "--only",
+    multiple=True,
+    type=click.Choice(list(BENCHMARKS)),
+    help="Run only this benchmark. Repeatable.",
+)
+_repeat_option = click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Override every benchmark's repeat count.",
+)
+
+
+@main.command()
+@_only_option
+@_repeat_option
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the results to this JSON file instead of stdout.",
+)
+def run(only: tuple[str, ...], repeat: int | None, output: Path | None) -> None:
+    """Run the benchmarks and record the timings."""
+    document = {
+        "version": BASELINE_VERSION,
+        "environment": environment(),
+        "results": run_benchmarks(list(only or BENCHMARKS), repeat),
+    }
+    text = json.dumps(document, indent=2) + "\n"
+    if output is None:
+        click.echo(text, nl=False)
+    else:
+        output.write_text(text)
+        click.echo(f"Baseline written to {output}", err=True)
+
+
+@main.command()
+@click.argument(
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@_only_option
+@_repeat_option
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Fractional slowdown that counts as a regression.",
+)
+def compare(
+    baseline_path: Path,
+    only: tuple[str, ...],
+    repeat: int | None,
+    threshold: float,
+) -> None:
+    """Run the benchmarks and compare them with a baseline."""
+    document = json.loads(baseline_path.read_text())
+    if document.get("version") != BASELINE_VERSION:
+        click.echo(f"Unsupported baseline version in {baseline_path}", err=True)
+        sys.exit(2)
+    baseline = document["results"]
+
+    names = [name for name in (only or BENCHMARKS) if name in baseline]
+    rows = compare_results(baseline, run_benchmarks(names, repeat), threshold)
+
+    if document.get("environment") != environment():
+        click.echo("Note: baseline was recorded on a different environment")
+
+    regressions = 0
+    for name, before, after, regressed in rows:
+        change = (after - before) / before * 100
+        status = "REGRESSION" if regressed else "ok"
+        regressions += regressed
+        click.echo(
+            f"{name:<28}{before:>10.4f}s{after:>10.4f}s{change:>+9.1f}%  {status}"
+        )
+
+    if regressions:
+        click.echo(f"{regressions} benchmark(s) slower than {threshold:.0%} allows")
+        sys.exit(1)
+    click.echo("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""Generating cards for many event configs in one process.
+
+Every config in a batch is generated by the same process (or by a small
+pool of processes), so fonts are registered, ReportLab is imported and
+shared logos are decoded once rather than once per event, and the phrase
+layout cache carries over from one config to the next. A config that
+fails is reported in its result instead of stopping the batch.
+"""
+
+import os
+import secrets
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import NamedTuple
+
+from bingomatic.cards import CardCapacityError, CardSampler, check_unique_capacity
+from bingomatic.config import ConfigError, get_card_count, load_and_validate_config
+from bingomatic.export import DEFAULT_EXPORT_DPI, export_cards
+from bingomatic.imposition import page_layout
+from bingomatic.manifest import ManifestWriter, load_manifest
+from bingomatic.merge import PdfMergeError, PdfMerger, split_pdf
+from bingomatic.parallel import STREAM_CHUNK_CARDS, generate_pdf_parallel
+from bingomatic.pdf import LOGO_DPI, generate_pdf
+from bingomatic.pdfsize import format_size
+from bingomatic.roster import RosterError, count_roster, read_roster
+from bingomatic.runrecord import (
+    RunRecord,
+    load_run_record,
+    run_fingerprint,
+    run_record_path,
+    save_run_record,
+)
+from bingomatic.timings import stage
+
+CONFIG_SUFFIXES = (".yaml", ".yml")
+ESTIMATE_PAGES = (1, 4)  # Pages of the two sample renders a size estimate uses
+
+
+class BatchError(Exception):
+    """Raised when a config's cards can't be generated."""
+
+    pass
+
+
+class GeneratedCards(NamedTuple):
+    """Files written for one config."""
+
+    output_path: Path
+    manifest_path: Path | None
+    card_count: int
+    rendered_count: int  # Cards rendered by this run; 0 if already up to date
+    parts: tuple[Path, ...] = ()  # The PDF split to fit a size limit, if it was
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one config in a batch."""
+
+    config_path: Path
+    generated: GeneratedCards | None
+    seconds: float
+    error: str | None = None
+
+
+def find_configs(paths: Iterable[Path | str]) -> list[Path]:
+    """Expand config files and directories of them into a list of configs.
+
+    Args:
+        paths: Config files, or directories whose .yaml and .yml files are
+            all configs
+
+    Returns:
+        Config paths in the order given, with each directory's configs
+        sorted by name and repeated configs listed once
+    """
+    configs = []
+    seen = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            found = sorted(
+                child
+                for child in path.iterdir()
+                if child.suffix in CONFIG_SUFFIXES and child.is_file()
+            )
+        else:
+            found = [path]
+        for config_path in found:
+            key = config_path.resolve()
+            if key not in seen:
+                seen.add(key)
+                configs.append(config_path)
+    return configs
+
+
+def generate_config(
+    config_path: Path | None = None,
+    output_name: str | None = None,
+    workers: int = 1,
+    stream: bool = False,
+    manifest: bool = True,
+    unique: str | None = None,
+    seed: int | None = None,
+    force: bool = False,
+    max_size: int | None = None,
+    split: bool = False,
+    card_format: str = "pdf",
+    dpi: int = DEFAULT_EXPORT_DPI,
+    zip_output: bool = False,
+    roster_path: Path | str | None = None,
+    roster_start: int = 0,
+    config_cache_dir: Path | str | None = None,
+    **options,
+) -> GeneratedCards:
+    """Generate the cards of one config file.
+
+    Each run leaves a run record next to its PDF (see bingomatic.runrecord).
+    When the PDF already holds the cards of a run with the same settings,
+    only the missing cards are rendered and added to it, and nothing is
+    rendered if none are missing. Runs without a seed pick one at random
+    and record it, so that they can be extended later.
+
+    With a card_format of "png" or "svg", every card is written as its own
+    image instead (see bingomatic.export), to a directory named after the
+    output or to a zip file, with its manifest in <output_name>-<format>.cards.
+    Image exports are always rendered in full.
+
+    With a roster, one card is printed for each attendee from row
+    roster_start onwards instead of the config's card_count, and the card
+    of row n gets ID n (see bingomatic.roster). Roster runs are always
+    rendered in full and leave no run record.
+
+    Args:
+        config_path: Optional path to the config file. Defaults to
+            ~/.bingomatic/config.yaml
+        output_name: File name of the PDF without its suffix. Defaults to
+            bingo-cards-<today>
+        workers: Number of processes to render pages with
+        stream: Whether to render in chunks to bound memory use
+        manifest: Whether to write a card manifest next to the PDF
+        unique: Optional uniqueness mode ("set" or "layout")
+        seed: Optional seed that fixes every card's squares
+        force: Whether to render every card even if an earlier run can be
+            extended
+        max_size: Optional limit on the size of the PDF in bytes. A run whose
+            estimated size is over the limit fails before rendering
+        split: With max_size, write a PDF over the limit as several parts
+            instead of failing
+        card_format: "pdf", or "png" or "svg" for one image per card
+        dpi: Resolution of PNG cards
+        zip_output: Whether to write image cards to <output_name>.zip rather
+            than to a directory
+        roster_path: Optional roster CSV with an attendee for each card
+        roster_start: Number of roster rows to skip, to resume a run
+        config_cache_dir: Optional directory of validated configs kept
+            between runs
+        **options: Further keyword arguments for generate_pdf, such as
+            logo_dpi, layout, layout_cache_path, font_cache_dir and optimize
+
+    Returns:
+        The files written
+
+    Raises:
+        ConfigError: If the config file is missing or invalid
+        BatchError: If the config's cards can't be generated
+    """
+    with stage("load_config"):
+        config = load_and_validate_config(config_path, cache_dir=config_cache_dir)
+    card_count = get_card_count(config)
+    first_card_id = 1
+    if roster_path is not None:
+        try:
+            roster_count = count_roster(roster_path)
+        except RosterError as e:
+            raise BatchError(str(e)) from e
+        card_count = roster_count - roster_start
+        first_card_id = roster_start + 1
+        if card_count <= 0:
+            raise BatchError(
+                f"The roster has {roster_count} rows, none after row {roster_start}"
+            )
+
+    # Check the pool can supply enough unique cards before doing any work,
+    # counting the cards before the roster start that are replayed first
+    if unique is not None:
+        try:
+            check_unique_capacity(
+                config["bingo_squares"], first_card_id - 1 + card_count, unique
+            )
+        except CardCapacityError as e:
+            raise BatchError(str(e)) from e
+
+    logo_path = Path(config["logo_location"])
+    if not logo_path.exists():
+        raise BatchError(f"Logo file not found: {logo_path}")
+
+    output_dir = Path(config["output_directory"])
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        raise BatchError(f"Cannot create output directory: {output_dir} - {e}") from e
+
+    output_name = output_name or f"bingo-cards-{date.today().isoformat()}"
+    output_path = output_dir / f"{output_name}.pdf"
+    manifest_path = output_dir / f"{output_name}.cards" if manifest else None
+
+    if card_format != "pdf":
+        if max_size is not None:
+            raise BatchError("A size limit only applies to PDF output")
+        image_path = output_dir / (f"{output_name}.zip" if zip_output else output_name)
+        # The export draws its own cards, so it must not replace the manifest
+        # of a PDF rendered under the same name
+        manifest_path = output_dir / f"{output_name}-{card_format}.cards"
+        if not manifest:
+            _remove_stale_manifest(manifest_path)
+            manifest_path = None
+        try:
+            export_cards(
+                image_path,
+                card_count,
+                card_format,
+                dpi=dpi,
+                event_name=config["event_name"],
+                logo_path=logo_path,
+                bingo_squares=config["bingo_squares"],
+                seed=secrets.randbits(64) if seed is None else seed,
+                unique=unique,
+                first_card_id=first_card_id,
+                manifest_path=manifest_path,
+                workers=workers,
+                logo_dpi=options.get("logo_dpi", LOGO_DPI),
+                font_cache_dir=options.get("font_cache_dir"),
+                attendees=read_roster(roster_path, roster_start)
+                if roster_path is not None
+                else None,
+            )
+        except Exception as e:
+            raise BatchError(f"Failed to export cards: {e}") from e
+        return GeneratedCards(image_path, manifest_path, card_count, card_count)
+
+    # Find out whether the PDF already holds an earlier run of these settings
+    record_path = run_record_path(output_path)
+    layout = options.setdefault("layout", page_layout())
+    fingerprint = run_fingerprint(
+        config,
+        seed,
+        unique,
+        manifest,
+        options.get("logo_dpi", LOGO_DPI),
+        layout,
+        options.get("optimize", False),
+    )
+    previous = None
+    if not force and roster_path is None and output_path.exists():
+        previous = load_run_record(record_path)
+        if previous is not None and (
+            previous.fingerprint != fingerprint
+            or (manifest_path is not None and not manifest_path.exists())
+        ):
+            previous = None
+    if previous is not None and previous.card_count == card_count:
+        parts = _apply_size_limit(output_path, max_size, split)
+        return GeneratedCards(output_path, manifest_path, card_count, 0, parts)
+
+    if seed is None:
+        seed = previous.seed if previous is not None else secrets.randbits(64)
+    options.update(
+        event_name=config["event_name"],
+        logo_path=logo_path,
+        bingo_squares=config["bingo_squares"],
+        seed=seed,
+    )
+
+    # Fail before rendering anything if the PDF can't fit the limit
+    if max_size is not None and not split:
+        with stage("estimate_size"):
+            estimated_size = _estimate_size(card_count, options)
+        if estimated_size > max_size:
+            raise BatchError(
+                f"The PDF would be about {format_size(estimated_size)}, over the "
+                f"{format_size(max_size)} limit"
+            )
+
+    # The record describes the files as they were; drop it until the
+    # files are consistent again
+    record_path.unlink(missing_ok=True)
+    if manifest_path is None:
+        _remove_stale_manifest(output_dir / f"{output_name}.cards")
+    try:
+        if previous is not None and previous.card_count < card_count:
+            rendered_count = _extend_run(
+                output_path,
+                manifest_path,
+                previous.card_count,
+                card_count,
+                unique,
+                options,
+            )
+        elif workers > 1 or stream or roster_path is not None:
+            generate_pdf_parallel(
+                output_path,
+                card_count,
+                workers,
+                chunk_cards=STREAM_CHUNK_CARDS if stream else None,
+                unique=unique,
+                manifest_path=manifest_path,
+                first_card_id=first_card_id,
+                roster_path=roster_path,
+                **options,
+            )
+            rendered_count = card_count
+        else:
+            generate_pdf(
+                output_path,
+                card_count,
+                unique=unique,
+                manifest_path=manifest_path,
+                **options,
+            )
+            rendered_count = card_count
+    except Exception as e:
+        raise BatchError(f"Failed to generate PDF: {e}") from e
+
+    if roster_path is None:
+        save_run_record(record_path, RunRecord(fingerprint, card_count, seed))
+    parts = _apply_size_limit(output_path, max_size, split)
+    return GeneratedCards(output_path, manifest_path, card_count, rendered_count, parts)
+
+
+def _remove_stale_manifest(manifest_path: Path) -> None:
+    """Remove the manifest of an earlier run before rendering without one.
+
+    The manifest describes the earlier run's cards, not the ones about to
+    be written, and verify --manifest would check those without notice.
+    """
+    manifest_path.unlink(missing_ok=True)
+
+
+def _estimate_size(card_count: int, options: dict) -> int:
+    """Estimate the size of a run's PDF from two small sample renders.
+
+    Everything but the pages, such as fonts and the logo, is written once
+    per file, so the size grows linearly with the page count; the samples
+    give the fixed part and the cost of a page.
+    """
+    cards_per_page = options["layout"].cards_per_page
+    pages = -(-card_count // cards_per_page)
+    sample_options = {
+        name: value for name, value in options.items() if name != "layout_cache_path"
+    }
+    sizes = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sample_pages in ESTIMATE_PAGES:
+            sample_path = Path(tmp_dir) / f"sample-{sample_pages}.pdf"
+            generate_pdf(sample_path, sample_pages * cards_per_page, **sample_options)
+            sizes.append(sample_path.stat().st_size)
+    page_size = (sizes[1] - sizes[0]) / (ESTIMATE_PAGES[1] - ESTIMATE_PAGES[0])
+    return round(sizes[0] + page_size * (pages - ESTIMATE_PAGES[0]))
+
+
+def _apply_size_limit(
+    output_path: Path, max_size: int | None, split: bool
+) -> tuple[Path, ...]:
+    """Check a finished PDF against the size limit, splitting it if asked.
+
+    Parts left by an earlier split of the same PDF are removed first.
+
+    Returns:
+        Paths of the parts, or () if the PDF was not split
+
+    Raises:
+        BatchError: If the PDF is over the limit and can't be split
+    """
+    for stale_part in output_path.parent.glob(f"{output_path.stem}-part*.pdf"):
+        stale_part.unlink()
+    if max_size is None:
+        return ()
+    size = output_path.stat().st_size
+    if size <= max_size:
+        return ()
+    if not split:
+        raise BatchError(
+            f"{output_path} is {format_size(size)}, over the "
+            f"{format_size(max_size)} limit"
+        )
+    with stage("split_pdf"):
+        try:
+            return tuple(split_pdf(output_path, max_size))
+        except PdfMergeError as e:
+            raise BatchError(str(e)) from e
+
+
+def _extend_run(
+    output_path: Path,
+    manifest_path: Path | None,
+    previous_count: int,
+    card_count: int,
+    unique: str | None,
+    options: dict,
+) -> int:
+    """Render the cards after an earlier run and add them to its files.
+
+    A half-filled last page is dropped and its card rendered again with the
+    new ones, so the result matches the whole run rendered at once.
+
+    Returns:
+        Number of cards rendered
+    """
+    cards_per_page = options["layout"].cards_per_page
+    kept_count = previous_count - previous_count % cards_per_page
+    bingo_squares = options["bingo_squares"]
+
+    # In unique mode the new cards must avoid every kept card, so replay
+    # the selection (without rendering) up to the first new card
+    cards = None
+    if unique is not None:
+        sampler = CardSampler(bingo_squares, seed=options["seed"], unique=unique)
+        for card_id in range(1, kept_count + 1):
+            sampler.indices(card_id)
+        card_ids = range(kept_count + 1, card_count + 1)
+        cards = [sampler.squares(card_id) for card_id in card_ids]
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as tmp_dir:
+        part_path = Path(tmp_dir) / "part.pdf"
+        part_manifest_path = part_path.with_suffix(".cards")
+        generate_pdf(
+            part_path,
+            card_count - kept_count,
+            first_card_id=kept_count + 1,
+            cards=cards,
+            manifest_path=part_manifest_path if manifest_path else None,
+            **options,
+        )
+
+        with stage("merge_runs"):
+            merged_path = Path(tmp_dir) / "merged.pdf"
+            with PdfMerger(merged_path) as merger:
+                merger.append(output_path, kept_count // cards_per_page)
+                merger.append(part_path)
+
+            if manifest_path is not None:
+                merged_manifest_path = merged_path.with_suffix(".cards")
+                with ManifestWriter(merged_manifest_path, bingo_squares) as writer:
+                    writer.extend(load_manifest(manifest_path), kept_count)
+                    writer.extend(load_manifest(part_manifest_path))
+                os.replace(merged_manifest_path, manifest_path)
+            os.replace(merged_path, output_path)
+
+    return card_count - kept_count
+
+
+def _run_config(config_path: Path, output_name: str, options: dict) -> BatchResult:
+    """Generate one config of a batch, capturing any failure."""
+    start = time.perf_counter()
+    try:
+        generated = generate_config(config_path, output_name, **options)
+    except (ConfigError, BatchError) as e:
+        return BatchResult(config_path, None, time.perf_counter() - start, str(e))
+    return BatchResult(config_path, generated, time.perf_counter() - start)
+
+
+def run_batch(
+    config_paths: list[Path], jobs: int = 1, **options
+) -> Iterator[BatchResult]:
+    """Generate the cards of every config, one result per config.
+
+    Each config's PDF is named bingo-cards-<config name>-<today>.pdf, so
+    configs sharing an output directory don't overwrite each other.
+
+    Args:
+        config_paths: Config files to generate
+        jobs: Number of configs generated at the same time; above 1, a pool
+            of that many processes each handles several configs
+        **options: Keyword arguments for generate_config
+
+    Yields:
+        The result of each config, in the order given
+    """
+    if not config_paths:
+        return
+    today = date.today().isoformat()
+    names = [f"bingo-cards-{path.stem}-{today}" for path in config_paths]
+
+    if jobs == 1:
+        for config_path, output_name in zip(config_paths, names, strict=True):
+            yield _run_config(config_path, output_name, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(config_paths))) as executor:
+        yield from executor.map(
+            _run_config, config_paths, names, [options] * len(config_paths)
+        )
@@ -0,0 +1,94 @@
+"""Versioned files kept between runs: caches, sidecars and run records.
+
+Each file stores its data together with the version of the format it was
+written in, and a file of any other version reads as if it were missing.
+Files are written to a per-process temporary name first and then moved into
+place, so a crash or a concurrent writer never leaves a truncated file
+behind.
+"""
+
+import json
+import os
+import pickle
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+# What reading a missing, truncated or foreign file can raise; pickle in
+# particular reports damaged data through almost any exception type.
+_READ_ERRORS = (
+    OSError,
+    EOFError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+    pickle.UnpicklingError,
+)
+
+
+def atomic_write(path: Path | str, data: bytes) -> None:
+    """Replace a file's contents in one step, creating its directory.
+
+    Args:
+        path: File to write
+        data: Complete new contents of the file
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_cache(
+    path: Path | str, version: int, data: Any, pickled: bool = False
+) -> None:
+    """Store data in a versioned file.
+
+    Args:
+        path: File to write
+        version: Version of the format data is in
+        data: Data to store; JSON-serializable unless pickled
+        pickled: Whether to store data with pickle rather than as JSON
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    entry = {"version": version, "data": data}
+    if pickled:
+        contents = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        contents = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+    atomic_write(path, contents)
+
+
+def read_cache(path: Path | str, version: int, pickled: bool = False) -> Any:
+    """Read data stored by write_cache.
+
+    Args:
+        path: File to read
+        version: Version of the format the caller understands
+        pickled: Whether the file was written with pickled=True
+
+    Returns:
+        The stored data, or None if the file is missing, unreadable or in
+        another version of the format
+    """
+    try:
+        contents = Path(path).read_bytes()
+        entry = pickle.loads(contents) if pickled else json.loads(contents)
+    except _READ_ERRORS:
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != version:
+        return None
+    return entry.get("data")
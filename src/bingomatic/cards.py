@@ -0,0 +1,310 @@
+"""Card contents for Bingomatic: which phrases go on which card."""
+
+import hashlib
+import math
+import random
+from array import array
+
+# Card geometry shared by rendering and verification
+GRID_SIZE = 5  # 5x5 grid
+CENTER_SQUARE_INDEX = 12  # Center of 5x5 grid (row 2, col 2 in 0-indexed)
+SQUARES_PER_CARD = GRID_SIZE * GRID_SIZE - 1  # Every square but the free center
+
+# Bump when card_seed or the way a card's squares are drawn from its seed
+# changes, since seeded cards made before then can no longer be rebuilt
+CARD_SEED_VERSION = 1
+
+
+def select_random_squares(
+    bingo_squares: list[str], count: int = 24, rng: random.Random | None = None
+) -> list[str]:
+    """Select random unique items from bingo_squares list.
+
+    Args:
+        bingo_squares: List of bingo square phrases
+        count: Number of items to select (default 24 for 5x5 grid minus center)
+        rng: Optional random generator; defaults to the global random module
+
+    Returns:
+        List of randomly selected unique items
+    """
+    if rng is None:
+        return random.sample(bingo_squares, count)
+    return rng.sample(bingo_squares, count)
+
+
+def card_seed(seed: int, card_id: int, attempt: int = 0) -> int:
+    """Derive the random seed for a single card of a seeded run.
+
+    The result depends only on the run seed and the card ID, so any card
+    can be reproduced without generating the cards before it.
+
+    Args:
+        seed: Seed of the whole run
+        card_id: 1-based card number within the run
+        attempt: Redraw number, for runs that reject duplicate cards
+
+    Returns:
+        128-bit seed for the card's random generator
+    """
+    key = b"%d:%d" % (seed, card_id)
+    if attempt:
+        key += b":%d" % attempt
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest, "big")
+
+
+def card_squares(
+    bingo_squares: list[str], seed: int, card_id: int, count: int = 24
+) -> list[str]:
+    """Select the squares of one card of a seeded run.
+
+    Args:
+        bingo_squares: List of bingo square phrases
+        seed: Seed of the whole run
+        card_id: 1-based card number within the run
+        count: Number of items to select (default 24 for 5x5 grid minus center)
+
+    Returns:
+        The card's squares, identical every time for the same inputs
+    """
+    rng = random.Random(card_seed(seed, card_id))
+    return select_random_squares(bingo_squares, count, rng=rng)
+
+
+# Uniqueness modes: "set" forbids two cards with the same phrases in any
+# order, "layout" only forbids two cards identical square by square.
+UNIQUE_MODES = ("set", "layout")
+
+
+class CardCapacityError(ValueError):
+    """Exception raised when a pool can't yield enough unique cards."""
+
+    pass
+
+
+def unique_card_capacity(bingo_squares: list[str], mode: str, count: int = 24) -> int:
+    """Return how many distinct cards a phrase pool can produce.
+
+    Args:
+        bingo_squares: List of bingo square phrases
+        mode: Uniqueness mode, "set" or "layout"
+        count: Number of squares per card
+
+    Returns:
+        Number of distinct cards available in the given mode
+    """
+    distinct = len(set(bingo_squares))
+    if mode == "set":
+        return math.comb(distinct, count)
+    if mode == "layout":
+        return math.perm(distinct, count)
+    raise ValueError(f"Unknown uniqueness mode: {mode}")
+
+
+def check_unique_capacity(
+    bingo_squares: list[str], card_count: int, mode: str, count: int = 24
+) -> None:
+    """Fail fast if card_count unique cards can't be drawn from the pool.
+
+    Args:
+        bingo_squares: List of bingo square phrases
+        card_count: Number of cards requested
+        mode: Uniqueness mode, "set" or "layout"
+        count: Number of squares per card
+
+    Raises:
+        CardCapacityError: If the pool has fewer distinct cards than requested
+    """
+    capacity = unique_card_capacity(bingo_squares, mode, count)
+    if card_count > capacity:
+        raise CardCapacityError(
+            f"Cannot generate {card_count} unique cards ({mode} mode) from "
+            f"{len(set(bingo_squares))} distinct phrases; at most {capacity} "
+            "are possible"
+        )
+
+
+def card_fingerprint(squares: list[str], mode: str) -> int:
+    """Return a 64-bit fingerprint of a card's canonical form.
+
+    Args:
+        squares: The card's squares in grid order
+        mode: Uniqueness mode, "set" or "layout"
+
+    Returns:
+        Non-zero 64-bit fingerprint
+    """
+    canonical = sorted(squares) if mode == "set" else squares
+    digest = hashlib.blake2b("\x1f".join(canonical).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") or 1
+
+
+class FingerprintSet:
+    """Compact set of 64-bit fingerprints.
+
+    Fingerprints live in a flat open-addressing table of unsigned 64-bit
+    slots kept at most half full, so a million cards take about 16 MB. A
+    fingerprint collision can only make a new card look like a duplicate,
+    which costs a redraw; it can never let a real duplicate through.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        size = 16
+        while size < capacity * 2:
+            size *= 2
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, fingerprint: int) -> int:
+        """Return the slot holding fingerprint, or the empty slot for it."""
+        slots = self._slots
+        mask = self._mask
+        index = fingerprint & mask
+        while True:
+            slot = slots[index]
+            if slot == 0 or slot == fingerprint:
+                return index
+            index = (index + 1) & mask
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return self._slots[self._find(fingerprint)] == fingerprint
+
+    def add(self, fingerprint: int) -> bool:
+        """Add a non-zero fingerprint.
+
+        Args:
+            fingerprint: Fingerprint from card_fingerprint
+
+        Returns:
+            True if the fingerprint was new, False if already present
+        """
+        index = self._find(fingerprint)
+        if self._slots[index] == fingerprint:
+            return False
+        self._slots[index] = fingerprint
+        self._count += 1
+        if self._count * 2 > len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old_slots = self._slots
+        self._slots = array("Q", bytes(16 * len(old_slots)))
+        self._mask = len(self._slots) - 1
+        for fingerprint in old_slots:
+            if fingerprint:
+                self._slots[self._find(fingerprint)] = fingerprint
+
+
+class CardSampler:
+    """Choose the squares for each card of a run.
+
+    Seeded runs derive each card from the seed and its card ID; unseeded
+    runs draw from rng, or the global random module. With a uniqueness
+    mode, a card that repeats an earlier one is redrawn until it is new.
+    Seeded redraws are deterministic, so a seeded unique run is still
+    reproducible, though a card can then only be rebuilt by replaying the
+    cards before it.
+    """
+
+    def __init__(
+        self,
+        bingo_squares: list[str],
+        seed: int | None = None,
+        rng: random.Random | None = None,
+        unique: str | None = None,
+        count: int = 24,
+    ):
+        if unique is not None and unique not in UNIQUE_MODES:
+            raise ValueError(f"Unknown uniqueness mode: {unique}")
+        self.bingo_squares = bingo_squares
+        self.seed = seed
+        self.rng = rng
+        self.unique = unique
+        self.count = count
+        self.seen = FingerprintSet() if unique else None
+
+    def _draw(self, card_id: int, attempt: int) -> list[int]:
+        # Sampling positions consumes the generator exactly like sampling
+        # the phrases themselves, so both give the same cards.
+        positions = range(len(self.bingo_squares))
+        if self.seed is not None:
+            rng = random.Random(card_seed(self.seed, card_id, attempt))
+            return rng.sample(positions, self.count)
+        if self.rng is not None:
+            return self.rng.sample(positions, self.count)
+        return random.sample(positions, self.count)
+
+    def indices(self, card_id: int) -> list[int]:
+        """Return the positions in bingo_squares of the next card's squares.
+
+        Args:
+            card_id: 1-based card number within the run
+
+        Returns:
+            Indices into bingo_squares, in grid order
+        """
+        attempt = 0
+        while True:
+            indices = self._draw(card_id, attempt)
+            if self.seen is None:
+                return indices
+            squares = [self.bingo_squares[index] for index in indices]
+            if self.seen.add(card_fingerprint(squares, self.unique)):
+                return indices
+            attempt += 1
+
+    def squares(self, card_id: int) -> list[str]:
+        """Return the squares for the next card.
+
+        Args:
+            card_id: 1-based card number within the run
+
+        Returns:
+            The card's squares in grid order
+        """
+        return [self.bingo_squares[index] for index in self.indices(card_id)]
+
+
+def start_sampler(
+    bingo_squares: list[str],
+    card_count: int,
+    first_card_id: int = 1,
+    seed: int | None = None,
+    rng: random.Random | None = None,
+    unique: str | None = None,
+) -> CardSampler:
+    """Return a sampler ready to draw card_count cards from first_card_id on.
+
+    In a seeded unique run a card depends on the redraws of every card
+    before it, so when the cards start part way through such a run the
+    earlier cards are replayed first, without being rendered. The pool must
+    then have enough distinct cards for those too.
+
+    Args:
+        bingo_squares: List of bingo square phrases
+        card_count: Number of cards to be drawn
+        first_card_id: ID of the first card to be drawn
+        seed: Optional run seed that fixes every card's squares
+        rng: Optional random generator used when no seed is given
+        unique: Optional uniqueness mode ("set" or "layout")
+
+    Returns:
+        The sampler, positioned at first_card_id
+
+    Raises:
+        CardCapacityError: If unique is set and the pool can't provide
+            enough distinct cards
+    """
+    replayed = first_card_id - 1 if unique is not None and seed is not None else 0
+    if unique is not None:
+        check_unique_capacity(bingo_squares, replayed + card_count, unique)
+    sampler = CardSampler(bingo_squares, seed=seed, rng=rng, unique=unique)
+    for card_id in range(1, replayed + 1):
+        sampler.indices(card_id)
+    return sampler
@@ -1,19 +1,103 @@
 """Command-line interface for Bingomatic."""
 
+import json
 import sys
-from datetime import date
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 
 import click
 
+from bingomatic.cards import (
+    UNIQUE_MODES,
+    CardCapacityError,
+    CardSampler,
+    check_unique_capacity,
+)
 from bingomatic.config import (
+    DEFAULT_LOGO_DPI,
     ConfigError,
     ConfigFileNotFoundError,
     ConfigValidationError,
     get_card_count,
+    get_config_cache_dir,
+    get_fit_cache_path,
+    get_font_cache_dir,
+    get_layout_cache_path,
+    get_logo_dir,
     load_and_validate_config,
 )
-from bingomatic.pdf import generate_pdf
+from bingomatic.imposition import (
+    DEFAULT_MARGIN,
+    DEFAULT_PAGE_SIZE,
+    INCH,
+    PAGE_SIZES,
+    ImpositionError,
+    PageLayout,
+    page_layout,
+)
+from bingomatic.pdfsize import format_size, format_size_report, parse_size, size_report
+from bingomatic.timings import StageTimings, recording
+
+if TYPE_CHECKING:
+    from bingomatic.batch import BatchResult, GeneratedCards
+
+# Modules that pull in ReportLab, Pillow or NumPy are imported by the
+# commands that use them, so that light commands such as validate and
+# --version start quickly.
+
+MAX_LISTED_PHRASES = 20  # Phrases named in a validate report before "and N more"
+
+
+@contextmanager
+def _instrumented(
+    profile_path: Path | None, timings: StageTimings | None
+) -> Iterator[None]:
+    """Profile and/or time the enclosed block when asked to."""
+    profiler = None
+    if profile_path is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    with recording(timings) if timings is not None else nullcontext():
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_path)
+
+
+def _echo_listed(lines: list[str]) -> None:
+    """Print the first lines of a long report and how many were left out."""
+    for line in lines[:MAX_LISTED_PHRASES]:
+        click.echo(f"  {line}", err=True)
+    if len(lines) > MAX_LISTED_PHRASES:
+        click.echo(f"  ... and {len(lines) - MAX_LISTED_PHRASES} more", err=True)
+
+
+def _page_layout(page_size: str, card_scale: float, margin: float) -> PageLayout:
+    """Lay out the pages of a run, exiting if no card fits."""
+    try:
+        return page_layout(page_size, card_scale, margin * INCH)
+    except ImpositionError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+def _parse_size_option(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> int | None:
+    """Turn a size option such as 50MB into bytes."""
+    if value is None:
+        return None
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
 
 
 @click.group()
@@ -25,9 +109,36 @@ def main() -> None:
 
 @main.command()
 def validate() -> None:
-    """Validate the configuration file."""
+    """Validate the configuration file.
+
+    Every phrase is laid out once, as it would be printed, to find phrases
+    too long for a square even at the smallest font size. Phrases listed
+    more than once are reported as a warning.
+    """
+    from bingomatic.phrasecheck import check_phrases
+
     try:
-        load_and_validate_config()
+        config = load_and_validate_config(cache_dir=get_config_cache_dir())
+        report = check_phrases(config["bingo_squares"], cache_path=get_fit_cache_path())
+        if report.duplicates:
+            click.echo(
+                f"Warning: {len(report.duplicates)} phrases appear more than once:",
+                err=True,
+            )
+            _echo_listed(
+                [
+                    f"{phrase!r} ({count} times)"
+                    for phrase, count in report.duplicates.items()
+                ]
+            )
+        if report.unfittable:
+            click.echo(
+                f"{len(report.unfittable)} phrases don't fit a square even at "
+                f"the smallest font size:",
+                err=True,
+            )
+            _echo_listed([repr(phrase) for phrase in report.unfittable])
+            sys.exit(1)
         click.echo("Configuration valid.")
         sys.exit(0)
     except ConfigFileNotFoundError as e:
@@ -42,19 +153,432 @@ def validate() -> None:
 
 
 @main.command()
-def generate() -> None:
-    """Generate bingo card PDF."""
+@click.argument(
+    "config_paths",
+    metavar="[CONFIG]...",
+    nargs=-1,
+    type=click.Path(exists=True, path_type=Path),
+)
+@click.option(
+    "--layout-cache/--no-layout-cache",
+    default=False,
+    help="Persist phrase layouts next to the config file between runs.",
+)
+@click.option(
+    "--logo-dpi",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LOGO_DPI,
+    show_default=True,
+    help="Resolution the logo is downsampled to before embedding.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes to render pages with.",
+)
+@click.option(
+    "--page-size",
+    type=click.Choice(list(PAGE_SIZES)),
+    default=DEFAULT_PAGE_SIZE,
+    show_default=True,
+    help="Paper to print on; as many cards as fit are placed on each page.",
+)
+@click.option(
+    "--card-scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Size of each card relative to a 5-inch grid.",
+)
+@click.option(
+    "--margin",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MARGIN / INCH,
+    show_default=True,
+    help="Smallest distance between a card and the page edge, in inches.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of configs to generate at the same time in a batch.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Render in chunks and stream pages to disk to bound memory use.",
+)
+@click.option(
+    "--seed",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Seed that fixes every card's squares and prints card IDs.",
+)
+@click.option(
+    "--unique",
+    type=click.Choice(UNIQUE_MODES),
+    default=None,
+    help="Never repeat a card: 'set' compares phrases in any order, "
+    "'layout' compares square by square.",
+)
+@click.option(
+    "--manifest/--no-manifest",
+    default=True,
+    help="Record every card's squares in a manifest next to the PDF.",
+)
+@click.option(
+    "--font-cache/--no-font-cache",
+    default=True,
+    help="Keep parsed fonts next to the config file to speed up later runs.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Render every card, even if today's PDF only needs cards added.",
+)
+@click.option(
+    "--optimize",
+    is_flag=True,
+    help="Write the smallest PDF and report what its size is made of.",
+)
+@click.option(
+    "--max-size",
+    metavar="SIZE",
+    callback=_parse_size_option,
+    default=None,
+    help="Fail, before rendering if possible, when the PDF would be larger "
+    "than SIZE (e.g. 50MB).",
+)
+@click.option(
+    "--split",
+    is_flag=True,
+    help="With --max-size, write a larger PDF as parts of at most SIZE.",
+)
+@click.option(
+    "--format",
+    "card_format",
+    type=click.Choice(["pdf", "png", "svg"]),
+    default="pdf",
+    show_default=True,
+    help="Write a PDF, or every card as its own PNG or SVG image.",
+)
+@click.option(
+    "--dpi",
+    type=click.IntRange(min=1),
+    default=150,
+    show_default=True,
+    help="Resolution of PNG cards.",
+)
+@click.option(
+    "--roster",
+    "roster_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="CSV of attendees (name, badge_id): print one card per row with the "
+    "attendee's name on it.",
+)
+@click.option(
+    "--roster-start",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of roster rows to skip, to resume an interrupted run.",
+)
+@click.option(
+    "--zip",
+    "zip_output",
+    is_flag=True,
+    help="Write PNG or SVG cards to a zip file instead of a directory.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write cProfile stats for the run to this file (this process only).",
+)
+@click.option(
+    "--timings",
+    "show_timings",
+    is_flag=True,
+    help="Print the wall time, calls and cards/sec of each stage.",
+)
+@click.option(
+    "--timings-json",
+    type=click.File("w"),
+    default=None,
+    help="Write the stage timings as JSON to this file ('-' for stdout).",
+)
+def generate(
+    config_paths: tuple[Path, ...],
+    layout_cache: bool,
+    logo_dpi: int,
+    workers: int,
+    page_size: str,
+    card_scale: float,
+    margin: float,
+    jobs: int,
+    stream: bool,
+    seed: int | None,
+    unique: str | None,
+    manifest: bool,
+    font_cache: bool,
+    force: bool,
+    optimize: bool,
+    max_size: int | None,
+    split: bool,
+    card_format: str,
+    dpi: int,
+    zip_output: bool,
+    roster_path: Path | None,
+    roster_start: int,
+    profile: Path | None,
+    show_timings: bool,
+    timings_json: TextIO | None,
+) -> None:
+    """Generate bingo card PDF.
+
+    With no CONFIG, the cards of ~/.bingomatic/config.yaml are generated.
+    Otherwise every CONFIG file, and every .yaml file in every CONFIG
+    directory, is generated in turn by this one process.
+
+    If today's PDF already holds the cards of a run with the same settings,
+    only the cards missing from it are rendered and added.
+
+    With --format png or svg, each card is written as its own image to a
+    directory named after the PDF would be, or with --zip to a zip file.
+
+    With --roster, one card is printed for each attendee in the CSV file
+    instead of the config's card_count.
+    """
+    from bingomatic.batch import BatchError, find_configs, generate_config, run_batch
+
+    batch = find_configs(config_paths) if config_paths else None
+    if batch is not None and not batch:
+        click.echo("No config files found.", err=True)
+        sys.exit(1)
+    if jobs > 1 and workers > 1:
+        click.echo("Use either --jobs or --workers, not both.", err=True)
+        sys.exit(1)
+    if split and max_size is None:
+        click.echo("--split needs --max-size.", err=True)
+        sys.exit(1)
+    if roster_start and roster_path is None:
+        click.echo("--roster-start needs --roster.", err=True)
+        sys.exit(1)
+    if card_format == "pdf" and zip_output:
+        click.echo("--zip needs --format png or svg.", err=True)
+        sys.exit(1)
+    if card_format != "pdf" and (optimize or max_size is not None):
+        click.echo("--optimize and --max-size only apply to PDF output.", err=True)
+        sys.exit(1)
+    show_sizes = optimize or max_size is not None
+
+    options = {
+        "workers": workers,
+        "stream": stream,
+        "manifest": manifest,
+        "unique": unique,
+        "seed": seed,
+        "force": force,
+        "max_size": max_size,
+        "split": split,
+        "card_format": card_format,
+        "dpi": dpi,
+        "zip_output": zip_output,
+        "roster_path": roster_path,
+        "roster_start": roster_start,
+        "optimize": optimize,
+        "logo_dpi": logo_dpi,
+        "layout_cache_path": get_layout_cache_path() if layout_cache else None,
+        "font_cache_dir": get_font_cache_dir() if font_cache else None,
+        "config_cache_dir": get_config_cache_dir(),
+        "layout": _page_layout(page_size, card_scale, margin),
+    }
+    timings = StageTimings() if show_timings or timings_json else None
     try:
-        # Load and validate configuration
-        config = load_and_validate_config()
+        with _instrumented(profile, timings):
+            if batch is not None:
+                results = []
+                for result in run_batch(batch, jobs, **options):
+                    results.append(result)
+                    _echo_batch_result(result)
+                    if result.error is None:
+                        _echo_sizes(result.generated, show_sizes)
+                generated = [r.generated for r in results if r.error is None]
+            else:
+                generated = [generate_config(**options)]
+            card_count = sum(cards.card_count for cards in generated)
+            rendered_count = sum(cards.rendered_count for cards in generated)
+
+        # Success message
+        if batch is not None:
+            failed = len(results) - len(generated)
+            click.echo(
+                f"Generated {len(generated)} of {len(results)} configs "
+                f"({card_count} cards), {failed} failed."
+            )
+        else:
+            click.echo(_describe_generated(generated[0]))
+            if generated[0].manifest_path is not None:
+                click.echo(f"Card manifest: {generated[0].manifest_path}")
+            _echo_sizes(generated[0], show_sizes)
+        if seed is not None:
+            click.echo(f"Seed: {seed} (regenerate any card with 'bingomatic card')")
+        if profile is not None:
+            click.echo(f"Profile written to {profile}")
+        if show_timings:
+            click.echo(timings.format(rendered_count))
+        if timings_json is not None:
+            timings_json.write(json.dumps(timings.as_dict(rendered_count), indent=2))
+            timings_json.write("\n")
+        sys.exit(1 if batch is not None and failed else 0)
+
+    except ConfigFileNotFoundError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigValidationError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except BatchError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+def _describe_generated(generated: "GeneratedCards") -> str:
+    """Say what a run did to its PDF."""
+    if generated.rendered_count == 0:
+        return (
+            f"Bingo cards up to date ({generated.card_count} cards): "
+            f"{generated.output_path}"
+        )
+    if generated.rendered_count < generated.card_count:
+        return (
+            f"Rendered {generated.rendered_count} new bingo cards "
+            f"({generated.card_count} total): {generated.output_path}"
+        )
+    return f"Generated {generated.card_count} bingo cards: {generated.output_path}"
+
+
+def _echo_sizes(generated: "GeneratedCards", show_report: bool) -> None:
+    """List the parts of a split PDF and, if asked, what its size is made of."""
+    if show_report:
+        report = size_report(generated.output_path)
+        click.echo(format_size_report(report))
+        if report.full_fonts:
+            click.echo(
+                f"Warning: fonts embedded in full: {', '.join(report.full_fonts)}",
+                err=True,
+            )
+    for number, part_path in enumerate(generated.parts, 1):
+        size = format_size(part_path.stat().st_size)
+        click.echo(f"Part {number}: {part_path} ({size})")
+
+
+def _echo_batch_result(result: "BatchResult") -> None:
+    """Report how one config of a batch went."""
+    if result.error is not None:
+        click.echo(f"FAILED {result.config_path}: {result.error}", err=True)
+        return
+    click.echo(
+        f"OK     {result.config_path}: {_describe_generated(result.generated)} "
+        f"({result.seconds:.1f}s)"
+    )
+
+
+@main.command()
+@click.option(
+    "--id",
+    "card_id",
+    type=click.IntRange(min=1),
+    required=True,
+    help="ID of the card to render, as printed on the card.",
+)
+@click.option(
+    "--seed",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Seed the original run was generated with.",
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Card manifest of the original run, instead of --seed.",
+)
+@click.option(
+    "--logo-dpi",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LOGO_DPI,
+    show_default=True,
+    help="Resolution the logo is downsampled to before embedding.",
+)
+@click.option(
+    "--unique",
+    type=click.Choice(UNIQUE_MODES),
+    default=None,
+    help="Uniqueness mode the original run was generated with.",
+)
+@click.option(
+    "--page-size",
+    type=click.Choice(list(PAGE_SIZES)),
+    default=DEFAULT_PAGE_SIZE,
+    show_default=True,
+    help="Paper to print on; as many cards as fit are placed on each page.",
+)
+@click.option(
+    "--card-scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Size of each card relative to a 5-inch grid.",
+)
+@click.option(
+    "--margin",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MARGIN / INCH,
+    show_default=True,
+    help="Smallest distance between a card and the page edge, in inches.",
+)
+@click.option(
+    "--font-cache/--no-font-cache",
+    default=True,
+    help="Keep parsed fonts next to the config file to speed up later runs.",
+)
+def card(
+    card_id: int,
+    seed: int | None,
+    manifest_path: Path | None,
+    logo_dpi: int,
+    unique: str | None,
+    page_size: str,
+    card_scale: float,
+    margin: float,
+    font_cache: bool,
+) -> None:
+    """Regenerate a single card from a seeded run or its card manifest."""
+    from bingomatic.manifest import ManifestError, load_manifest
+    from bingomatic.pdf import generate_pdf
+
+    if (seed is None) == (manifest_path is None):
+        click.echo("Pass either --seed or --manifest.", err=True)
+        sys.exit(1)
+    layout = _page_layout(page_size, card_scale, margin)
+
+    try:
+        config = load_and_validate_config(cache_dir=get_config_cache_dir())
 
-        # Validate logo file exists
         logo_path = Path(config["logo_location"])
         if not logo_path.exists():
             click.echo(f"Logo file not found: {logo_path}", err=True)
             sys.exit(1)
 
-        # Create output directory if needed
         output_dir = Path(config["output_directory"])
         try:
             output_dir.mkdir(parents=True, exist_ok=True)
@@ -62,28 +586,240 @@ def generate() -> None:
             click.echo(f"Cannot create output directory: {output_dir} - {e}", err=True)
             sys.exit(1)
 
-        # Generate output filename with current date
-        today = date.today().isoformat()
-        output_path = output_dir / f"bingo-cards-{today}.pdf"
+        cards = None
+        if manifest_path is not None:
+            try:
+                cards = [load_manifest(manifest_path).squares(card_id)]
+            except (ManifestError, KeyError) as e:
+                click.echo(e.args[0], err=True)
+                sys.exit(1)
+            output_path = output_dir / f"bingo-card-{manifest_path.stem}-{card_id}.pdf"
+        else:
+            output_path = output_dir / f"bingo-card-{seed}-{card_id}.pdf"
 
-        # Get card count from config
-        card_count = get_card_count(config)
+        # In unique mode a card depends on the redraws of the cards before
+        # it, so replay the selection (without rendering) up to this card.
+        if unique is not None and cards is None:
+            sampler = CardSampler(config["bingo_squares"], seed=seed, unique=unique)
+            for earlier_id in range(1, card_id):
+                sampler.squares(earlier_id)
+            cards = [sampler.squares(card_id)]
 
-        # Generate PDF
         try:
             generate_pdf(
-                output_path=output_path,
-                card_count=card_count,
+                output_path,
+                card_count=1,
                 event_name=config["event_name"],
                 logo_path=logo_path,
                 bingo_squares=config["bingo_squares"],
+                logo_dpi=logo_dpi,
+                seed=seed,
+                first_card_id=card_id,
+                cards=cards,
+                show_card_ids=True,
+                font_cache_dir=get_font_cache_dir() if font_cache else None,
+                layout=layout,
             )
         except Exception as e:
             click.echo(f"Failed to generate PDF: {e}", err=True)
             sys.exit(1)
 
-        # Success message
-        click.echo(f"Generated {card_count} bingo cards: {output_path}")
+        click.echo(f"Generated card #{card_id}: {output_path}")
+        sys.exit(0)
+
+    except ConfigFileNotFoundError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigValidationError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "--seed",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Seed the cards were generated with.",
+)
+@click.option(
+    "--unique",
+    type=click.Choice(UNIQUE_MODES),
+    default=None,
+    help="Uniqueness mode the cards were generated with, if any.",
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Card manifest written alongside the PDF, instead of --seed.",
+)
+@click.option(
+    "--called-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="File of called phrases, one per line.",
+)
+@click.argument("called", nargs=-1)
+def verify(
+    seed: int | None,
+    unique: str | None,
+    manifest_path: Path | None,
+    called_file: Path | None,
+    called: tuple[str, ...],
+) -> None:
+    """List every card with a completed row, column or diagonal.
+
+    Pass the phrases called so far as arguments or with --called-file.
+    """
+    from bingomatic.manifest import ManifestError, load_manifest
+    from bingomatic.verify import card_matrix, find_winners
+
+    if (seed is None) == (manifest_path is None):
+        click.echo("Pass either --seed or --manifest.", err=True)
+        sys.exit(1)
+
+    try:
+        if manifest_path is not None:
+            try:
+                manifest = load_manifest(manifest_path)
+            except ManifestError as e:
+                click.echo(str(e), err=True)
+                sys.exit(1)
+            bingo_squares = manifest.phrases
+            cards = manifest.cards
+            first_card_id = manifest.first_card_id
+        else:
+            config = load_and_validate_config(cache_dir=get_config_cache_dir())
+            bingo_squares = config["bingo_squares"]
+            cards = card_matrix(bingo_squares, get_card_count(config), seed, unique)
+            first_card_id = 1
+
+        called_phrases = [phrase.strip() for phrase in called]
+        if called_file is not None:
+            lines = called_file.read_text(encoding="utf-8").splitlines()
+            called_phrases.extend(line.strip() for line in lines if line.strip())
+
+        known = set(bingo_squares)
+        for phrase in called_phrases:
+            if phrase not in known:
+                click.echo(f"Unknown phrase: {phrase}", err=True)
+
+        winners = find_winners(cards, bingo_squares, called_phrases, first_card_id)
+
+        if winners:
+            card_ids = ", ".join(f"#{card_id}" for card_id in winners)
+            click.echo(f"Winning cards ({len(winners)}): {card_ids}")
+        else:
+            click.echo("No winning cards.")
+        sys.exit(0)
+
+    except ConfigFileNotFoundError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigValidationError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    except ConfigError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "--games",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of games to simulate.",
+)
+@click.option(
+    "--cards",
+    "card_count",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of cards in play (defaults to card_count from the config).",
+)
+@click.option(
+    "--calls",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Also report the winners after this many calls. Repeatable.",
+)
+@click.option(
+    "--seed",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Seed for the simulated cards and call orders.",
+)
+@click.option(
+    "--unique",
+    type=click.Choice(UNIQUE_MODES),
+    default=None,
+    help="Simulate cards generated with this uniqueness mode.",
+)
+def simulate(
+    games: int,
+    card_count: int | None,
+    calls: tuple[int, ...],
+    seed: int | None,
+    unique: str | None,
+) -> None:
+    """Estimate how many calls it takes to produce winners."""
+    from bingomatic.simulate import PERCENTILES, percentiles, simulate_games
+    from bingomatic.verify import card_matrix
+
+    try:
+        config = load_and_validate_config(cache_dir=get_config_cache_dir())
+        bingo_squares = config["bingo_squares"]
+        if card_count is None:
+            card_count = get_card_count(config)
+        if seed is None:
+            import secrets
+
+            seed = secrets.randbits(32)
+
+        if unique is not None:
+            try:
+                check_unique_capacity(bingo_squares, card_count, unique)
+            except CardCapacityError as e:
+                click.echo(str(e), err=True)
+                sys.exit(1)
+
+        # Deal the cards exactly as generate would for this seed
+        cards = card_matrix(bingo_squares, card_count, seed, unique)
+        result = simulate_games(
+            cards,
+            bingo_squares,
+            games,
+            calls=tuple(sorted(set(calls))),
+            seed=seed,
+        )
+
+        rows = [
+            ("Calls to first bingo", result.first_bingo),
+            ("Winners at first bingo", result.first_winners),
+        ]
+        rows.extend(
+            (f"Winners after {k} calls", winners)
+            for k, winners in result.winners_after.items()
+        )
+        label_width = max(len(label) for label, _ in rows)
+
+        click.echo(
+            f"Simulated {games} games with {card_count} cards from "
+            f"{len(set(bingo_squares))} phrases (seed {seed})."
+        )
+        click.echo()
+        header = "".join(f"{f'p{level}':>7}" for level in PERCENTILES)
+        click.echo(f"{'':<{label_width}}{header}")
+        for label, values in rows:
+            cells = "".join(f"{value:>7}" for value in percentiles(values))
+            click.echo(f"{label:<{label_width}}{cells}")
         sys.exit(0)
 
     except ConfigFileNotFoundError as e:
@@ -97,5 +833,115 @@ def generate() -> None:
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    show_default=True,
+    help="Interface to listen on.",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=8080,
+    show_default=True,
+    help="TCP port to listen on.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Listen on this Unix socket instead of a TCP port.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of rendering processes (defaults to one per CPU).",
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Requests allowed to wait for a worker before answering 503 "
+    "(defaults to twice the number of workers).",
+)
+@click.option(
+    "--logo-dpi",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LOGO_DPI,
+    show_default=True,
+    help="Resolution the logo is downsampled to before embedding.",
+)
+@click.option(
+    "--logo-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory that request logos are taken from "
+    "(defaults to ~/.bingomatic/logos).",
+)
+@click.option(
+    "--font-cache/--no-font-cache",
+    default=True,
+    help="Keep parsed fonts next to the config file to speed up later runs.",
+)
+@click.option(
+    "--access-log",
+    is_flag=True,
+    help="Log every request to stderr.",
+)
+def serve(
+    host: str,
+    port: int,
+    socket_path: Path | None,
+    workers: int | None,
+    queue_size: int | None,
+    logo_dpi: int,
+    logo_dir: Path | None,
+    font_cache: bool,
+    access_log: bool,
+) -> None:
+    """Render cards on demand over HTTP.
+
+    POST a JSON object shaped like the config file to /cards to receive the
+    PDF; its logo_location names a file in the logo directory. GET /health
+    reports the worker pool's state.
+    """
+    from bingomatic.server import CardService, create_server, default_workers
+
+    workers = workers or default_workers()
+    queue_size = 2 * workers if queue_size is None else queue_size
+
+    service = CardService(
+        workers,
+        queue_size,
+        font_cache_dir=get_font_cache_dir() if font_cache else None,
+        logo_dpi=logo_dpi,
+        logo_dir=logo_dir or get_logo_dir(),
+    )
+    try:
+        server = create_server(service, host, port, socket_path, access_log)
+    except OSError as e:
+        service.close()
+        click.echo(f"Cannot listen: {e}", err=True)
+        sys.exit(1)
+
+    if socket_path is not None:
+        address = f"unix:{socket_path}"
+    else:
+        address = f"http://{host}:{server.server_address[1]}"
+    click.echo(f"Serving on {address} with {workers} workers (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+
 if __name__ == "__main__":
     main()
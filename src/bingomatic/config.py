@@ -1,10 +1,25 @@
 """Configuration loading and validation for Bingomatic."""
 
+import hashlib
+import os
+from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+import bingomatic
+from bingomatic.cachefile import read_cache, write_cache
+
+# libyaml's C loader is an order of magnitude faster on large phrase pools;
+# PyYAML falls back to the pure-Python loader when it was built without it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CONFIG_CACHE_VERSION = 2
+# Bump whenever validate_config accepts, rejects or normalizes a config
+# differently, so configs validated under the old rules are checked again
+CONFIG_SCHEMA_VERSION = 1
+
 
 class ConfigError(Exception):
     """Exception raised for configuration errors."""
@@ -52,6 +67,54 @@ def get_config_path() -> Path:
     return get_config_dir() / "config.yaml"
 
 
+def get_layout_cache_path() -> Path:
+    """Return the path to the phrase layout cache sidecar.
+
+    The sidecar lives next to the configuration file so that it follows
+    the event it was built for.
+
+    Returns:
+        Path to ~/.bingomatic/layout-cache.json
+    """
+    return get_config_path().parent / "layout-cache.json"
+
+
+def get_font_cache_dir() -> Path:
+    """Return the directory holding parsed fonts between runs.
+
+    Returns:
+        Path to ~/.bingomatic/font-cache
+    """
+    return get_config_path().parent / "font-cache"
+
+
+def get_config_cache_dir() -> Path:
+    """Return the directory holding validated configs between runs.
+
+    Returns:
+        Path to ~/.bingomatic/config-cache
+    """
+    return get_config_path().parent / "config-cache"
+
+
+def get_logo_dir() -> Path:
+    """Return the directory serve takes request logos from by default.
+
+    Returns:
+        Path to ~/.bingomatic/logos
+    """
+    return get_config_path().parent / "logos"
+
+
+def get_fit_cache_path() -> Path:
+    """Return the path to the cache of phrases checked by validate.
+
+    Returns:
+        Path to ~/.bingomatic/fit-cache.json
+    """
+    return get_config_path().parent / "fit-cache.json"
+
+
 def load_config(config_path: Path | None = None) -> dict[str, Any]:
     """Load and parse the YAML configuration file.
 
@@ -75,7 +138,7 @@ def load_config(config_path: Path | None = None) -> dict[str, Any]:
 
     try:
         with open(config_path) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
     except yaml.YAMLError as e:
         raise ConfigError(f"Config file has invalid YAML syntax: {e}")
 
@@ -123,6 +186,8 @@ def validate_config(config: dict[str, Any]) -> list[str]:
                 errors.append(
                     f"Field 'bingo_squares' must contain at least 24 items, got {len(value)}"
                 )
+            elif expected_type is list:
+                errors.extend(_phrase_type_errors(value))
 
     # Validate optional card_count field if present
     if "card_count" in config:
@@ -137,7 +202,28 @@ def validate_config(config: dict[str, Any]) -> list[str]:
     return errors
 
 
+MAX_LISTED_ENTRIES = 5  # Bad phrases named in a validation error
+
+
+def _phrase_type_errors(phrases: list[Any]) -> list[str]:
+    """Report bingo_squares entries that aren't non-empty strings."""
+    bad = [
+        f"#{index} ({type(phrase).__name__})"
+        if not isinstance(phrase, str)
+        else f"#{index} (empty)"
+        for index, phrase in enumerate(phrases, 1)
+        if not isinstance(phrase, str) or not phrase.strip()
+    ]
+    if not bad:
+        return []
+    listed = ", ".join(bad[:MAX_LISTED_ENTRIES])
+    if len(bad) > MAX_LISTED_ENTRIES:
+        listed += f" and {len(bad) - MAX_LISTED_ENTRIES} more"
+    return [f"Field 'bingo_squares' must only contain non-empty strings: {listed}"]
+
+
 DEFAULT_CARD_COUNT = 2
+DEFAULT_LOGO_DPI = 300  # Resolution the logo is downsampled to for printing
 
 
 def get_card_count(config: dict[str, Any]) -> int:
@@ -152,11 +238,49 @@ def get_card_count(config: dict[str, Any]) -> int:
     return config.get("card_count", DEFAULT_CARD_COUNT)
 
 
-def load_and_validate_config(config_path: Path | None = None) -> dict[str, Any]:
+def _config_cache_file(cache_dir: Path | str, config_path: Path) -> Path:
+    """Return where the cached copy of a config file is kept."""
+    digest = hashlib.blake2b(str(config_path.resolve()).encode(), digest_size=16)
+    return Path(cache_dir) / f"{digest.hexdigest()}.pickle"
+
+
+def _config_cache_key(config_path: Path, info: os.stat_result) -> tuple:
+    """Identify a config file's contents and the code that validated it."""
+    return (
+        bingomatic.__version__,
+        CONFIG_SCHEMA_VERSION,
+        str(config_path.resolve()),
+        info.st_mtime_ns,
+        info.st_size,
+    )
+
+
+def _load_cached_config(cache_file: Path, key: tuple) -> dict[str, Any] | None:
+    """Return a cached config if it was stored for the same file contents."""
+    entry = read_cache(cache_file, CONFIG_CACHE_VERSION, pickled=True)
+    if not isinstance(entry, tuple) or len(entry) != 2 or entry[0] != key:
+        return None
+    return entry[1]
+
+
+def _save_cached_config(cache_file: Path, key: tuple, config: dict[str, Any]) -> None:
+    """Store a validated config, ignoring a cache directory that can't be written."""
+    with suppress(OSError):
+        write_cache(cache_file, CONFIG_CACHE_VERSION, (key, config), pickled=True)
+
+
+def load_and_validate_config(
+    config_path: Path | None = None, cache_dir: Path | str | None = None
+) -> dict[str, Any]:
     """Load and validate the configuration file.
 
+    With a cache_dir, a config that validated is stored there ready to use,
+    keyed on its path, modification time and size. Loading it again while
+    the file is unchanged skips both parsing and validation.
+
     Args:
         config_path: Optional path to config file. Defaults to ~/.bingomatic
+        cache_dir: Optional directory of validated configs kept between runs
 
     Returns:
         Dictionary containing the validated configuration
@@ -166,10 +290,28 @@ def load_and_validate_config(config_path: Path | None = None) -> dict[str, Any]:
         ConfigError: If the YAML syntax is invalid
         ConfigValidationError: If validation fails
     """
+    if config_path is None:
+        config_path = get_config_path()
+
+    cache_file = key = None
+    if cache_dir is not None:
+        try:
+            info = config_path.stat()
+        except OSError:
+            pass  # load_config reports the missing file
+        else:
+            cache_file = _config_cache_file(cache_dir, config_path)
+            key = _config_cache_key(config_path, info)
+            config = _load_cached_config(cache_file, key)
+            if config is not None:
+                return config
+
     config = load_config(config_path)
     errors = validate_config(config)
 
     if errors:
         raise ConfigValidationError(errors)
 
+    if cache_file is not None:
+        _save_cached_config(cache_file, key, config)
     return config
@@ -0,0 +1,638 @@
+"""Export every card as its own PNG or SVG image.
+
+Each card is drawn by bingomatic.pdf.draw_card, the same code that lays
+out a printed card, onto a small canvas that turns its drawing calls into
+a Pillow image or SVG elements instead of PDF operators. Cards are
+rendered in chunks by a pool of worker processes, each of which registers
+the fonts and prepares the logo once, and are written in card order to a
+directory or a zip file as the chunks come back.
+"""
+
+import base64
+import io
+import math
+import os
+import random
+import zipfile
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+from xml.sax.saxutils import escape, quoteattr
+
+from PIL import Image, ImageDraw, ImageFont
+
+from bingomatic.cards import start_sampler
+from bingomatic.imposition import CELL_HEIGHT, CELL_WIDTH, FOOTER_SPACE
+from bingomatic.manifest import ManifestWriter
+from bingomatic.pdf import FONTS_DIR, LOGO_DPI, decode_logo, draw_card, register_fonts
+from bingomatic.roster import Attendee
+from bingomatic.timings import stage
+
+EXPORT_FORMATS = ("png", "svg")
+DEFAULT_EXPORT_DPI = 150
+EXPORT_CHUNK_CARDS = 25  # Cards rendered per task handed to a worker
+CARD_MARGIN = 18  # White border around each card image, in points
+TEXT_CACHE_SIZE = 8192  # Rendered lines of text kept per worker
+PNG_COMPRESS_LEVEL = 3  # zlib level; higher levels are slower for little gain
+
+# Size of a card image in points
+CARD_WIDTH = CELL_WIDTH + 2 * CARD_MARGIN
+CARD_HEIGHT = CELL_HEIGHT + 2 * CARD_MARGIN
+
+# Bundled font files, and how SVG viewers should find each font
+_FONT_FILES = {
+    "Roboto": "Roboto-Regular.ttf",
+    "Roboto-Bold": "Roboto-Bold.ttf",
+    "RobotoMono": "RobotoMono-Regular.ttf",
+}
+_SVG_FONTS = {
+    "Roboto": ("Roboto, Helvetica, Arial, sans-serif", "normal"),
+    "Roboto-Bold": ("Roboto, Helvetica, Arial, sans-serif", "bold"),
+    "RobotoMono": ("'Roboto Mono', 'DejaVu Sans Mono', Menlo, monospace", "normal"),
+}
+
+# Text anchors of the canvas string calls, as Pillow anchors
+_ANCHORS = {"start": "ls", "middle": "ms", "end": "rs"}
+
+_worker_logo = None  # Logo prepared once per worker process
+
+
+class SvgImage(NamedTuple):
+    """A logo encoded once for embedding in every SVG card."""
+
+    data_uri: str
+    size: tuple[int, int]
+
+
+class _TextObject:
+    """Collects the phrases of a card like a ReportLab text object.
+
+    Only what draw_card uses is supported: each textOut starts at the
+    origin set just before it.
+    """
+
+    def __init__(self) -> None:
+        self.runs: list[tuple[tuple[str, float], tuple, float, float, str]] = []
+        self._font = ("Roboto", 12.0)
+        self._fill = (0.0, 0.0, 0.0)
+        self._origin = (0.0, 0.0)
+
+    def setFillColorRGB(self, r: float, g: float, b: float) -> None:
+        self._fill = (r, g, b)
+
+    def setFont(self, name: str, size: float) -> None:
+        self._font = (name, size)
+
+    def setTextOrigin(self, x: float, y: float) -> None:
+        self._origin = (x, y)
+
+    def textOut(self, text: str) -> None:
+        self.runs.append((self._font, self._fill, *self._origin, text))
+
+
+class _ImageCanvas(ABC):
+    """The drawing calls of draw_card, in points with the origin at the bottom.
+
+    Subclasses turn each call into their own output. Text calls all end up
+    in _text, so a subclass implements the shapes, _text and to_bytes.
+    """
+
+    def __init__(self) -> None:
+        self._stroke = (0.0, 0.0, 0.0)
+        self._fill = (0.0, 0.0, 0.0)
+        self._line_width = 1.0
+        self._font = ("Roboto", 12.0)
+
+    def setStrokeColorRGB(self, r: float, g: float, b: float) -> None:
+        self._stroke = (r, g, b)
+
+    def setFillColorRGB(self, r: float, g: float, b: float) -> None:
+        self._fill = (r, g, b)
+
+    def setLineWidth(self, width: float) -> None:
+        self._line_width = width
+
+    def setFont(self, name: str, size: float) -> None:
+        self._font = (name, size)
+
+    def drawString(self, x: float, y: float, text: str) -> None:
+        self._text(self._font, self._fill, x, y, text, "start")
+
+    def drawCentredString(self, x: float, y: float, text: str) -> None:
+        self._text(self._font, self._fill, x, y, text, "middle")
+
+    def drawRightString(self, x: float, y: float, text: str) -> None:
+        self._text(self._font, self._fill, x, y, text, "end")
+
+    def beginText(self) -> _TextObject:
+        return _TextObject()
+
+    def drawText(self, text_object: _TextObject) -> None:
+        for font, fill, x, y, text in text_object.runs:
+            self._text(font, fill, x, y, text, "start")
+
+    @abstractmethod
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        """Draw a line in the stroke color."""
+
+    @abstractmethod
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        fill: int = 0,
+        stroke: int = 1,
+    ) -> None:
+        """Draw a rectangle, filled and outlined as asked."""
+
+    @abstractmethod
+    def drawImage(
+        self,
+        image: Image.Image | SvgImage,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        preserveAspectRatio: bool = False,
+        anchor: str = "c",
+        mask: str | None = None,
+    ) -> None:
+        """Draw a logo prepared by prepare_logo into a box."""
+
+    @abstractmethod
+    def _text(
+        self,
+        font: tuple[str, float],
+        fill: tuple,
+        x: float,
+        y: float,
+        text: str,
+        anchor: str,
+    ) -> None:
+        """Draw one line of text; anchor is "start", "middle" or "end"."""
+
+    @abstractmethod
+    def to_bytes(self) -> bytes:
+        """Return the finished image file."""
+
+
+def _rgb(color: tuple) -> tuple[int, int, int]:
+    return tuple(round(channel * 255) for channel in color)
+
+
+@lru_cache(maxsize=64)
+def _pillow_font(name: str, pixels: float) -> ImageFont.FreeTypeFont:
+    """Load a bundled font at a size in pixels, once per size."""
+    return ImageFont.truetype(str(FONTS_DIR / _FONT_FILES[name]), pixels)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_mask(
+    name: str, pixels: float, text: str, anchor: str
+) -> tuple[Image.Image, int, int]:
+    """Render a line of text once as a coverage mask.
+
+    Phrases repeat from card to card, and rasterizing their glyphs is most
+    of the cost of a PNG card, so each line is rendered once per size.
+
+    Returns:
+        The mask and the offset of its top-left corner from the anchor point
+    """
+    font = _pillow_font(name, pixels)
+    left, top, right, bottom = font.getbbox(text, anchor=anchor)
+    mask = Image.new("L", (right - left, bottom - top))
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font, anchor=anchor)
+    return mask, left, top
+
+
+class _RasterCanvas(_ImageCanvas):
+    """Draws a card onto a white Pillow image."""
+
+    def __init__(self, dpi: int) -> None:
+        super().__init__()
+        self.scale = dpi / 72
+        self.image = Image.new(
+            "RGB",
+            (round(CARD_WIDTH * self.scale), round(CARD_HEIGHT * self.scale)),
+            "white",
+        )
+        self._draw = ImageDraw.Draw(self.image)
+
+    def _point(self, x: float, y: float) -> tuple[float, float]:
+        return x * self.scale, (CARD_HEIGHT - y) * self.scale
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self._draw.line(
+            [self._point(x1, y1), self._point(x2, y2)],
+            fill=_rgb(self._stroke),
+            width=max(1, round(self._line_width * self.scale)),
+        )
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        fill: int = 0,
+        stroke: int = 1,
+    ) -> None:
+        left, top = self._point(x, y + height)
+        right, bottom = self._point(x + width, y)
+        # Cover only the pixels whose centers fall inside the rectangle, as
+        # a PDF viewer would, so a filled square leaves half of a grid line
+        self._draw.rectangle(
+            [
+                math.ceil(left),
+                math.ceil(top),
+                math.floor(right) - 1,
+                math.floor(bottom) - 1,
+            ],
+            fill=_rgb(self._fill) if fill else None,
+            outline=_rgb(self._stroke) if stroke else None,
+        )
+
+    def drawImage(
+        self,
+        image: Image.Image,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        preserveAspectRatio: bool = False,
+        anchor: str = "c",
+        mask: str | None = None,
+    ) -> None:
+        if preserveAspectRatio:
+            fit = min(width / image.width, height / image.height)
+            x += (width - image.width * fit) / 2
+            y += (height - image.height * fit) / 2
+            width, height = image.width * fit, image.height * fit
+        pixels = (round(width * self.scale), round(height * self.scale))
+        if image.size != pixels:
+            image = image.resize(pixels, Image.Resampling.LANCZOS)
+        left, top = self._point(x, y + height)
+        self.image.paste(
+            image, (round(left), round(top)), image if image.mode == "RGBA" else None
+        )
+
+    def _text(self, font, fill, x, y, text, anchor) -> None:
+        name, size = font
+        mask, left, top = _text_mask(name, size * self.scale, text, _ANCHORS[anchor])
+        if mask.width and mask.height:
+            x, y = self._point(x, y)
+            self.image.paste(_rgb(fill), (round(x) + left, round(y) + top), mask)
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        dpi = (self.scale * 72, self.scale * 72)
+        self.image.save(buffer, "PNG", dpi=dpi, compress_level=PNG_COMPRESS_LEVEL)
+        return buffer.getvalue()
+
+
+def _svg_color(color: tuple) -> str:
+    red, green, blue = _rgb(color)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+class _SvgCanvas(_ImageCanvas):
+    """Writes a card as SVG elements, in points."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._elements: list[str] = []
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self._elements.append(
+            f'<line x1="{x1:g}" y1="{CARD_HEIGHT - y1:g}" x2="{x2:g}" '
+            f'y2="{CARD_HEIGHT - y2:g}" stroke="{_svg_color(self._stroke)}" '
+            f'stroke-width="{self._line_width:g}"/>'
+        )
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        fill: int = 0,
+        stroke: int = 1,
+    ) -> None:
+        fill_color = _svg_color(self._fill) if fill else "none"
+        stroke_color = _svg_color(self._stroke) if stroke else "none"
+        self._elements.append(
+            f'<rect x="{x:g}" y="{CARD_HEIGHT - y - height:g}" width="{width:g}" '
+            f'height="{height:g}" fill="{fill_color}" stroke="{stroke_color}"/>'
+        )
+
+    def drawImage(
+        self,
+        image: SvgImage,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        preserveAspectRatio: bool = False,
+        anchor: str = "c",
+        mask: str | None = None,
+    ) -> None:
+        aspect = "xMidYMid meet" if preserveAspectRatio else "none"
+        self._elements.append(
+            f'<image x="{x:g}" y="{CARD_HEIGHT - y - height:g}" width="{width:g}" '
+            f'height="{height:g}" preserveAspectRatio="{aspect}" '
+            f'href="{image.data_uri}"/>'
+        )
+
+    def _text(self, font, fill, x, y, text, anchor) -> None:
+        name, size = font
+        family, weight = _SVG_FONTS[name]
+        self._elements.append(
+            f'<text x="{x:g}" y="{CARD_HEIGHT - y:g}" font-family={quoteattr(family)} '
+            f'font-weight="{weight}" font-size="{size:g}" text-anchor="{anchor}" '
+            f'fill="{_svg_color(fill)}">{escape(text)}</text>'
+        )
+
+    def to_bytes(self) -> bytes:
+        header = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{CARD_WIDTH}pt" '
+            f'height="{CARD_HEIGHT}pt" viewBox="0 0 {CARD_WIDTH} {CARD_HEIGHT}">\n'
+            f'<rect width="{CARD_WIDTH}" height="{CARD_HEIGHT}" fill="#ffffff"/>\n'
+        )
+        return (header + "\n".join(self._elements) + "\n</svg>\n").encode()
+
+
+def prepare_logo(
+    logo_path: Path | str, card_format: str, dpi: int
+) -> Image.Image | SvgImage:
+    """Decode a logo once for drawing on every card of a format.
+
+    Args:
+        logo_path: Path to the logo image file
+        card_format: "png" or "svg"
+        dpi: Resolution the logo is downsampled to
+
+    Returns:
+        The logo as render_card expects it for the format
+    """
+    image = decode_logo(logo_path, dpi=dpi)
+    if card_format == "png":
+        return image
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    data = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return SvgImage(f"data:image/png;base64,{data}", image.size)
+
+
+def render_card(
+    card_format: str,
+    squares: list[str] | None,
+    event_name: str | None = None,
+    logo: Image.Image | SvgImage | None = None,
+    card_id: int | None = None,
+    dpi: int = DEFAULT_EXPORT_DPI,
+    attendee: Attendee | None = None,
+) -> bytes:
+    """Render one card as a PNG or SVG image.
+
+    The fonts must be registered (see bingomatic.pdf.register_fonts), as the
+    phrases are laid out with the same metrics as printed cards.
+
+    Args:
+        card_format: "png" or "svg"
+        squares: Optional list of 24 square texts (excluding center)
+        event_name: Optional event name to display above the grid
+        logo: Optional logo from prepare_logo for the same format
+        card_id: Optional card ID to print below the name field
+        dpi: Resolution of PNG images
+        attendee: Optional attendee whose name is printed on the name field
+
+    Returns:
+        The encoded image
+    """
+    canvas = _RasterCanvas(dpi) if card_format == "png" else _SvgCanvas()
+    draw_card(
+        canvas,
+        CARD_MARGIN,
+        CARD_MARGIN + FOOTER_SPACE,
+        squares,
+        event_name=event_name,
+        logo=logo,
+        card_id=card_id,
+        attendee=attendee,
+    )
+    return canvas.to_bytes()
+
+
+def _init_worker(
+    card_format: str,
+    logo_path: Path | str | None,
+    logo_dpi: int,
+    font_cache_dir: Path | str | None,
+) -> None:
+    """Register the fonts and prepare the logo once per worker process."""
+    global _worker_logo
+    register_fonts(font_cache_dir)
+    _worker_logo = prepare_logo(logo_path, card_format, logo_dpi) if logo_path else None
+
+
+def _render_chunk(
+    card_format: str,
+    dpi: int,
+    event_name: str | None,
+    card_ids: list[int | None],
+    cards: list[list[str] | None],
+    attendees: list[Attendee | None],
+) -> list[bytes]:
+    """Render a chunk of cards in a worker process."""
+    return [
+        render_card(
+            card_format, squares, event_name, _worker_logo, card_id, dpi, attendee
+        )
+        for card_id, squares, attendee in zip(card_ids, cards, attendees, strict=True)
+    ]
+
+
+@contextmanager
+def _card_writer(
+    output_path: Path, card_format: str
+) -> Iterator[Callable[[str, bytes], None]]:
+    """Yield a function writing card images to a directory or zip file.
+
+    A zip file is written under a temporary name and only replaces an
+    existing one once complete. In a directory, cards of the same format
+    left by an earlier export are removed first.
+    """
+    if output_path.suffix == ".zip":
+        tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+        # PNG data is already compressed
+        compression = (
+            zipfile.ZIP_STORED if card_format == "png" else zipfile.ZIP_DEFLATED
+        )
+        try:
+            with zipfile.ZipFile(tmp_path, "w", compression) as archive:
+                yield archive.writestr
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, output_path)
+        return
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    for stale_card in output_path.glob(f"card-*.{card_format}"):
+        stale_card.unlink()
+
+    def write(name: str, data: bytes) -> None:
+        (output_path / name).write_bytes(data)
+
+    yield write
+
+
+def export_cards(
+    output_path: Path | str,
+    card_count: int,
+    card_format: str = "png",
+    dpi: int = DEFAULT_EXPORT_DPI,
+    event_name: str | None = None,
+    logo_path: Path | str | None = None,
+    bingo_squares: list[str] | None = None,
+    seed: int | None = None,
+    unique: str | None = None,
+    first_card_id: int = 1,
+    manifest_path: Path | str | None = None,
+    show_card_ids: bool | None = None,
+    workers: int = 1,
+    logo_dpi: int = LOGO_DPI,
+    font_cache_dir: Path | str | None = None,
+    rng: random.Random | None = None,
+    attendees: Iterable[Attendee] | None = None,
+) -> Path:
+    """Write every card of a run as its own PNG or SVG image.
+
+    Cards are named card-0001.png and so on after their IDs. The squares of
+    every card are chosen in this process, exactly as generate_pdf chooses
+    them, so a seeded export has the same cards as the seeded PDF.
+
+    Args:
+        output_path: Directory to write the cards to, or a .zip file
+        card_count: Number of bingo cards to export
+        card_format: "png" or "svg"
+        dpi: Resolution of PNG cards
+        event_name: Optional event name to display above each grid
+        logo_path: Optional path to logo image for center square
+        bingo_squares: Optional list of bingo square phrases (requires 24+ items)
+        seed: Optional run seed that fixes every card's squares
+        unique: Optional uniqueness mode ("set" or "layout")
+        first_card_id: ID of the first card
+        manifest_path: Optional path where the card manifest is written
+        show_card_ids: Whether to print each card's ID below it; by default
+            IDs are printed when a seed or manifest_path is given
+        workers: Number of processes to render cards with
+        logo_dpi: Resolution the logo of SVG cards is embedded at; PNG
+            cards use their own resolution
+        font_cache_dir: Optional directory of parsed fonts kept between runs
+        rng: Optional random generator used to pick each card's squares
+            when no seed is given
+        attendees: Optional attendees to print on the cards' name fields,
+            consumed one per card (see bingomatic.roster)
+
+    Returns:
+        Path to the directory or zip file
+
+    Raises:
+        ValueError: If card_format is unknown, or manifest_path is given
+            without bingo_squares
+        CardCapacityError: If unique is set and the pool can't provide
+            card_count distinct cards
+    """
+    if card_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown card format: {card_format}")
+    if manifest_path is not None and not bingo_squares:
+        raise ValueError("A card manifest needs bingo_squares")
+    if show_card_ids is None:
+        show_card_ids = seed is not None or manifest_path is not None
+    output_path = Path(output_path)
+    if attendees is not None:
+        attendees = iter(attendees)
+
+    sampler = None
+    if bingo_squares:
+        sampler = start_sampler(
+            bingo_squares, card_count, first_card_id, seed=seed, rng=rng, unique=unique
+        )
+
+    last_id = first_card_id + card_count - 1
+    digits = max(4, len(str(last_id)))
+    worker_args = (
+        card_format,
+        logo_path,
+        dpi if card_format == "png" else logo_dpi,
+        font_cache_dir,
+    )
+
+    if manifest_path is not None:
+        manifest = ManifestWriter(manifest_path, bingo_squares, first_card_id)
+    else:
+        manifest = nullcontext()
+
+    def chunks() -> Iterator[tuple[list[int], tuple]]:
+        for start in range(first_card_id, last_id + 1, EXPORT_CHUNK_CARDS):
+            ids = list(range(start, min(start + EXPORT_CHUNK_CARDS, last_id + 1)))
+            cards = [None] * len(ids)
+            if sampler is not None:
+                with stage("choose_squares"):
+                    cards = [sampler.squares(card_id) for card_id in ids]
+                if manifest_path is not None:
+                    for squares in cards:
+                        manifest.append(squares)
+            printed_ids = ids if show_card_ids else [None] * len(ids)
+            chunk_attendees = [None] * len(ids)
+            if attendees is not None:
+                chunk_attendees = [next(attendees, None) for _ in ids]
+            yield ids, (printed_ids, cards, chunk_attendees)
+
+    with manifest, _card_writer(output_path, card_format) as write:
+
+        def write_chunk(ids: list[int], images: list[bytes]) -> None:
+            with stage("write_cards"):
+                for card_id, image in zip(ids, images, strict=True):
+                    write(f"card-{card_id:0{digits}d}.{card_format}", image)
+
+        if workers == 1:
+            _init_worker(*worker_args)
+            for ids, job in chunks():
+                with stage("render_cards"):
+                    images = _render_chunk(card_format, dpi, event_name, *job)
+                write_chunk(ids, images)
+            return output_path
+
+        # Keep at most two chunks per worker in flight, so finished cards
+        # are written as they arrive instead of piling up in memory
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=worker_args
+        ) as executor:
+            pending = deque()
+            for ids, job in chunks():
+                future = executor.submit(
+                    _render_chunk, card_format, dpi, event_name, *job
+                )
+                pending.append((ids, future))
+                if len(pending) >= workers * 2:
+                    ids, future = pending.popleft()
+                    with stage("wait_for_cards"):
+                        images = future.result()
+                    write_chunk(ids, images)
+            while pending:
+                ids, future = pending.popleft()
+                with stage("wait_for_cards"):
+                    images = future.result()
+                write_chunk(ids, images)
+
+    return output_path
@@ -0,0 +1,138 @@
+"""TrueType font loading with an on-disk cache of parsed fonts.
+
+Parsing a TTF with ReportLab's TTFont walks every table of the file, which
+is one of the larger fixed costs of a short run. The parsed face is plain
+data, so it is pickled to a cache directory the first time a font is
+loaded and unpickled on later runs. Cache entries are keyed by a hash of
+the font file and the ReportLab version, so editing a font or upgrading
+ReportLab simply misses the cache.
+"""
+
+import hashlib
+from contextlib import suppress
+from fnmatch import fnmatch
+from pathlib import Path
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+
+from bingomatic.cachefile import read_cache, write_cache
+from bingomatic.metrics import build_font_metrics
+
+FONT_CACHE_VERSION = 2
+
+# Face attributes that aren't cached: the raw file is re-read to compute the
+# cache key anyway, and the scale function is rebuilt from unitsPerEm.
+_UNCACHED_ATTRIBUTES = ("_ttf_data", "_pdfScale")
+
+
+def font_cache_key(font_data: bytes) -> str:
+    """Return the cache key of a font file's contents.
+
+    Args:
+        font_data: Raw bytes of the TTF file
+
+    Returns:
+        Hex digest covering the file, the ReportLab version and the cache
+        format
+    """
+    digest = hashlib.blake2b(font_data, digest_size=20)
+    digest.update(f"\0{reportlab.Version}\0{FONT_CACHE_VERSION}".encode())
+    return digest.hexdigest()
+
+
+def _pdf_scale(units_per_em: int):
+    """Rebuild the glyph-unit to PDF-unit scale function of a face."""
+    if units_per_em == 1000:
+        return lambda x: x
+    multiplier = 1000 / units_per_em
+    return lambda x: x * multiplier
+
+
+def _restore_font(font_name: str, state: dict, font_data: bytes) -> TTFont:
+    """Rebuild a TTFont from a cached face, mirroring TTFont.__init__."""
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state)
+    face._ttf_data = font_data
+    face._pdfScale = _pdf_scale(face.unitsPerEm)
+
+    font = TTFont.__new__(TTFont)
+    font.fontName = font_name
+    font.face = face
+    font.encoding = TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(
+        fnmatch(font_name, pattern) for pattern in rl_config.unShapedFontGlob
+    )
+    return font
+
+
+def _read_cached_face(cache_path: Path) -> dict | None:
+    """Return a cached face's attributes, or None if the entry is unusable."""
+    state = read_cache(cache_path, FONT_CACHE_VERSION, pickled=True)
+    return state if isinstance(state, dict) else None
+
+
+def _write_cached_face(cache_path: Path, font: TTFont) -> None:
+    """Save a parsed face, atomically, ignoring an unwritable cache."""
+    state = {
+        name: value
+        for name, value in vars(font.face).items()
+        if name not in _UNCACHED_ATTRIBUTES
+    }
+    with suppress(OSError):
+        write_cache(cache_path, FONT_CACHE_VERSION, state, pickled=True)
+
+
+def load_ttfont(
+    font_name: str, font_path: Path | str, cache_dir: Path | str | None = None
+) -> TTFont:
+    """Load a TrueType font, through the font cache when one is given.
+
+    Args:
+        font_name: Name to register the font under
+        font_path: Path to the TTF file
+        cache_dir: Optional directory holding parsed fonts between runs
+
+    Returns:
+        The loaded font, equivalent to TTFont(font_name, font_path)
+    """
+    font_path = Path(font_path)
+    if cache_dir is None:
+        return TTFont(font_name, str(font_path))
+
+    font_data = font_path.read_bytes()
+    cache_path = Path(cache_dir) / f"{font_cache_key(font_data)}.pickle"
+
+    state = _read_cached_face(cache_path)
+    if state is not None:
+        # The cached face remembers the path it was first parsed from
+        state["filename"] = str(font_path)
+        return _restore_font(font_name, state, font_data)
+
+    font = TTFont(font_name, str(font_path))
+    _write_cached_face(cache_path, font)
+    return font
+
+
+def register_font(
+    font_name: str, font_path: Path | str, cache_dir: Path | str | None = None
+) -> TTFont:
+    """Register a TrueType font for drawing and text measurement.
+
+    Args:
+        font_name: Name to register the font under
+        font_path: Path to the TTF file
+        cache_dir: Optional directory holding parsed fonts between runs
+
+    Returns:
+        The registered font
+    """
+    font = load_ttfont(font_name, font_path, cache_dir)
+    pdfmetrics.registerFont(font)
+    build_font_metrics(font_name)
+    return font
@@ -0,0 +1,124 @@
+"""Imposition: placing bingo cards on printed pages.
+
+Every card takes up the same cell: the 5x5 grid, the event name above it
+and the name field and card ID below it. page_layout works out, once per
+run, how many cells of a given scale fit on a page, which way round the
+page should be printed to fit the most, and where each card goes. The
+resulting PageLayout is reused for every page of the run.
+"""
+
+from typing import NamedTuple
+
+from bingomatic.cards import GRID_SIZE
+
+INCH = 72
+MM = INCH / 25.4
+
+# Card dimensions (in points, 72 points = 1 inch) at a scale of 1
+SQUARE_SIZE = 72  # 1 inch
+GAP = 36  # 0.5 inch gap between cards
+GRID_TOTAL = SQUARE_SIZE * GRID_SIZE  # 5 inches total
+HEADER_SPACE = 36  # 0.5 inch for the event name above the grid
+FOOTER_SPACE = 54  # 0.75 inch for the name field and card ID below the grid
+CELL_WIDTH = GRID_TOTAL
+CELL_HEIGHT = HEADER_SPACE + GRID_TOTAL + FOOTER_SPACE
+
+# Portrait page sizes in points. Kept free of ReportLab so the CLI can
+# offer them without importing it.
+PAGE_SIZES = {
+    "letter": (8.5 * INCH, 11 * INCH),
+    "a4": (210 * MM, 297 * MM),
+    "tabloid": (11 * INCH, 17 * INCH),
+    "13x19": (13 * INCH, 19 * INCH),
+}
+DEFAULT_PAGE_SIZE = "letter"
+DEFAULT_MARGIN = 18  # 0.25 inch
+
+
+class ImpositionError(ValueError):
+    """Raised when a card doesn't fit on the page."""
+
+    pass
+
+
+class PageLayout(NamedTuple):
+    """Where the cards of every page go."""
+
+    page_size: tuple[float, float]  # Width and height as printed, in points
+    scale: float  # Size of each card relative to a 5" grid
+    positions: tuple[tuple[float, float], ...]  # Grid corners, in reading order
+
+    @property
+    def cards_per_page(self) -> int:
+        """Number of cards on a full page."""
+        return len(self.positions)
+
+
+def _cells_across(length: float, cell: float, margin: float, gap: float) -> int:
+    """Count the cells that fit in a length of page between its margins."""
+    usable = length - 2 * margin
+    if usable < cell:
+        return 0
+    return int((usable + gap) // (cell + gap))
+
+
+def page_layout(
+    page_size: str | tuple[float, float] = DEFAULT_PAGE_SIZE,
+    scale: float = 1.0,
+    margin: float = DEFAULT_MARGIN,
+) -> PageLayout:
+    """Compute the densest placement of cards on a page.
+
+    Cards are laid out in rows and columns with a gap between them, the
+    whole block centered on the page. Both orientations are tried and the
+    one holding more cards wins; on a tie the page is printed landscape.
+
+    Args:
+        page_size: Name of a size in PAGE_SIZES, or (width, height) in points
+        scale: Size of each card relative to a 5" grid; the gap between
+            cards scales with it
+        margin: Smallest distance between a card and the page edge, in points
+
+    Returns:
+        The page size as printed and the position of every card on it,
+        given as the bottom-left corner of its grid, top row first
+
+    Raises:
+        ImpositionError: If no card fits on the page
+    """
+    if isinstance(page_size, str):
+        try:
+            page_size = PAGE_SIZES[page_size]
+        except KeyError:
+            raise ImpositionError(f"Unknown page size: {page_size}") from None
+    if scale <= 0:
+        raise ImpositionError("Card scale must be positive")
+    short, long = sorted(page_size)
+    cell_width = CELL_WIDTH * scale
+    cell_height = CELL_HEIGHT * scale
+    gap = GAP * scale
+
+    best = None
+    for width, height in ((long, short), (short, long)):
+        columns = _cells_across(width, cell_width, margin, gap)
+        rows = _cells_across(height, cell_height, margin, gap)
+        if best is None or columns * rows > best[2] * best[3]:
+            best = (width, height, columns, rows)
+    width, height, columns, rows = best
+    if columns * rows == 0:
+        raise ImpositionError(
+            f"A card at scale {scale:g} does not fit on a "
+            f"{width / INCH:g}x{height / INCH:g} inch page"
+        )
+
+    left = (width - (columns * cell_width + (columns - 1) * gap)) / 2
+    bottom = (height - (rows * cell_height + (rows - 1) * gap)) / 2
+    positions = tuple(
+        (
+            left + column * (cell_width + gap),
+            bottom + row * (cell_height + gap) + FOOTER_SPACE * scale,
+        )
+        for row in reversed(range(rows))
+        for column in range(columns)
+    )
+    return PageLayout((width, height), scale, positions)
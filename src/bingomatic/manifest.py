@@ -0,0 +1,274 @@
+"""Binary card manifests for Bingomatic.
+
+A manifest records exactly which squares went on every printed card, so a
+run can be checked, reprinted or analyzed without parsing its PDF. The file
+is laid out as:
+
+- a fixed-size little-endian header (see _HEADER)
+- the phrase table: one uint32 byte length per phrase, followed by the
+  UTF-8 encoded phrases back to back
+- zero padding up to a 64-byte boundary
+- the card matrix: card_count rows of squares_per_card uint16 indices into
+  the phrase table, in grid order, row-major
+
+The card matrix is memory-mapped when the manifest is loaded, so opening
+even a million-card manifest only reads the header and phrase table.
+"""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+
+from bingomatic.cards import SQUARES_PER_CARD
+
+MANIFEST_MAGIC = b"BINGOMAN"
+MANIFEST_VERSION = 1
+MAX_PHRASES = 1 << 16  # Card squares are stored as uint16 phrase indices
+
+# magic, version, squares per card, phrase count, card count,
+# first card ID, card matrix offset
+_HEADER = struct.Struct("<8sHHIQQQ")
+_MATRIX_ALIGNMENT = 64
+_FLUSH_ROWS = 4096  # Cards buffered between writes
+_COPY_ROWS = 65536  # Cards copied at a time when extending from a manifest
+
+
+class ManifestError(Exception):
+    """Exception raised when a manifest can't be written or read."""
+
+    pass
+
+
+class Manifest:
+    """A loaded card manifest.
+
+    Attributes:
+        phrases: The run's phrase table
+        cards: Read-only (card_count, squares_per_card) uint16 matrix of
+            indices into phrases, memory-mapped from the file
+        first_card_id: ID of the card in the first row of cards
+    """
+
+    def __init__(self, phrases: list[str], cards: np.ndarray, first_card_id: int):
+        self.phrases = phrases
+        self.cards = cards
+        self.first_card_id = first_card_id
+
+    @property
+    def card_count(self) -> int:
+        """Number of cards in the manifest."""
+        return len(self.cards)
+
+    def squares(self, card_id: int) -> list[str]:
+        """Return the squares of one card, in grid order.
+
+        Args:
+            card_id: ID of the card
+
+        Returns:
+            The card's phrases
+
+        Raises:
+            KeyError: If the card isn't in the manifest
+        """
+        row = card_id - self.first_card_id
+        if not 0 <= row < self.card_count:
+            raise KeyError(f"Card #{card_id} is not in this manifest")
+        return [self.phrases[index] for index in self.cards[row].tolist()]
+
+
+class ManifestWriter:
+    """Stream cards into a manifest file as they are chosen.
+
+    Rows are buffered and written in batches; the card count in the header
+    is filled in when the writer is closed.
+    """
+
+    def __init__(
+        self,
+        output_path: Path | str,
+        bingo_squares: list[str],
+        first_card_id: int = 1,
+        squares_per_card: int = SQUARES_PER_CARD,
+    ):
+        if len(bingo_squares) > MAX_PHRASES:
+            raise ManifestError(
+                f"Cannot record more than {MAX_PHRASES} phrases, "
+                f"got {len(bingo_squares)}"
+            )
+
+        self.output_path = Path(output_path)
+        self.phrases = list(bingo_squares)
+        self.first_card_id = first_card_id
+        self.squares_per_card = squares_per_card
+        self.card_count = 0
+
+        # Repeated phrases all map to their first entry
+        self._index = {}
+        for index, phrase in enumerate(self.phrases):
+            self._index.setdefault(phrase, index)
+
+        encoded = [phrase.encode("utf-8") for phrase in self.phrases]
+        table = array("I", [len(data) for data in encoded])
+        if sys.byteorder == "big":
+            table.byteswap()
+        table_size = _HEADER.size + len(table) * table.itemsize
+        table_size += sum(len(data) for data in encoded)
+        self._matrix_offset = -(-table_size // _MATRIX_ALIGNMENT) * _MATRIX_ALIGNMENT
+
+        self._rows = array("H")
+        self._file = open(self.output_path, "wb")
+        self._file.write(self._header())
+        self._file.write(table.tobytes())
+        self._file.writelines(encoded)
+        self._file.write(b"\0" * (self._matrix_offset - table_size))
+
+    def _header(self) -> bytes:
+        return _HEADER.pack(
+            MANIFEST_MAGIC,
+            MANIFEST_VERSION,
+            self.squares_per_card,
+            len(self.phrases),
+            self.card_count,
+            self.first_card_id,
+            self._matrix_offset,
+        )
+
+    def _flush(self) -> None:
+        if sys.byteorder == "big":
+            self._rows.byteswap()
+        self._file.write(self._rows.tobytes())
+        del self._rows[:]
+
+    def append(self, squares: list[str]) -> None:
+        """Record the next card.
+
+        Args:
+            squares: The card's phrases, in grid order
+
+        Raises:
+            ManifestError: If the card has the wrong number of squares or
+                a phrase that isn't in the phrase table
+        """
+        if len(squares) != self.squares_per_card:
+            raise ManifestError(
+                f"Expected {self.squares_per_card} squares, got {len(squares)}"
+            )
+        try:
+            self._rows.extend([self._index[phrase] for phrase in squares])
+        except KeyError as e:
+            raise ManifestError(f"Phrase not in manifest: {e.args[0]}")
+        self.card_count += 1
+        if self.card_count % _FLUSH_ROWS == 0:
+            self._flush()
+
+    def extend(self, manifest: Manifest, card_count: int | None = None) -> None:
+        """Record the cards of another manifest with the same phrase table.
+
+        Args:
+            manifest: Manifest whose cards follow the ones already written
+            card_count: Optional number of leading cards to take instead of all
+
+        Raises:
+            ManifestError: If the phrase tables or card sizes differ
+        """
+        if manifest.phrases != self.phrases:
+            raise ManifestError("Cannot combine manifests with different phrases")
+        if manifest.cards.shape[1] != self.squares_per_card:
+            raise ManifestError("Cannot combine manifests with different card sizes")
+
+        if card_count is None:
+            card_count = manifest.card_count
+        card_count = min(card_count, manifest.card_count)
+
+        self._flush()
+        for start in range(0, card_count, _COPY_ROWS):
+            chunk = manifest.cards[start : min(start + _COPY_ROWS, card_count)]
+            self._file.write(chunk.astype("<u2", copy=False).tobytes())
+        self.card_count += card_count
+
+    def close(self) -> Path:
+        """Write any buffered cards and the final header.
+
+        Returns:
+            Path to the manifest file
+        """
+        self._flush()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+        return self.output_path
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't leave a manifest that disagrees with the PDF behind
+            self._file.close()
+            self.output_path.unlink(missing_ok=True)
+
+
+def load_manifest(manifest_path: Path | str) -> Manifest:
+    """Open a manifest, memory-mapping its card matrix.
+
+    Args:
+        manifest_path: Path to a manifest written by ManifestWriter
+
+    Returns:
+        The loaded manifest
+
+    Raises:
+        FileNotFoundError: If the manifest doesn't exist
+        ManifestError: If the file isn't a readable manifest
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    with open(manifest_path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or not header.startswith(MANIFEST_MAGIC):
+            raise ManifestError(f"Not a card manifest: {manifest_path}")
+        (
+            _,
+            version,
+            squares_per_card,
+            phrase_count,
+            card_count,
+            first_card_id,
+            matrix_offset,
+        ) = _HEADER.unpack(header)
+        if version != MANIFEST_VERSION:
+            raise ManifestError(
+                f"Unsupported manifest version {version}: {manifest_path}"
+            )
+
+        lengths = np.frombuffer(f.read(phrase_count * 4), dtype="<u4")
+        blob = f.read(int(lengths.sum()))
+
+    expected_size = matrix_offset + card_count * squares_per_card * 2
+    if len(lengths) != phrase_count or manifest_path.stat().st_size < expected_size:
+        raise ManifestError(f"Manifest is truncated: {manifest_path}")
+
+    phrases = []
+    start = 0
+    for length in lengths.tolist():
+        phrases.append(blob[start : start + length].decode("utf-8"))
+        start += length
+
+    shape = (card_count, squares_per_card)
+    if card_count:
+        cards = np.memmap(
+            manifest_path, dtype="<u2", mode="r", offset=matrix_offset, shape=shape
+        )
+    else:
+        cards = np.empty(shape, dtype="<u2")
+
+    return Manifest(phrases, cards, first_card_id)
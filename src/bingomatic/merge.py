@@ -0,0 +1,405 @@
+"""Streaming concatenation and splitting of ReportLab-generated PDF files."""
+
+import hashlib
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Self
+
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_OBJECT_HEADER = re.compile(rb"\d+ 0 obj\s*")
+_OBJECT_FOOTER = re.compile(rb"\s*endobj\s*$")
+_STREAM_START = re.compile(rb">>\s*stream\r?\n")
+_REFERENCE = re.compile(rb"(\d+) 0 R\b")
+_ROOT = re.compile(rb"/Root (\d+) 0 R")
+_PAGES = re.compile(rb"/Pages (\d+) 0 R")
+_KIDS = re.compile(rb"/Kids \[([^\]]*)\]")
+
+# Objects 1 and 2 of the merged file are reserved for the catalog and the
+# page tree, which can only be written once every page is known.
+_CATALOG_NUM = 1
+_PAGES_NUM = 2
+
+# Upper bounds on the bytes a merged file spends around its objects, used
+# to size the parts of a split
+_OBJECT_OVERHEAD = 64  # "N 0 obj" / "endobj" wrapper, xref entry, renumbering
+_PAGE_OVERHEAD = 16  # Entry in the page tree
+_FILE_OVERHEAD = 512  # Header, catalog, page tree, xref header and trailer
+
+
+class PdfMergeError(Exception):
+    """Exception raised when an input PDF can't be merged."""
+
+    pass
+
+
+def split_pdf_object(body: bytes) -> tuple[bytes, bytes]:
+    """Split an object body into its dictionary part and its raw stream.
+
+    Args:
+        body: Object body without the "N 0 obj" / "endobj" wrapper
+
+    Returns:
+        Tuple of (dictionary part, stream part including keywords)
+    """
+    match = _STREAM_START.search(body)
+    if match is None:
+        return body, b""
+    split_at = match.start() + 2
+    return body[:split_at], body[split_at:]
+
+
+def read_pdf_objects(path: Path) -> tuple[dict[int, bytes], bytes]:
+    """Read every object of a PDF written with a classic xref table.
+
+    Args:
+        path: Path to the PDF file
+
+    Returns:
+        Tuple of (object number to body, trailer bytes)
+
+    Raises:
+        PdfMergeError: If the file has no readable xref table
+    """
+    data = path.read_bytes()
+    match = None
+    for match in _STARTXREF.finditer(data):
+        pass
+    if match is None:
+        raise PdfMergeError(f"No startxref found in {path}")
+
+    xref_start = int(match.group(1))
+    if data[xref_start : xref_start + 4] != b"xref":
+        raise PdfMergeError(f"Unsupported cross-reference format in {path}")
+
+    trailer_start = data.index(b"trailer", xref_start)
+    section = data[xref_start:trailer_start].split(b"\n", 2)
+    first_num = int(section[1].split()[0])
+
+    offsets = []
+    for index, entry in enumerate(_XREF_ENTRY.finditer(section[2])):
+        offset, _, kind = entry.groups()
+        if kind == b"n":
+            offsets.append((int(offset), first_num + index))
+    offsets.sort()
+
+    objects = {}
+    ends = [offset for offset, _ in offsets[1:]] + [xref_start]
+    for (offset, num), end in zip(offsets, ends, strict=True):
+        chunk = data[offset:end]
+        header = _OBJECT_HEADER.match(chunk)
+        footer = _OBJECT_FOOTER.search(chunk)
+        if header is None or footer is None:
+            raise PdfMergeError(f"Malformed object {num} in {path}")
+        objects[num] = chunk[header.end() : footer.start()]
+
+    return objects, data[trailer_start:]
+
+
+def _page_tree(
+    objects: dict[int, bytes], trailer: bytes, path: Path
+) -> tuple[int, list[int]]:
+    """Find the page tree of a PDF read with read_pdf_objects.
+
+    Returns:
+        Tuple of (page tree object number, page object numbers in order)
+
+    Raises:
+        PdfMergeError: If the file has no page tree
+    """
+    root = _ROOT.search(trailer)
+    pages = _PAGES.search(objects.get(int(root.group(1)), b"")) if root else None
+    kids = _KIDS.search(objects.get(int(pages.group(1)), b"")) if pages else None
+    if kids is None:
+        raise PdfMergeError(f"No page tree found in {path}")
+    return int(pages.group(1)), [int(num) for num in _REFERENCE.findall(kids.group(1))]
+
+
+def _referenced_objects(
+    objects: dict[int, bytes], roots: list[int], skip: set[int], path: Path
+) -> list[int]:
+    """List the given objects and everything they reference, once each.
+
+    Args:
+        objects: Every object of the PDF
+        roots: Objects to start from
+        skip: Objects neither listed nor followed
+        path: Path of the PDF, for error messages
+
+    Returns:
+        Object numbers in the order they were reached
+
+    Raises:
+        PdfMergeError: If a referenced object is missing
+    """
+    seen = set(skip)
+    pending = list(roots)
+    order = []
+    while pending:
+        num = pending.pop()
+        if num in seen:
+            continue
+        if num not in objects:
+            raise PdfMergeError(f"Missing object {num} in {path}")
+        seen.add(num)
+        order.append(num)
+        head, _ = split_pdf_object(objects[num])
+        pending.extend(int(ref) for ref in _REFERENCE.findall(head))
+    return order
+
+
+class PdfMerger:
+    """Concatenate the pages of several PDFs into one file as they arrive.
+
+    Each appended file is read, its pages and everything they reference are
+    renumbered and written straight to the output, and the file is then
+    dropped. Only the byte offset of each written object is kept, so memory
+    use does not grow with the size of the pages already written.
+
+    Resources that several objects of a file share, such as fonts, images
+    and the card template, are usually identical in every appended file.
+    Each one is written once: a shared object whose renumbered body matches
+    one already written is mapped to that object instead. Only a digest of
+    each distinct shared object is kept for this.
+
+    Inputs are expected to be PDFs written by ReportLab: a classic xref
+    table, no object streams and no incremental updates.
+    """
+
+    def __init__(self, output_path: Path | str):
+        self.output_path = Path(output_path)
+        self._file = open(self.output_path, "wb")
+        self._offsets = array("Q", [0, 0, 0])
+        self._page_nums = array("Q")
+        self._shared: dict[bytes, int] = {}  # Body digest to object number
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages written so far."""
+        return len(self._page_nums)
+
+    def _next_num(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, num: int, body: bytes) -> None:
+        self._offsets[num] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % num)
+        self._file.write(body)
+        self._file.write(b"\nendobj\n")
+
+    def _place_object(self, body: bytes, shared: bool) -> int:
+        """Write an object, or find an identical shared one already written."""
+        if shared:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            num = self._shared.get(digest)
+            if num is not None:
+                return num
+        num = self._next_num()
+        self._write_object(num, body)
+        if shared:
+            self._shared[digest] = num
+        return num
+
+    def append(
+        self, pdf_path: Path | str, page_count: int | None = None, first_page: int = 0
+    ) -> int:
+        """Append the pages of a PDF to the output.
+
+        Args:
+            pdf_path: Path to a ReportLab-generated PDF
+            page_count: Optional number of pages to take instead of all
+            first_page: Index of the first page to take
+
+        Returns:
+            Number of pages appended
+
+        Raises:
+            PdfMergeError: If the file can't be parsed
+        """
+        pdf_path = Path(pdf_path)
+        objects, trailer = read_pdf_objects(pdf_path)
+        pages_num, page_nums = _page_tree(objects, trailer, pdf_path)
+        page_nums = page_nums[first_page:]
+        if page_count is not None:
+            page_nums = page_nums[:page_count]
+        self._append_pages(objects, pages_num, page_nums, pdf_path)
+        return len(page_nums)
+
+    def _append_pages(
+        self,
+        objects: dict[int, bytes],
+        pages_num: int,
+        page_nums: list[int],
+        pdf_path: Path,
+    ) -> None:
+        """Write pages and everything they reference, except the old page tree."""
+        order = _referenced_objects(objects, page_nums, {pages_num}, pdf_path)
+        parts = {num: split_pdf_object(objects[num]) for num in order}
+        references = {
+            num: [int(ref) for ref in _REFERENCE.findall(head)]
+            for num, (head, _) in parts.items()
+        }
+
+        # An object is shared if two pages, or anything but a page, refer to
+        # it; a page's own content stream is not, and is never compared
+        pages = set(page_nums)
+        referrers = Counter()
+        for num in order:
+            for ref in set(references[num]):
+                referrers[ref] += 1 if num in pages else 2
+        shared = {num for num in order if referrers[num] > 1 and num not in pages}
+
+        mapping = {pages_num: _PAGES_NUM}
+
+        def renumber(match: re.Match) -> bytes:
+            return b"%d 0 R" % mapping[int(match.group(1))]
+
+        # Write objects after everything they refer to, so that a body can
+        # be compared once its references have their merged numbers
+        placed = {pages_num}
+        entered = set()
+        for root in order:
+            stack = [root]
+            while stack:
+                num = stack[-1]
+                if num in placed:
+                    stack.pop()
+                    continue
+                if num not in entered:
+                    entered.add(num)
+                    stack.extend(ref for ref in references[num] if ref not in entered)
+                    continue
+                stack.pop()
+                for ref in references[num]:
+                    if ref not in mapping:
+                        # Still being written further up: a reference cycle
+                        mapping[ref] = self._next_num()
+                head, stream = parts[num]
+                body = _REFERENCE.sub(renumber, head) + stream
+                if num in mapping:
+                    self._write_object(mapping[num], body)
+                else:
+                    mapping[num] = self._place_object(body, num in shared)
+                placed.add(num)
+
+        for num in page_nums:
+            self._page_nums.append(mapping[num])
+
+    def close(self) -> Path:
+        """Write the page tree, catalog, xref table and trailer.
+
+        Returns:
+            Path to the merged PDF file
+        """
+        kids = b"\n".join(b"%d 0 R" % num for num in self._page_nums)
+        self._write_object(
+            _PAGES_NUM,
+            b"<< /Type /Pages /Count %d /Kids [\n%s\n] >>" % (self.page_count, kids),
+        )
+        self._write_object(
+            _CATALOG_NUM, b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES_NUM
+        )
+
+        xref_start = self._file.tell()
+        self._file.write(b"xref\n0 %d\n" % len(self._offsets))
+        self._file.write(b"0000000000 65535 f \n")
+        for offset in self._offsets[1:]:
+            self._file.write(b"%010d 00000 n \n" % offset)
+        self._file.write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self._offsets), _CATALOG_NUM, xref_start)
+        )
+        self._file.close()
+        return self.output_path
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't leave a half-written PDF behind
+            self._file.close()
+            self.output_path.unlink(missing_ok=True)
+
+
+def merge_pdfs(input_paths: list[Path | str], output_path: Path | str) -> Path:
+    """Concatenate the pages of several PDFs into a single file.
+
+    Args:
+        input_paths: ReportLab-generated PDFs, in page order
+        output_path: Path where the merged PDF will be saved
+
+    Returns:
+        Path to the merged PDF file
+    """
+    with PdfMerger(output_path) as merger:
+        for input_path in input_paths:
+            merger.append(input_path)
+    return Path(output_path)
+
+
+def split_pdf(pdf_path: Path | str, max_bytes: int) -> list[Path]:
+    """Split a PDF into consecutive parts of at most max_bytes each.
+
+    Pages are packed into each part in order until the next page, with any
+    fonts, images and forms it needs that the part doesn't have yet, would
+    take the part over max_bytes. The parts are written next to the PDF as
+    <name>-part1.pdf, <name>-part2.pdf and so on; the PDF itself is kept.
+
+    Args:
+        pdf_path: Path to a ReportLab-generated PDF
+        max_bytes: Largest size of a part
+
+    Returns:
+        Paths of the parts, in page order
+
+    Raises:
+        PdfMergeError: If the file can't be parsed, or a single page and
+            what it needs take more than max_bytes
+    """
+    pdf_path = Path(pdf_path)
+    objects, trailer = read_pdf_objects(pdf_path)
+    pages_num, page_nums = _page_tree(objects, trailer, pdf_path)
+
+    def added_size(needed: list[int], part_objects: set[int]) -> int:
+        return _PAGE_OVERHEAD + sum(
+            len(objects[num]) + _OBJECT_OVERHEAD
+            for num in needed
+            if num not in part_objects
+        )
+
+    parts = []
+    part_pages: list[int] = []
+    part_objects: set[int] = set()
+    part_size = _FILE_OVERHEAD
+    for index, page_num in enumerate(page_nums):
+        needed = _referenced_objects(objects, [page_num], {pages_num}, pdf_path)
+        added = added_size(needed, part_objects)
+        if part_pages and part_size + added > max_bytes:
+            parts.append(part_pages)
+            part_pages, part_objects, part_size = [], set(), _FILE_OVERHEAD
+            added = added_size(needed, part_objects)
+        if part_size + added > max_bytes:
+            raise PdfMergeError(
+                f"Page {index + 1} of {pdf_path} alone takes more than "
+                f"{max_bytes} bytes"
+            )
+        part_pages.append(page_num)
+        part_objects.update(needed)
+        part_size += added
+    if part_pages:
+        parts.append(part_pages)
+
+    part_paths = []
+    for number, part in enumerate(parts, 1):
+        part_path = pdf_path.with_name(f"{pdf_path.stem}-part{number}.pdf")
+        with PdfMerger(part_path) as merger:
+            merger._append_pages(objects, pages_num, part, pdf_path)
+        part_paths.append(part_path)
+    return part_paths
@@ -0,0 +1,273 @@
+"""Text measurement for Bingomatic using precomputed glyph advances.
+
+Advance tables come either from a font registered with ReportLab or
+straight from a TrueType file, which needs no ReportLab at all; both give
+the same widths for the same font.
+"""
+
+from pathlib import Path
+from struct import unpack_from
+
+
+class FontMetrics:
+    """Glyph-advance table for a font.
+
+    Widths are expressed in font units (1/1000 of the font size), matching
+    ``pdfmetrics.stringWidth(text, font_name, 1000)``. Fonts where every
+    glyph has the same advance are flagged as monospace, and measuring them
+    reduces to multiplying the character count by that advance.
+    """
+
+    def __init__(
+        self,
+        font_name: str,
+        advances: dict[int, float] | None = None,
+        default_width: float = 0.0,
+    ):
+        """Build the table from given advances or a registered font.
+
+        Args:
+            font_name: Name of the font
+            advances: Advance of each codepoint in font units, as returned
+                by read_ttf_advances; taken from the font registered with
+                ReportLab under font_name when omitted
+            default_width: Advance of codepoints missing from advances
+        """
+        self.font_name = font_name
+        if advances is None:
+            from reportlab.pdfbase import pdfmetrics
+
+            face = getattr(pdfmetrics.getFont(font_name), "face", None)
+            advances = getattr(face, "charWidths", None)
+            default_width = getattr(face, "defaultWidth", 0.0)
+
+        # Only TrueType faces expose a per-codepoint table; other fonts
+        # fall back to ReportLab's own measurement.
+        if advances is None:
+            self.advances = None
+            self.default_width = 0.0
+            self.mono_advance = None
+            return
+
+        self.advances = dict(advances)
+        self.default_width = default_width
+        distinct = set(self.advances.values())
+        distinct.add(self.default_width)
+        self.mono_advance = distinct.pop() if len(distinct) == 1 else None
+
+    @property
+    def is_monospace(self) -> bool:
+        """Whether every glyph in the font has the same advance."""
+        return self.mono_advance is not None
+
+    def measure(self, text: str) -> float:
+        """Return the width of text in font units.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Width of text at a font size of 1000
+        """
+        if self.mono_advance is not None:
+            return len(text) * self.mono_advance
+        if self.advances is None:
+            from reportlab.pdfbase import pdfmetrics
+
+            return pdfmetrics.stringWidth(text, self.font_name, 1000)
+        get = self.advances.get
+        default = self.default_width
+        return sum(get(ord(char), default) for char in text)
+
+    def measure_many(self, texts: list[str]) -> list[float]:
+        """Return the widths of many strings in font units.
+
+        Args:
+            texts: Strings to measure, e.g. every word of a phrase pool
+
+        Returns:
+            Width of each string at a font size of 1000, in input order
+        """
+        if self.mono_advance is not None:
+            advance = self.mono_advance
+            return [len(text) * advance for text in texts]
+        return [self.measure(text) for text in texts]
+
+
+def _ttf_tables(font_data: bytes) -> dict[bytes, int]:
+    """Return the offset of every table in a TrueType file, by tag."""
+    (num_tables,) = unpack_from(">H", font_data, 4)
+    tables = {}
+    for i in range(num_tables):
+        tag, _checksum, offset, _length = unpack_from(">4sIII", font_data, 12 + 16 * i)
+        tables[tag] = offset
+    return tables
+
+
+def _ttf_char_to_glyph(font_data: bytes, cmap: int) -> list[tuple[int, int]]:
+    """Map codepoints to glyphs through the cmap subtable ReportLab reads.
+
+    Returns:
+        (codepoint, glyph) pairs in subtable order, repeats included
+    """
+    (num_subtables,) = unpack_from(">H", font_data, cmap + 2)
+    subtable = None
+    preferred = False
+    for i in range(num_subtables):
+        platform, encoding, offset = unpack_from(">HHI", font_data, cmap + 4 + 8 * i)
+        if platform == 3 or (platform == 1 and encoding == 1):
+            subtable, preferred = offset, True
+        elif platform == 1 and encoding == 0 and not preferred:
+            subtable = offset
+        elif platform == 0 and encoding != 5:
+            subtable, preferred = offset, True
+    if subtable is None:
+        raise ValueError("Font has no Unicode character map")
+
+    start = cmap + subtable
+    (fmt,) = unpack_from(">H", font_data, start)
+    pairs = []
+    if fmt == 4:
+        length, _language, seg_x2 = unpack_from(">HHH", font_data, start + 2)
+        segments = seg_x2 // 2
+        ends = unpack_from(f">{segments}H", font_data, start + 14)
+        starts = unpack_from(f">{segments}H", font_data, start + 16 + seg_x2)
+        deltas = unpack_from(f">{segments}h", font_data, start + 16 + 2 * seg_x2)
+        range_start = start + 16 + 3 * seg_x2
+        range_offsets = unpack_from(f">{segments}H", font_data, range_start)
+        limit = start + length
+        for n in range(segments):
+            for char in range(starts[n], ends[n] + 1):
+                if range_offsets[n] == 0:
+                    glyph = (char + deltas[n]) & 0xFFFF
+                else:
+                    offset = range_start + 2 * n + range_offsets[n]
+                    offset += (char - starts[n]) * 2
+                    glyph = 0
+                    if offset < limit:
+                        (glyph,) = unpack_from(">H", font_data, offset)
+                        if glyph:
+                            glyph = (glyph + deltas[n]) & 0xFFFF
+                pairs.append((char, glyph))
+    elif fmt == 12:
+        (groups,) = unpack_from(">I", font_data, start + 12)
+        for n in range(groups):
+            first, last, glyph = unpack_from(">III", font_data, start + 16 + 12 * n)
+            pairs.extend(
+                (char, glyph + char - first) for char in range(first, last + 1)
+            )
+    else:
+        raise ValueError(f"Unsupported character map format {fmt}")
+    return pairs
+
+
+def read_ttf_advances(font_data: bytes) -> tuple[dict[int, float], float]:
+    """Read the advance of every character from a TrueType file.
+
+    The file's own tables are read directly rather than through ReportLab,
+    giving the same values as the charWidths and defaultWidth of the face
+    ReportLab parses.
+
+    Args:
+        font_data: Raw bytes of the TTF file
+
+    Returns:
+        Tuple of (advance of each codepoint, advance of the missing-glyph
+        glyph), both in font units
+
+    Raises:
+        ValueError: If the font has no character map in a supported format
+    """
+    tables = _ttf_tables(font_data)
+    (units_per_em,) = unpack_from(">H", font_data, tables[b"head"] + 18)
+    (num_metrics,) = unpack_from(">H", font_data, tables[b"hhea"] + 34)
+    (num_glyphs,) = unpack_from(">H", font_data, tables[b"maxp"] + 4)
+    raw = unpack_from(f">{num_metrics * 2}H", font_data, tables[b"hmtx"])[::2]
+    if units_per_em == 1000:
+        glyph_widths = list(raw)
+    else:
+        multiplier = 1000 / units_per_em
+        glyph_widths = [width * multiplier for width in raw]
+    # Glyphs past the last full metric share its advance
+    glyph_widths.extend([glyph_widths[-1]] * (num_glyphs - num_metrics))
+
+    # Like ReportLab, a codepoint mapped twice takes the later glyph's width
+    glyph_chars: dict[int, list[int]] = {}
+    for char, glyph in _ttf_char_to_glyph(font_data, tables[b"cmap"]):
+        glyph_chars.setdefault(glyph, []).append(char)
+    advances = {}
+    for glyph in sorted(glyph_chars):
+        if glyph < num_glyphs:
+            for char in glyph_chars[glyph]:
+                advances[char] = glyph_widths[glyph]
+
+    # A regular and a non-breaking space are always the same width
+    if 0x20 in advances:
+        advances[0xA0] = advances[0x20]
+    elif 0xA0 in advances:
+        advances[0x20] = advances[0xA0]
+    return advances, glyph_widths[0]
+
+
+_font_metrics: dict[str, FontMetrics] = {}
+
+
+def build_font_metrics(font_name: str) -> FontMetrics:
+    """Build and store the advance table for a registered font.
+
+    Args:
+        font_name: Name the font was registered under
+
+    Returns:
+        The font's metrics
+    """
+    metrics = FontMetrics(font_name)
+    _font_metrics[font_name] = metrics
+    return metrics
+
+
+def load_font_metrics(font_name: str, font_path: Path | str) -> FontMetrics:
+    """Build and store the advance table of a TrueType file.
+
+    Unlike build_font_metrics, the font doesn't have to be registered with
+    ReportLab, and ReportLab isn't imported.
+
+    Args:
+        font_name: Name to store the metrics under
+        font_path: Path to the TTF file
+
+    Returns:
+        The font's metrics
+    """
+    advances, default_width = read_ttf_advances(Path(font_path).read_bytes())
+    metrics = FontMetrics(font_name, advances, default_width)
+    _font_metrics[font_name] = metrics
+    return metrics
+
+
+def get_font_metrics(font_name: str) -> FontMetrics:
+    """Return the advance table for a font, building it on first use.
+
+    Args:
+        font_name: Name the font was registered under
+
+    Returns:
+        The font's metrics
+    """
+    metrics = _font_metrics.get(font_name)
+    if metrics is None:
+        metrics = build_font_metrics(font_name)
+    return metrics
+
+
+def measure_pool(texts: list[str], font_name: str) -> list[float]:
+    """Measure a batch of strings in one pass.
+
+    Args:
+        texts: Strings to measure
+        font_name: Name of the font to use for measurement
+
+    Returns:
+        Width of each string in font units, in input order
+    """
+    return get_font_metrics(font_name).measure_many(texts)
@@ -0,0 +1,330 @@
+"""Sharded and multiprocess PDF generation for Bingomatic."""
+
+import random
+import secrets
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from bingomatic.cards import CardSampler, start_sampler
+from bingomatic.imposition import PageLayout, page_layout
+from bingomatic.manifest import ManifestWriter, load_manifest
+from bingomatic.merge import PdfMerger
+from bingomatic.pdf import LOGO_DPI, generate_pdf
+from bingomatic.roster import Attendee, read_roster
+from bingomatic.timings import stage
+
+CARDS_PER_PAGE = 2  # Cards on a page of the default layout
+STREAM_CHUNK_CARDS = 1000  # Cards rendered per in-memory chunk when streaming
+
+
+def split_card_count(
+    card_count: int, shards: int, cards_per_page: int = CARDS_PER_PAGE
+) -> list[int]:
+    """Split a run into page-aligned shards of roughly equal size.
+
+    Every shard except the last holds whole pages, so a half-filled page
+    can only ever appear at the very end of the merged document.
+
+    Args:
+        card_count: Total number of cards to generate
+        shards: Maximum number of shards
+        cards_per_page: Number of cards on a full page
+
+    Returns:
+        Number of cards in each shard, in page order
+    """
+    pages = -(-card_count // cards_per_page)
+    shards = max(1, min(shards, pages))
+    base, extra = divmod(pages, shards)
+
+    counts = []
+    remaining = card_count
+    for index in range(shards):
+        shard_pages = base + (1 if index < extra else 0)
+        shard_cards = min(shard_pages * cards_per_page, remaining)
+        counts.append(shard_cards)
+        remaining -= shard_cards
+    return counts
+
+
+def chunk_card_count(
+    card_count: int, chunk_cards: int, cards_per_page: int = CARDS_PER_PAGE
+) -> list[int]:
+    """Split a run into page-aligned shards of at most chunk_cards cards.
+
+    Args:
+        card_count: Total number of cards to generate
+        chunk_cards: Maximum cards per shard, rounded up to whole pages
+        cards_per_page: Number of cards on a full page
+
+    Returns:
+        Number of cards in each shard, in page order
+    """
+    chunk_cards = max(
+        cards_per_page, -(-chunk_cards // cards_per_page) * cards_per_page
+    )
+    full_chunks, remainder = divmod(card_count, chunk_cards)
+    return [chunk_cards] * full_chunks + ([remainder] if remainder else [])
+
+
+def _shard_attendees(
+    roster_path: Path | str | None, first_card_id: int
+) -> Iterator[Attendee] | None:
+    """Stream the roster rows of the cards from first_card_id onwards."""
+    if roster_path is None:
+        return None
+    return read_roster(roster_path, start=first_card_id - 1)
+
+
+def _render_shard(
+    output_path: Path,
+    card_count: int,
+    first_card_id: int,
+    rng_seed: int,
+    cards: list[list[str]] | None,
+    manifest_path: Path | None,
+    event_name: str | None,
+    logo_path: Path | str | None,
+    bingo_squares: list[str] | None,
+    layout_cache_path: Path | str | None,
+    logo_dpi: int,
+    seed: int | None,
+    font_cache_dir: Path | str | None,
+    layout: PageLayout,
+    optimize: bool,
+    roster_path: Path | str | None,
+) -> Path:
+    """Render one shard to its own PDF with its own random stream.
+
+    With a roster, the shard reads the rows of its own cards from the file.
+    """
+    return generate_pdf(
+        output_path,
+        card_count=card_count,
+        event_name=event_name,
+        logo_path=logo_path,
+        bingo_squares=bingo_squares,
+        layout_cache_path=layout_cache_path,
+        logo_dpi=logo_dpi,
+        rng=random.Random(rng_seed),
+        seed=seed,
+        first_card_id=first_card_id,
+        cards=cards,
+        manifest_path=manifest_path,
+        font_cache_dir=font_cache_dir,
+        layout=layout,
+        optimize=optimize,
+        attendees=_shard_attendees(roster_path, first_card_id),
+    )
+
+
+def _shard_jobs(
+    shard_paths: list[Path],
+    shard_counts: list[int],
+    sampler: CardSampler | None,
+    with_manifests: bool,
+    first_card_id: int = 1,
+) -> Iterator[tuple]:
+    """Yield the positional arguments of _render_shard for each shard.
+
+    Jobs are produced lazily so that, in unique mode, each shard's cards are
+    only chosen just before the shard is handed to a worker.
+    """
+    for shard_path, shard_cards in zip(shard_paths, shard_counts, strict=True):
+        cards = None
+        if sampler is not None:
+            card_ids = range(first_card_id, first_card_id + shard_cards)
+            cards = [sampler.squares(card_id) for card_id in card_ids]
+        manifest_path = shard_path.with_suffix(".cards") if with_manifests else None
+        yield (
+            shard_path,
+            shard_cards,
+            first_card_id,
+            secrets.randbits(128),
+            cards,
+            manifest_path,
+        )
+        first_card_id += shard_cards
+
+
+def _render_shards(
+    shard_paths: list[Path],
+    shard_counts: list[int],
+    workers: int,
+    options: dict,
+    sampler: CardSampler | None = None,
+    with_manifests: bool = False,
+    first_card_id: int = 1,
+) -> Iterator[Path]:
+    """Render shards and yield their paths in page order as they finish.
+
+    With a single worker shards are rendered in this process one at a time.
+    Otherwise a process pool renders them, with at most two shards per
+    worker in flight so finished shards don't pile up waiting to be merged.
+    A sampler, when given, picks every card's squares in this process.
+    With with_manifests, each shard also writes a card manifest next to its
+    PDF, with the same name and a .cards suffix.
+    """
+    jobs = _shard_jobs(
+        shard_paths, shard_counts, sampler, with_manifests, first_card_id
+    )
+
+    if workers == 1:
+        for job in jobs:
+            with stage("render_shard"):
+                shard_path = _render_shard(*job, **options)
+            yield shard_path
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(_render_shard, *job, **options))
+            if len(pending) >= workers * 2:
+                with stage("wait_for_shard"):
+                    shard_path = pending.popleft().result()
+                yield shard_path
+        while pending:
+            with stage("wait_for_shard"):
+                shard_path = pending.popleft().result()
+            yield shard_path
+
+
+def generate_pdf_parallel(
+    output_path: Path | str,
+    card_count: int,
+    workers: int = 1,
+    event_name: str | None = None,
+    logo_path: Path | str | None = None,
+    bingo_squares: list[str] | None = None,
+    layout_cache_path: Path | str | None = None,
+    logo_dpi: int = LOGO_DPI,
+    chunk_cards: int | None = None,
+    seed: int | None = None,
+    unique: str | None = None,
+    manifest_path: Path | str | None = None,
+    font_cache_dir: Path | str | None = None,
+    layout: PageLayout | None = None,
+    optimize: bool = False,
+    first_card_id: int = 1,
+    roster_path: Path | str | None = None,
+) -> Path:
+    """Generate a PDF with bingo card grids in shards.
+
+    The run is split into page ranges, each range is rendered to a
+    temporary PDF, and the shards are streamed in page order into
+    output_path. Unseeded shards draw their squares from their own
+    independently seeded random generator, so no two workers share a random
+    stream. With a seed, every card's squares come from the seed and its
+    card ID, so the output does not depend on how the run was split.
+
+    In unique mode the cards are chosen in this process, where every card
+    can be checked against all earlier ones, and handed to the shards.
+
+    Without chunk_cards the run is split into one shard per worker. With
+    chunk_cards no shard holds more than that many cards, so peak memory
+    depends on the chunk size rather than on card_count.
+
+    Args:
+        output_path: Path where the PDF will be saved
+        card_count: Number of bingo cards to generate
+        workers: Number of worker processes
+        event_name: Optional event name to display above each grid
+        logo_path: Optional path to logo image for center square
+        bingo_squares: Optional list of bingo square phrases (requires 24+ items)
+        layout_cache_path: Optional sidecar file used to persist phrase
+            layouts between runs
+        logo_dpi: Resolution the logo is downsampled to before embedding
+        chunk_cards: Optional maximum number of cards per shard
+        seed: Optional run seed that fixes every card's squares
+        unique: Optional uniqueness mode ("set" or "layout")
+        manifest_path: Optional path where the card manifest is written;
+            shard manifests are combined in page order like the PDFs
+        font_cache_dir: Optional directory of parsed fonts kept between runs
+        layout: Where the cards go on each page, from page_layout; computed
+            once here and shared by every shard
+        optimize: Whether to write the smallest PDF (see generate_pdf)
+        first_card_id: ID of the first card, for resuming a run part way
+        roster_path: Optional roster CSV whose attendees are printed on the
+            cards, the card with ID n getting row n (see bingomatic.roster)
+
+    Returns:
+        Path to the generated PDF file
+
+    Raises:
+        CardCapacityError: If unique is set and the pool can't provide
+            card_count distinct cards
+    """
+    output_path = Path(output_path)
+    if layout is None:
+        layout = page_layout()
+    options = {
+        "event_name": event_name,
+        "logo_path": logo_path,
+        "bingo_squares": bingo_squares,
+        "layout_cache_path": layout_cache_path,
+        "logo_dpi": logo_dpi,
+        "seed": seed,
+        "font_cache_dir": font_cache_dir,
+        "layout": layout,
+        "optimize": optimize,
+    }
+
+    cards_per_page = layout.cards_per_page
+    if chunk_cards is None:
+        shard_counts = split_card_count(card_count, workers, cards_per_page)
+    else:
+        shard_counts = chunk_card_count(card_count, chunk_cards, cards_per_page)
+
+    if len(shard_counts) == 1:
+        return generate_pdf(
+            output_path,
+            card_count,
+            first_card_id=first_card_id,
+            unique=unique,
+            manifest_path=manifest_path,
+            attendees=_shard_attendees(roster_path, first_card_id),
+            **options,
+        )
+    options["roster_path"] = roster_path
+
+    sampler = None
+    if unique is not None and bingo_squares:
+        sampler = start_sampler(
+            bingo_squares, card_count, first_card_id, seed=seed, unique=unique
+        )
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as tmp_dir:
+        shard_paths = [
+            Path(tmp_dir) / f"shard-{index:05d}.pdf"
+            for index in range(len(shard_counts))
+        ]
+
+        if manifest_path is not None:
+            manifest = ManifestWriter(manifest_path, bingo_squares, first_card_id)
+        else:
+            manifest = nullcontext()
+
+        with PdfMerger(output_path) as merger, manifest:
+            for shard_path in _render_shards(
+                shard_paths,
+                shard_counts,
+                workers,
+                options,
+                sampler,
+                with_manifests=manifest_path is not None,
+                first_card_id=first_card_id,
+            ):
+                with stage("merge_shard"):
+                    merger.append(shard_path)
+                    shard_path.unlink()
+                    if manifest_path is not None:
+                        shard_manifest = shard_path.with_suffix(".cards")
+                        manifest.extend(load_manifest(shard_manifest))
+                        shard_manifest.unlink()
+
+    return output_path
@@ -1,24 +1,65 @@
 """PDF generation for Bingomatic bingo cards."""
 
+import math
 import random
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+from typing import NamedTuple
 
-from reportlab.lib.pagesizes import letter, landscape
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfgen.textobject import PDFTextObject
+
+from bingomatic.cachefile import read_cache, write_cache
+from bingomatic.cards import (
+    CENTER_SQUARE_INDEX,
+    GRID_SIZE,
+    select_random_squares,  # noqa: F401 - re-exported for callers of this module
+    start_sampler,
+)
+from bingomatic.config import DEFAULT_LOGO_DPI
+from bingomatic.fontcache import register_font
+from bingomatic.imposition import (  # noqa: F401 - re-exported card dimensions
+    GAP,
+    GRID_TOTAL,
+    SQUARE_SIZE,
+    PageLayout,
+    page_layout,
+)
+from bingomatic.manifest import ManifestWriter
+from bingomatic.metrics import get_font_metrics
+from bingomatic.roster import Attendee
+from bingomatic.textfit import (
+    FIT_VERSION,
+    FONT_SIZE_STEP,
+    FONTS_DIR,
+    LINE_SPACING,
+    MAX_FONT_SIZE,
+    MIN_FONT_SIZE,
+    SQUARE_PADDING,
+    compute_text_fit,
+)
+from bingomatic.timings import stage
 
 
 # Font configuration
-FONTS_DIR = Path(__file__).parent / "fonts"
 _fonts_registered = False
 
 
-def register_fonts() -> None:
+def register_fonts(font_cache_dir: Path | str | None = None) -> None:
     """Register custom fonts for use in PDF generation.
 
-    Registers Roboto and Roboto Mono fonts from the bundled fonts directory.
+    Registers Roboto and Roboto Mono fonts from the bundled fonts directory
+    and builds their glyph-advance tables for text measurement.
     This function is idempotent - calling it multiple times has no effect.
+
+    Args:
+        font_cache_dir: Optional directory of parsed fonts kept between runs
     """
     global _fonts_registered
     if _fonts_registered:
@@ -30,73 +71,160 @@ def register_fonts() -> None:
     roboto_mono = FONTS_DIR / "RobotoMono-Regular.ttf"
 
     if roboto_regular.exists():
-        pdfmetrics.registerFont(TTFont("Roboto", str(roboto_regular)))
+        register_font("Roboto", roboto_regular, font_cache_dir)
     if roboto_bold.exists():
-        pdfmetrics.registerFont(TTFont("Roboto-Bold", str(roboto_bold)))
+        register_font("Roboto-Bold", roboto_bold, font_cache_dir)
     if roboto_mono.exists():
-        pdfmetrics.registerFont(TTFont("RobotoMono", str(roboto_mono)))
+        register_font("RobotoMono", roboto_mono, font_cache_dir)
 
     _fonts_registered = True
 
 
-# Constants for grid dimensions (in points, 72 points = 1 inch)
-SQUARE_SIZE = 72  # 1 inch
-GRID_SIZE = 5  # 5x5 grid
-GAP = 36  # 0.5 inch gap between grids
-GRID_TOTAL = SQUARE_SIZE * GRID_SIZE  # 5 inches total
-CENTER_SQUARE_INDEX = 12  # Center of 5x5 grid (row 2, col 2 in 0-indexed)
+# Logo rendering constants
+LOGO_PADDING = 4
+LOGO_SIZE = SQUARE_SIZE - (LOGO_PADDING * 2)  # Printed size in points
+LOGO_DPI = DEFAULT_LOGO_DPI
 
-# Text rendering constants
-MIN_FONT_SIZE = 4
-MAX_FONT_SIZE = 12
-SQUARE_PADDING = 4
+# Name field
+NAME_LABEL = "Name:"
+NAME_FIELD_OFFSET = -36  # Baseline of the name field, 0.5 inch below the grid
+NAME_FONT_SIZE = 12  # Size of a pre-printed attendee name
 
+# Name of the form XObject holding the artwork shared by every card
+CARD_TEMPLATE_FORM_NAME = "bingomaticCard"
 
-def select_random_squares(bingo_squares: list[str], count: int = 24) -> list[str]:
-    """Select random unique items from bingo_squares list.
 
-    Args:
-        bingo_squares: List of bingo square phrases
-        count: Number of items to select (default 24 for 5x5 grid minus center)
+# Layout cache constants
+LAYOUT_CACHE_SIZE = 4096  # Fitted phrase layouts kept in memory
+LAYOUT_CACHE_VERSION = 3  # Bump when the sidecar's entries change shape
+LOGO_CACHE_SIZE = 8  # Decoded logos kept in memory for batch runs
 
-    Returns:
-        List of randomly selected unique items
-    """
-    return random.sample(bingo_squares, count)
 
+class LayoutCacheInfo(NamedTuple):
+    """Statistics for the phrase layout cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LayoutCache:
+    """Bounded LRU cache of fitted phrase layouts.
+
+    Entries are keyed on (text, font name, box width, box height, minimum
+    font size, maximum font size, font size step, fit version) and map to
+    the (lines, font size) result of fitting that text into the box.
+    """
 
-def _wrap_text(
-    text: str, font_name: str, font_size: float, max_width: float
-) -> list[str]:
-    """Wrap text to fit within a maximum width.
+    def __init__(self, maxsize: int = LAYOUT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[tuple[str, ...], float]] = OrderedDict()
+
+    def get(self, key: tuple) -> tuple[list[str], float] | None:
+        """Return the cached layout for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        lines, font_size = entry
+        return list(lines), font_size
+
+    def put(self, key: tuple, lines: list[str], font_size: float) -> None:
+        """Store a layout, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (tuple(lines), font_size)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self) -> LayoutCacheInfo:
+        """Return hit/miss statistics for the cache."""
+        return LayoutCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: Path | str) -> int:
+        """Load entries from a JSON sidecar file.
+
+        A sidecar that is missing or was written by another version loads
+        nothing, and malformed entries are skipped; layouts missing from
+        the cache are fitted again on first use.
+
+        Args:
+            path: Path to the sidecar file
+
+        Returns:
+            Number of entries loaded
+        """
+        entries = read_cache(path, LAYOUT_CACHE_VERSION)
+        if not isinstance(entries, list):
+            return 0
+
+        loaded = 0
+        for entry in entries:
+            try:
+                key, lines, font_size = entry
+                self.put(tuple(key), lines, font_size)
+            except (TypeError, ValueError):
+                continue
+            loaded += 1
+        return loaded
+
+    def save(self, path: Path | str) -> None:
+        """Write all entries to a JSON sidecar file, atomically.
+
+        Args:
+            path: Path to the sidecar file
+        """
+        entries = [
+            [list(key), list(lines), font_size]
+            for key, (lines, font_size) in self._entries.items()
+        ]
+        write_cache(path, LAYOUT_CACHE_VERSION, entries)
+
+
+_layout_cache = LayoutCache()
+
+
+def layout_cache_info() -> LayoutCacheInfo:
+    """Return hit/miss statistics for the shared phrase layout cache."""
+    return _layout_cache.info()
+
+
+def clear_layout_cache() -> None:
+    """Empty the shared phrase layout cache and reset its statistics."""
+    _layout_cache.clear()
+
+
+def load_layout_cache(path: Path | str) -> int:
+    """Load the shared phrase layout cache from a sidecar file.
 
     Args:
-        text: Text to wrap
-        font_name: Name of the font to use for measurement
-        font_size: Font size in points
-        max_width: Maximum width in points
+        path: Path to the sidecar file
 
     Returns:
-        List of lines that fit within max_width
+        Number of entries loaded
     """
-    words = text.split()
-    lines = []
-    current_line = []
+    return _layout_cache.load(path)
 
-    for word in words:
-        test_line = " ".join(current_line + [word])
-        width = pdfmetrics.stringWidth(test_line, font_name, font_size)
-        if width <= max_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(" ".join(current_line))
-            current_line = [word]
 
-    if current_line:
-        lines.append(" ".join(current_line))
+def save_layout_cache(path: Path | str) -> None:
+    """Save the shared phrase layout cache to a sidecar file.
 
-    return lines if lines else [text]
+    Args:
+        path: Path to the sidecar file
+    """
+    _layout_cache.save(path)
 
 
 def _fit_text_in_square(
@@ -104,6 +232,9 @@ def _fit_text_in_square(
 ) -> tuple[list[str], float]:
     """Fit text within a square by wrapping and shrinking font size.
 
+    Results are memoized in the shared layout cache, so each distinct phrase
+    is only laid out once per box size.
+
     Args:
         text: Text to fit
         max_width: Maximum width in points
@@ -113,45 +244,57 @@ def _fit_text_in_square(
     Returns:
         Tuple of (wrapped lines, font size used)
     """
-    for font_size in range(MAX_FONT_SIZE, MIN_FONT_SIZE - 1, -1):
-        lines = _wrap_text(text, font_name, font_size, max_width)
-        line_height = font_size * 1.2
-        total_height = len(lines) * line_height
-
-        # Check both height constraint AND that all lines fit within width
-        all_lines_fit_width = all(
-            pdfmetrics.stringWidth(line, font_name, font_size) <= max_width
-            for line in lines
-        )
-
-        if total_height <= max_height and all_lines_fit_width:
-            return lines, font_size
+    key = (
+        text,
+        font_name,
+        max_width,
+        max_height,
+        MIN_FONT_SIZE,
+        MAX_FONT_SIZE,
+        FONT_SIZE_STEP,
+        FIT_VERSION,
+    )
+    cached = _layout_cache.get(key)
+    if cached is not None:
+        return cached
 
-    # If we can't fit even at minimum size, return with minimum
-    lines = _wrap_text(text, font_name, MIN_FONT_SIZE, max_width)
-    return lines, MIN_FONT_SIZE
+    with stage("fit_text"):
+        lines, font_size = compute_text_fit(text, max_width, max_height, font_name)
+    _layout_cache.put(key, lines, font_size)
+    return lines, font_size
 
 
 def _draw_square_text(
-    canvas: Canvas, text: str, square_x: float, square_y: float
-) -> None:
+    text_object: PDFTextObject,
+    text: str,
+    square_x: float,
+    square_y: float,
+    current_font_size: float | None = None,
+) -> float:
     """Draw text centered in a square with auto-fitting.
 
     Args:
-        canvas: ReportLab canvas to draw on
+        text_object: Text object collecting the card's phrases
         text: Text to draw
         square_x: X coordinate of square's bottom-left corner
         square_y: Y coordinate of square's bottom-left corner
+        current_font_size: Font size the text object is already set to
+
+    Returns:
+        Font size the text object is set to after drawing
     """
     content_width = SQUARE_SIZE - (SQUARE_PADDING * 2)
     content_height = SQUARE_SIZE - (SQUARE_PADDING * 2)
 
     lines, font_size = _fit_text_in_square(text, content_width, content_height)
 
-    canvas.setFont("RobotoMono", font_size)
-    canvas.setFillColorRGB(0, 0, 0)
+    # Only switch fonts when the size actually changes
+    if font_size != current_font_size:
+        text_object.setFont("RobotoMono", font_size)
 
-    line_height = font_size * 1.2
+    metrics = get_font_metrics("RobotoMono")
+    scale = 0.001 * font_size
+    line_height = font_size * LINE_SPACING
     total_text_height = len(lines) * line_height
 
     # Calculate starting Y to center text vertically
@@ -159,8 +302,11 @@ def _draw_square_text(
 
     for i, line in enumerate(lines):
         line_y = start_y - (i * line_height)
-        line_x = square_x + SQUARE_SIZE / 2
-        canvas.drawCentredString(line_x, line_y, line)
+        line_x = square_x + SQUARE_SIZE / 2 - metrics.measure(line) * scale / 2
+        text_object.setTextOrigin(line_x, line_y)
+        text_object.textOut(line)
+
+    return font_size
 
 
 def _draw_card_squares(
@@ -168,12 +314,18 @@ def _draw_card_squares(
 ) -> None:
     """Draw text in all squares of a bingo card grid.
 
+    All phrases of a card are emitted as a single text object.
+
     Args:
         canvas: ReportLab canvas to draw on
         grid_x: X coordinate of grid's bottom-left corner
         grid_y: Y coordinate of grid's bottom-left corner
         squares: List of 24 square texts (excluding center)
     """
+    text_object = canvas.beginText()
+    text_object.setFillColorRGB(0, 0, 0)
+
+    font_size = None
     square_index = 0
     for grid_pos in range(25):  # 5x5 = 25 positions
         if grid_pos == CENTER_SQUARE_INDEX:
@@ -186,36 +338,47 @@ def _draw_card_squares(
         square_y = grid_y + (row * SQUARE_SIZE)
 
         if square_index < len(squares):
-            _draw_square_text(canvas, squares[square_index], square_x, square_y)
+            font_size = _draw_square_text(
+                text_object, squares[square_index], square_x, square_y, font_size
+            )
             square_index += 1
 
+    canvas.drawText(text_object)
 
-def calculate_grid_positions(
-    page_width: float, page_height: float
-) -> tuple[float, float, float, float]:
-    """Calculate x,y positions for two centered grids with a gap between them.
-
-    Args:
-        page_width: Width of the page in points
-        page_height: Height of the page in points
-
-    Returns:
-        Tuple of (left_x, left_y, right_x, right_y) for grid positions
-    """
-    # Total width of both grids plus gap
-    total_width = (GRID_TOTAL * 2) + GAP
 
-    # Center horizontally
-    left_x = (page_width - total_width) / 2
-    right_x = left_x + GRID_TOTAL + GAP
+def draw_card(
+    canvas: Canvas,
+    grid_x: float,
+    grid_y: float,
+    squares: list[str] | None,
+    event_name: str | None = None,
+    logo: ImageReader | None = None,
+    card_id: int | None = None,
+    attendee: Attendee | None = None,
+) -> None:
+    """Draw one complete card directly, without the shared template form.
 
-    # Center vertically (leaving space for header and name field)
-    header_space = 36  # 0.5 inch for event name
-    footer_space = 54  # 0.75 inch for name field below grid
-    available_height = page_height - header_space - footer_space
-    y = footer_space + (available_height - GRID_TOTAL) / 2
+    Only the drawing calls the card artwork needs are used, so the canvas
+    may be any object that provides them, such as the image canvases of
+    bingomatic.export.
 
-    return left_x, y, right_x, y
+    Args:
+        canvas: ReportLab canvas, or an object drawing the same calls
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+        squares: Optional list of 24 square texts (excluding center)
+        event_name: Optional event name to display above the grid
+        logo: Optional logo to draw in the center square
+        card_id: Optional card ID to print below the name field
+        attendee: Optional attendee whose name is printed on the name field
+    """
+    _draw_card_template(canvas, grid_x, grid_y, event_name, logo)
+    if squares is not None:
+        _draw_card_squares(canvas, grid_x, grid_y, squares)
+    if card_id is not None:
+        _draw_card_id(canvas, card_id, grid_x, grid_y)
+    if attendee is not None:
+        _draw_attendee(canvas, attendee, grid_x, grid_y)
 
 
 def draw_grid(canvas: Canvas, x: float, y: float) -> None:
@@ -246,82 +409,186 @@ def generate_pdf(
     event_name: str | None = None,
     logo_path: Path | str | None = None,
     bingo_squares: list[str] | None = None,
+    layout_cache_path: Path | str | None = None,
+    logo_dpi: int = LOGO_DPI,
+    rng: random.Random | None = None,
+    seed: int | None = None,
+    first_card_id: int = 1,
+    unique: str | None = None,
+    cards: list[list[str]] | None = None,
+    manifest_path: Path | str | None = None,
+    show_card_ids: bool | None = None,
+    font_cache_dir: Path | str | None = None,
+    layout: PageLayout | None = None,
+    optimize: bool = False,
+    attendees: Iterable[Attendee] | None = None,
 ) -> Path:
     """Generate a PDF with bingo card grids.
 
+    With a seed, each card's squares depend only on the seed and the card's
+    ID, and the ID is printed below the card, so any card can later be
+    reproduced on its own. With a manifest_path, the squares of every card
+    are also recorded in a card manifest (see bingomatic.manifest).
+
     Args:
         output_path: Path where the PDF will be saved
         card_count: Number of bingo cards to generate
         event_name: Optional event name to display above each grid
         logo_path: Optional path to logo image for center square
         bingo_squares: Optional list of bingo square phrases (requires 24+ items)
+        layout_cache_path: Optional sidecar file used to persist phrase
+            layouts between runs
+        logo_dpi: Resolution the logo is downsampled to before embedding
+        rng: Optional random generator used to pick each card's squares
+            when no seed is given
+        seed: Optional run seed that fixes every card's squares
+        first_card_id: ID of the first card in this file, for rendering a
+            slice of a larger seeded run
+        unique: Optional uniqueness mode ("set" or "layout"); cards that
+            repeat an earlier card are redrawn
+        cards: Optional pre-selected squares for each card, used instead of
+            drawing them from bingo_squares
+        manifest_path: Optional path where the card manifest is written
+        show_card_ids: Whether to print each card's ID below it; by default
+            IDs are printed when a seed or manifest_path is given
+        font_cache_dir: Optional directory of parsed fonts kept between runs
+        layout: Where the cards go on each page, from page_layout. Defaults
+            to two cards on a landscape letter page
+        optimize: Whether to write the smallest PDF: compressed streams,
+            stored as binary rather than ASCII85 text
+        attendees: Optional attendees to print on the cards' name fields,
+            consumed one per card as the cards are drawn (see
+            bingomatic.roster)
+
+    Raises:
+        CardCapacityError: If unique is set and the pool can't provide
+            card_count distinct cards
+        ValueError: If manifest_path is given without bingo_squares
 
     Returns:
         Path to the generated PDF file
     """
     output_path = Path(output_path)
-    page_width, page_height = landscape(letter)
+    if layout is None:
+        layout = page_layout()
+    page_width, page_height = layout.page_size
+    scale = layout.scale
+    cards_per_page = layout.cards_per_page
+
+    if manifest_path is not None and not bingo_squares:
+        raise ValueError("A card manifest needs bingo_squares")
+    if show_card_ids is None:
+        show_card_ids = seed is not None or manifest_path is not None
+    if attendees is not None:
+        attendees = iter(attendees)
+
+    # Fail before drawing anything if the pool is too small
+    sampler = None
+    if bingo_squares and cards is None:
+        sampler = start_sampler(
+            bingo_squares, card_count, first_card_id, seed=seed, rng=rng, unique=unique
+        )
 
     # Register custom fonts
-    register_fonts()
-
-    canvas = Canvas(str(output_path), pagesize=landscape(letter))
-
-    # Calculate how many pages we need (2 cards per page)
-    pages_needed = (card_count + 1) // 2
-
-    for page_num in range(pages_needed):
-        # Calculate grid positions
-        left_x, left_y, right_x, right_y = calculate_grid_positions(
-            page_width, page_height
+    with stage("register_fonts"):
+        register_fonts(font_cache_dir)
+
+    # Warm the layout cache from a previous run
+    if layout_cache_path is not None:
+        with stage("load_layout_cache"):
+            load_layout_cache(layout_cache_path)
+
+    # Decode the logo once, before any page is drawn
+    with stage("load_logo"):
+        logo = _cached_logo(logo_path, dpi=logo_dpi) if logo_path else None
+
+    pages_needed = -(-card_count // cards_per_page)
+
+    if manifest_path is not None:
+        manifest = ManifestWriter(manifest_path, bingo_squares, first_card_id)
+    else:
+        manifest = nullcontext()
+
+    with _binary_streams() if optimize else nullcontext(), manifest:
+        canvas = Canvas(
+            str(output_path),
+            pagesize=layout.page_size,
+            pageCompression=1 if optimize else None,
         )
 
-        # Draw left grid (always present)
-        draw_grid(canvas, left_x, left_y)
-
-        # Draw event name above left grid if provided
-        if event_name:
-            _draw_event_name(canvas, event_name, left_x, left_y)
-
-        # Draw bingo squares for left card
-        if bingo_squares:
-            left_squares = select_random_squares(bingo_squares)
-            _draw_card_squares(canvas, left_x, left_y, left_squares)
-
-        # Draw logo in center square of left grid if provided
-        if logo_path:
-            _draw_logo(canvas, logo_path, left_x, left_y)
+        # Record the artwork shared by every card once, then stamp it per
+        # card. Scaled cards are drawn in card space, where the page is larger.
+        with stage("define_template"):
+            _define_card_template(
+                canvas, event_name, logo, page_width / scale, page_height / scale
+            )
+
+        for page_num in range(pages_needed):
+            first_index = page_num * cards_per_page
+            page_cards = min(cards_per_page, card_count - first_index)
+
+            # The placement is the same on every page
+            for index, (grid_x, grid_y) in enumerate(
+                layout.positions[:page_cards], first_index
+            ):
+                if scale != 1:
+                    canvas.saveState()
+                    canvas.scale(scale, scale)
+                    grid_x, grid_y = grid_x / scale, grid_y / scale
+
+                _stamp_card_template(canvas, grid_x, grid_y)
+
+                # Draw bingo squares for this card
+                card_id = first_card_id + index
+                squares = None
+                if cards is not None:
+                    squares = cards[index]
+                elif sampler is not None:
+                    with stage("choose_squares"):
+                        squares = sampler.squares(card_id)
+                if squares is not None:
+                    with stage("draw_squares"):
+                        _draw_card_squares(canvas, grid_x, grid_y, squares)
+                    if manifest_path is not None:
+                        manifest.append(squares)
+                if show_card_ids:
+                    _draw_card_id(canvas, card_id, grid_x, grid_y)
+                if attendees is not None:
+                    attendee = next(attendees, None)
+                    if attendee is not None:
+                        _draw_attendee(canvas, attendee, grid_x, grid_y)
+
+                if scale != 1:
+                    canvas.restoreState()
+
+            # Add new page if not the last one
+            if page_num < pages_needed - 1:
+                canvas.showPage()
+
+        with stage("save_pdf"):
+            canvas.save()
+
+    if layout_cache_path is not None:
+        with stage("save_layout_cache"):
+            save_layout_cache(layout_cache_path)
 
-        # Draw name field below left grid
-        _draw_name_field(canvas, left_x, left_y)
-
-        # Draw right grid only if we have another card to show
-        cards_on_this_page = 2 if (page_num * 2 + 2) <= card_count else 1
-        if cards_on_this_page == 2:
-            draw_grid(canvas, right_x, right_y)
-
-            # Draw event name above right grid if provided
-            if event_name:
-                _draw_event_name(canvas, event_name, right_x, right_y)
-
-            # Draw bingo squares for right card
-            if bingo_squares:
-                right_squares = select_random_squares(bingo_squares)
-                _draw_card_squares(canvas, right_x, right_y, right_squares)
-
-            # Draw logo in center square of right grid if provided
-            if logo_path:
-                _draw_logo(canvas, logo_path, right_x, right_y)
+    return output_path
 
-            # Draw name field below right grid
-            _draw_name_field(canvas, right_x, right_y)
 
-        # Add new page if not the last one
-        if page_num < pages_needed - 1:
-            canvas.showPage()
+@contextmanager
+def _binary_streams() -> Iterator[None]:
+    """Store PDF streams as binary instead of ASCII85 text.
 
-    canvas.save()
-    return output_path
+    ReportLab reads this setting globally while building and saving a
+    document, so it is switched for the duration of one document only.
+    ASCII85 makes every compressed stream a quarter larger.
+    """
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = use_a85
 
 
 def _draw_name_field(canvas: Canvas, grid_x: float, grid_y: float) -> None:
@@ -333,18 +600,16 @@ def _draw_name_field(canvas: Canvas, grid_x: float, grid_y: float) -> None:
         grid_y: Y coordinate of grid's bottom-left corner
     """
     # Position name field below grid
-    label = "Name:"
-    field_y = grid_y - 36  # 0.5 inch below grid
+    field_y = grid_y + NAME_FIELD_OFFSET
 
     canvas.setFont("Roboto-Bold", 12)
     canvas.setFillColorRGB(0, 0, 0)
 
     # Draw "Name:" label
-    canvas.drawString(grid_x, field_y, label)
+    canvas.drawString(grid_x, field_y, NAME_LABEL)
 
     # Draw underline from after label to end of grid
-    label_width = pdfmetrics.stringWidth(label, "Roboto-Bold", 12)
-    line_start_x = grid_x + label_width + 4
+    line_start_x = _name_line_start(grid_x)
     line_end_x = grid_x + GRID_TOTAL
     line_y = field_y - 2
 
@@ -352,6 +617,59 @@ def _draw_name_field(canvas: Canvas, grid_x: float, grid_y: float) -> None:
     canvas.line(line_start_x, line_y, line_end_x, line_y)
 
 
+def _name_line_start(grid_x: float) -> float:
+    """Return where the underline of the name field starts."""
+    return grid_x + pdfmetrics.stringWidth(NAME_LABEL, "Roboto-Bold", 12) + 4
+
+
+def _draw_attendee(
+    canvas: Canvas, attendee: Attendee, grid_x: float, grid_y: float
+) -> None:
+    """Print an attendee's name on the name field and their badge ID below it.
+
+    A name too long for the underline is set smaller, down to MIN_FONT_SIZE,
+    and cut short with an ellipsis if it still doesn't fit.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        attendee: Attendee the card is printed for
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+    """
+    name_x = _name_line_start(grid_x) + 2
+    available = grid_x + GRID_TOTAL - name_x
+    name = attendee.name
+    width = pdfmetrics.stringWidth(name, "Roboto", NAME_FONT_SIZE)
+    font_size = NAME_FONT_SIZE
+    if width > available:
+        font_size = max(MIN_FONT_SIZE, NAME_FONT_SIZE * available / width)
+        while len(name) > 1 and (
+            pdfmetrics.stringWidth(name, "Roboto", font_size) > available
+        ):
+            name = name[:-2].rstrip() + "\u2026"
+
+    canvas.setFillColorRGB(0, 0, 0)
+    canvas.setFont("Roboto", font_size)
+    canvas.drawString(name_x, grid_y + NAME_FIELD_OFFSET, name)
+    if attendee.badge_id is not None:
+        canvas.setFont("Roboto", 8)
+        canvas.drawString(grid_x, grid_y - 50, f"Badge {attendee.badge_id}")
+
+
+def _draw_card_id(canvas: Canvas, card_id: int, grid_x: float, grid_y: float) -> None:
+    """Draw the card's ID right-aligned below the name field.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        card_id: Card number within the run
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+    """
+    canvas.setFont("Roboto", 8)
+    canvas.setFillColorRGB(0, 0, 0)
+    canvas.drawRightString(grid_x + GRID_TOTAL, grid_y - 50, f"#{card_id}")
+
+
 def _draw_event_name(
     canvas: Canvas, event_name: str, grid_x: float, grid_y: float
 ) -> None:
@@ -371,22 +689,94 @@ def _draw_event_name(
     canvas.drawCentredString(text_x, text_y, event_name)
 
 
-def _draw_logo(
-    canvas: Canvas, logo_path: Path | str, grid_x: float, grid_y: float
-) -> None:
-    """Draw logo in the center square of the grid.
+def load_logo(logo_path: Path | str, dpi: int = LOGO_DPI) -> ImageReader:
+    """Load, validate and downsample a logo to its printed resolution.
+
+    The logo is decoded once and shrunk so that its longest side covers the
+    printed logo size at the given DPI. Smaller images are left untouched.
 
     Args:
-        canvas: ReportLab canvas to draw on
         logo_path: Path to the logo image file
-        grid_x: X coordinate of grid's bottom-left corner
-        grid_y: Y coordinate of grid's bottom-left corner
+        dpi: Print resolution in dots per inch
+
+    Returns:
+        ImageReader wrapping the decoded, downsampled logo
+
+    Raises:
+        FileNotFoundError: If the logo file doesn't exist
+        ValueError: If the logo file can't be decoded as an image
+    """
+    return ImageReader(decode_logo(logo_path, dpi=dpi))
+
+
+def decode_logo(logo_path: Path | str, dpi: int = LOGO_DPI) -> Image.Image:
+    """Decode a logo and downsample it to its printed resolution.
+
+    Args:
+        logo_path: Path to the logo image file
+        dpi: Print resolution in dots per inch
+
+    Returns:
+        The logo as an RGB image, or RGBA if it has transparency
+
+    Raises:
+        FileNotFoundError: If the logo file doesn't exist
+        ValueError: If the logo file can't be decoded as an image
     """
     logo_path = Path(logo_path)
 
     if not logo_path.exists():
         raise FileNotFoundError(f"Logo file not found: {logo_path}")
 
+    try:
+        with Image.open(logo_path) as source:
+            source.load()
+            has_alpha = source.mode in ("RGBA", "LA", "PA") or (
+                "transparency" in source.info
+            )
+            image = source.convert("RGBA" if has_alpha else "RGB")
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Logo file is not a valid image: {logo_path} - {e}")
+
+    target_pixels = math.ceil(LOGO_SIZE / 72 * dpi)
+    image.thumbnail((target_pixels, target_pixels), Image.Resampling.LANCZOS)
+
+    return image
+
+
+_logo_cache: OrderedDict[tuple, ImageReader] = OrderedDict()
+
+
+def _cached_logo(logo_path: Path | str, dpi: int) -> ImageReader:
+    """Return load_logo's result, reusing it across runs in one process.
+
+    Entries are keyed on the file's identity and modification time, so an
+    edited logo is decoded again.
+    """
+    logo_path = Path(logo_path)
+    try:
+        info = logo_path.stat()
+    except OSError:
+        return load_logo(logo_path, dpi=dpi)
+
+    key = (str(logo_path.resolve()), info.st_mtime_ns, info.st_size, dpi)
+    logo = _logo_cache.get(key)
+    if logo is None:
+        logo = _logo_cache[key] = load_logo(logo_path, dpi=dpi)
+        while len(_logo_cache) > LOGO_CACHE_SIZE:
+            _logo_cache.popitem(last=False)
+    return logo
+
+
+def _draw_logo(canvas: Canvas, logo: ImageReader, grid_x: float, grid_y: float) -> None:
+    """Draw logo in the center square of the grid.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        logo: Logo returned by load_logo
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+    """
     # Center square is at row 2, col 2 (0-indexed), which is row 3, col 3 (1-indexed)
     center_row = 2
     center_col = 2
@@ -400,19 +790,88 @@ def _draw_logo(
     canvas.rect(square_x, square_y, SQUARE_SIZE, SQUARE_SIZE, fill=1, stroke=0)
 
     # Add small padding inside the square
-    padding = 4
-    logo_x = square_x + padding
-    logo_y = square_y + padding
-    logo_size = SQUARE_SIZE - (padding * 2)
+    logo_x = square_x + LOGO_PADDING
+    logo_y = square_y + LOGO_PADDING
 
     # Draw the logo, maintaining aspect ratio and preserving transparency
     canvas.drawImage(
-        str(logo_path),
+        logo,
         logo_x,
         logo_y,
-        width=logo_size,
-        height=logo_size,
+        width=LOGO_SIZE,
+        height=LOGO_SIZE,
         preserveAspectRatio=True,
         anchor="c",
         mask="auto",
     )
+
+
+def _draw_card_template(
+    canvas: Canvas,
+    grid_x: float,
+    grid_y: float,
+    event_name: str | None = None,
+    logo: ImageReader | None = None,
+) -> None:
+    """Draw the static artwork shared by every card.
+
+    This covers the grid lines, event name, center logo and name field;
+    only the phrases in the squares differ between cards.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+        event_name: Optional event name to display above the grid
+        logo: Optional logo returned by load_logo
+    """
+    draw_grid(canvas, grid_x, grid_y)
+
+    if event_name:
+        _draw_event_name(canvas, event_name, grid_x, grid_y)
+
+    if logo is not None:
+        _draw_logo(canvas, logo, grid_x, grid_y)
+
+    _draw_name_field(canvas, grid_x, grid_y)
+
+
+def _define_card_template(
+    canvas: Canvas,
+    event_name: str | None,
+    logo: ImageReader | None,
+    page_width: float,
+    page_height: float,
+) -> None:
+    """Record the static card artwork as a form XObject on the canvas.
+
+    The form is drawn with the grid's bottom-left corner at the origin and
+    a bounding box of a full page in every direction, so nothing is clipped
+    wherever a card is placed.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        event_name: Optional event name to display above the grid
+        logo: Optional logo returned by load_logo
+        page_width: Width of the page in points
+        page_height: Height of the page in points
+    """
+    canvas.beginForm(
+        CARD_TEMPLATE_FORM_NAME, -page_width, -page_height, page_width, page_height
+    )
+    _draw_card_template(canvas, 0, 0, event_name, logo)
+    canvas.endForm()
+
+
+def _stamp_card_template(canvas: Canvas, grid_x: float, grid_y: float) -> None:
+    """Place the card template form with its grid at the given position.
+
+    Args:
+        canvas: ReportLab canvas to draw on
+        grid_x: X coordinate of grid's bottom-left corner
+        grid_y: Y coordinate of grid's bottom-left corner
+    """
+    canvas.saveState()
+    canvas.translate(grid_x, grid_y)
+    canvas.doForm(CARD_TEMPLATE_FORM_NAME)
+    canvas.restoreState()
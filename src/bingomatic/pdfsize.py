@@ -0,0 +1,191 @@
+"""Size budgets and size breakdowns for generated PDFs.
+
+size_report reads a finished PDF and adds up how many bytes go to each
+kind of object: embedded fonts, images, card templates, page content
+streams, the page objects themselves and everything else. It also lists
+the fonts, so that a font embedded in full rather than as a subset of the
+glyphs used stands out.
+"""
+
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from bingomatic.merge import read_pdf_objects, split_pdf_object
+
+SIZE_CATEGORIES = ("content", "pages", "templates", "images", "fonts", "other")
+
+# Suffixes accepted by parse_size, in bytes
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "K": 1000,
+    "KB": 1000,
+    "M": 1000**2,
+    "MB": 1000**2,
+    "G": 1000**3,
+    "GB": 1000**3,
+    "KIB": 1024,
+    "MIB": 1024**2,
+    "GIB": 1024**3,
+}
+_SIZE = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*([a-zA-Z]*)\s*")
+
+_REFERENCE = re.compile(rb"(\d+) 0 R\b")
+_PAGE_TYPE = re.compile(rb"/Type /Page(s?)\b")
+_FONT_TYPE = re.compile(rb"/Type /Font\b")
+_CONTENTS = re.compile(rb"/Contents (\d+) 0 R")
+_FONT_FILE = re.compile(rb"/FontFile\d? (\d+) 0 R")
+_FONT_DESCRIPTOR = re.compile(rb"/FontDescriptor (\d+) 0 R")
+_BASE_FONT = re.compile(rb"/BaseFont /([^\s/<>\[\]()]+)")
+_SUBSET_TAG = re.compile(r"[A-Z]{6}\+")
+
+
+class FontInfo(NamedTuple):
+    """A font used by a PDF."""
+
+    name: str  # Base font name, without any subset tag
+    embedded: bool
+    subset: bool  # Whether only the glyphs used are embedded
+    size: int  # Bytes of the font's objects, including any embedded file
+
+
+class SizeReport(NamedTuple):
+    """Where the bytes of a PDF go."""
+
+    total: int
+    page_count: int
+    categories: dict[str, int]  # Bytes per entry of SIZE_CATEGORIES
+    fonts: list[FontInfo]
+
+    @property
+    def full_fonts(self) -> list[str]:
+        """Names of the fonts embedded in full rather than subset."""
+        return [font.name for font in self.fonts if font.embedded and not font.subset]
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as 50MB, 1.5G or 200KiB into bytes.
+
+    K, M and G are powers of 1000; KiB, MiB and GiB powers of 1024. A plain
+    number is a count of bytes.
+
+    Args:
+        text: Size to parse
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size can't be parsed
+    """
+    match = _SIZE.fullmatch(text)
+    unit = match.group(2).upper() if match else None
+    if unit not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size: {text!r} (use e.g. 50MB or 200KiB)")
+    return int(float(match.group(1)) * _SIZE_UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes for people, e.g. 1.8 MB."""
+    for unit, factor in (("GB", 1000**3), ("MB", 1000**2), ("kB", 1000)):
+        if size >= factor:
+            return f"{size / factor:.1f} {unit}"
+    return f"{size} B"
+
+
+def size_report(pdf_path: Path | str) -> SizeReport:
+    """Break a generated PDF's size down by kind of object.
+
+    Args:
+        pdf_path: Path to a ReportLab-generated PDF
+
+    Returns:
+        The breakdown
+
+    Raises:
+        PdfMergeError: If the file can't be parsed
+    """
+    pdf_path = Path(pdf_path)
+    total = pdf_path.stat().st_size
+    objects, _ = read_pdf_objects(pdf_path)
+    heads = {num: split_pdf_object(body)[0] for num, body in objects.items()}
+
+    kinds = {}
+    page_count = 0
+    font_objects = []
+    for num, head in heads.items():
+        page_type = _PAGE_TYPE.search(head)
+        if page_type is not None:
+            kinds[num] = "pages"
+            if not page_type.group(1):
+                page_count += 1
+            contents = _CONTENTS.search(head)
+            if contents is not None:
+                kinds[int(contents.group(1))] = "content"
+        elif b"/Subtype /Image" in head:
+            kinds[num] = "images"
+        elif b"/Subtype /Form" in head:
+            kinds[num] = "templates"
+        elif _FONT_TYPE.search(head):
+            font_objects.append(num)
+
+    # A font owns its descriptor, and through it the embedded font file,
+    # as well as its ToUnicode map
+    fonts = []
+    for num in font_objects:
+        head = heads[num]
+        descriptor = _FONT_DESCRIPTOR.search(head)
+        descriptor_head = (
+            heads.get(int(descriptor.group(1)), b"") if descriptor else b""
+        )
+        owned = {num} | {
+            int(ref)
+            for ref in _REFERENCE.findall(head + descriptor_head)
+            if int(ref) in objects
+        }
+        for owned_num in owned:
+            kinds[owned_num] = "fonts"
+
+        base_font = _BASE_FONT.search(head)
+        name = base_font.group(1).decode("latin-1") if base_font else "unknown"
+        fonts.append(
+            FontInfo(
+                name=_SUBSET_TAG.sub("", name, count=1),
+                embedded=_FONT_FILE.search(descriptor_head) is not None,
+                subset=_SUBSET_TAG.match(name) is not None,
+                size=sum(len(objects[owned_num]) for owned_num in owned),
+            )
+        )
+
+    categories = dict.fromkeys(SIZE_CATEGORIES, 0)
+    for num, body in objects.items():
+        categories[kinds.get(num, "other")] += len(body)
+    # Object wrappers, the xref table and the trailer count as other
+    categories["other"] += total - sum(len(body) for body in objects.values())
+    return SizeReport(total, page_count, categories, fonts)
+
+
+def format_size_report(report: SizeReport) -> str:
+    """Render a size report as a table followed by the fonts.
+
+    Args:
+        report: Report from size_report
+
+    Returns:
+        One line per category, then one per font
+    """
+    lines = [f"PDF size: {format_size(report.total)} ({report.page_count} pages)"]
+    for category in SIZE_CATEGORIES:
+        size = report.categories[category]
+        share = size / report.total * 100 if report.total else 0.0
+        lines.append(f"  {category:<10} {format_size(size):>10} {share:>6.1f}%")
+    for font in report.fonts:
+        if not font.embedded:
+            state = "not embedded"
+        elif font.subset:
+            state = f"subset, {format_size(font.size)}"
+        else:
+            state = f"embedded in full, {format_size(font.size)}"
+        lines.append(f"  font {font.name} ({state})")
+    return "\n".join(lines)
@@ -0,0 +1,104 @@
+"""Checking a phrase pool before anything is printed.
+
+check_phrases lays out every distinct phrase once with the renderer's own
+fitter and reports the phrases that overflow their square even at the
+smallest font size, along with phrases listed more than once. The fitter
+reads glyph advances straight from the bundled font, so checking never
+imports ReportLab, Pillow or NumPy. Results are kept per phrase in a JSON
+cache, so validating a pool again only lays out the phrases added since;
+the cache is discarded whenever the font, the square or the fitter change.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+from bingomatic.cachefile import read_cache, write_cache
+from bingomatic.textfit import fit_fingerprint, load_fit_font, phrase_fits
+
+FIT_CACHE_VERSION = 3
+FIT_CACHE_SIZE = 200_000  # Phrases kept; the least recently checked go first
+
+
+class PhraseReport(NamedTuple):
+    """Problems found in a phrase pool."""
+
+    unfittable: list[str]  # Phrases that overflow even at the smallest size
+    duplicates: dict[str, int]  # Repeated phrases and how often they appear
+    checked: int  # Phrases laid out by this check rather than found cached
+
+
+def find_duplicates(phrases: list[str]) -> dict[str, int]:
+    """Find phrases that appear more than once in a pool.
+
+    Phrases are compared as printed, so ones differing only in spacing
+    count as the same phrase.
+
+    Args:
+        phrases: Phrase pool
+
+    Returns:
+        Each repeated phrase, as first listed, and how often it appears
+    """
+    first_spelling = {}
+    counts = Counter()
+    for phrase in phrases:
+        printed = " ".join(phrase.split())
+        first_spelling.setdefault(printed, phrase)
+        counts[printed] += 1
+    return {first_spelling[key]: count for key, count in counts.items() if count > 1}
+
+
+def _load_fit_cache(cache_path: Path | str | None, fingerprint: str) -> dict[str, bool]:
+    """Load cached fit results, ignoring a missing or out-of-date cache."""
+    if cache_path is None:
+        return {}
+    data = read_cache(cache_path, FIT_CACHE_VERSION)
+    if (
+        not isinstance(data, dict)
+        or data.get("fit") != fingerprint
+        or not isinstance(data.get("phrases"), dict)
+    ):
+        return {}
+    return data["phrases"]
+
+
+def _save_fit_cache(
+    cache_path: Path | str, fingerprint: str, fits: dict[str, bool]
+) -> None:
+    """Write fit results atomically, keeping the most recent FIT_CACHE_SIZE."""
+    if len(fits) > FIT_CACHE_SIZE:
+        fits = dict(list(fits.items())[-FIT_CACHE_SIZE:])
+    write_cache(cache_path, FIT_CACHE_VERSION, {"fit": fingerprint, "phrases": fits})
+
+
+def check_phrases(
+    phrases: list[str], cache_path: Path | str | None = None
+) -> PhraseReport:
+    """Check that every phrase of a pool can be printed in its square.
+
+    Args:
+        phrases: Phrase pool; every entry must be a string
+        cache_path: Optional JSON file of per-phrase results kept between
+            checks, written only when new phrases were laid out
+
+    Returns:
+        The unfittable and repeated phrases
+    """
+    distinct = list(dict.fromkeys(phrases))
+    fingerprint = fit_fingerprint() if cache_path is not None else ""
+    fits = _load_fit_cache(cache_path, fingerprint)
+    unchecked = [phrase for phrase in distinct if phrase not in fits]
+
+    if unchecked:
+        load_fit_font()
+        for phrase in unchecked:
+            fits[phrase] = phrase_fits(phrase)
+        if cache_path is not None:
+            # Move this pool to the recent end, so it is evicted last
+            for phrase in distinct:
+                fits[phrase] = fits.pop(phrase)
+            _save_fit_cache(cache_path, fingerprint, fits)
+
+    unfittable = [phrase for phrase in distinct if not fits[phrase]]
+    return PhraseReport(unfittable, find_duplicates(phrases), len(unchecked))
@@ -0,0 +1,100 @@
+"""Attendee rosters: one personalized card per row of a CSV file.
+
+A roster is a CSV file with a header row naming a ``name`` column and,
+optionally, a ``badge_id`` column; other columns are ignored. Rows are read
+one at a time and handed to the renderer as they are needed, so a roster of
+any length is never held in memory. Blank lines are skipped and don't count
+as rows.
+
+Card IDs follow row numbers: the card of the first row is card 1, so a run
+resumed from a later row gives each attendee the card ID, and with a seed
+the squares, they would have had in a full run. Unique runs are the
+exception, as each of their cards depends on every card before it.
+"""
+
+import csv
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+NAME_COLUMN = "name"
+BADGE_COLUMN = "badge_id"
+
+
+class RosterError(Exception):
+    """Raised when a roster can't be read."""
+
+    pass
+
+
+class Attendee(NamedTuple):
+    """The person a card is printed for."""
+
+    name: str
+    badge_id: str | None = None
+
+
+def _rows(roster_path: Path | str) -> Iterator[tuple[int, Attendee]]:
+    """Yield the line number and attendee of every non-blank row."""
+    roster_path = Path(roster_path)
+    try:
+        # utf-8-sig drops the byte order mark spreadsheets like to add
+        with open(roster_path, newline="", encoding="utf-8-sig") as roster_file:
+            reader = csv.reader(roster_file)
+            header = [column.strip().lower() for column in next(reader, [])]
+            if NAME_COLUMN not in header:
+                raise RosterError(
+                    f"Roster has no '{NAME_COLUMN}' column: {roster_path}"
+                )
+            name_index = header.index(NAME_COLUMN)
+            badge_index = header.index(BADGE_COLUMN) if BADGE_COLUMN in header else None
+
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                name = row[name_index].strip() if name_index < len(row) else ""
+                badge_id = None
+                if badge_index is not None and badge_index < len(row):
+                    badge_id = row[badge_index].strip() or None
+                yield reader.line_num, Attendee(name, badge_id)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise RosterError(f"Cannot read roster: {roster_path} - {e}") from e
+
+
+def count_roster(roster_path: Path | str) -> int:
+    """Count the rows of a roster, checking every row has a name.
+
+    Args:
+        roster_path: Path to the roster CSV file
+
+    Returns:
+        Number of attendees in the roster
+
+    Raises:
+        RosterError: If the roster can't be read, has no name column, or a
+            row has no name
+    """
+    count = 0
+    for line_num, attendee in _rows(roster_path):
+        if not attendee.name:
+            raise RosterError(f"Line {line_num} of the roster has no name")
+        count += 1
+    return count
+
+
+def read_roster(roster_path: Path | str, start: int = 0) -> Iterator[Attendee]:
+    """Stream the attendees of a roster, one row at a time.
+
+    Args:
+        roster_path: Path to the roster CSV file
+        start: Number of rows to skip, for resuming an earlier run
+
+    Yields:
+        Each attendee from row start onwards, in file order
+
+    Raises:
+        RosterError: If the roster can't be read or has no name column
+    """
+    for _, attendee in islice(_rows(roster_path), start, None):
+        yield attendee
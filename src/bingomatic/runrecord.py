@@ -0,0 +1,126 @@
+"""Run records: what an earlier run generated, so it can be extended.
+
+Next to each PDF, generate writes a small JSON record holding a fingerprint
+of everything that decides how the cards look apart from how many there
+are, the number of cards, and the seed the cards were drawn with. Because
+a seeded run's cards depend only on the seed and their IDs, a later run
+with the same fingerprint and a larger card count only has to render the
+cards after the ones already in the file.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import bingomatic
+from bingomatic.cachefile import read_cache, write_cache
+from bingomatic.cards import CARD_SEED_VERSION
+from bingomatic.imposition import PageLayout
+from bingomatic.pdf import LAYOUT_CACHE_VERSION
+from bingomatic.textfit import FIT_VERSION
+
+RUN_RECORD_VERSION = 2
+# Bump whenever a change to rendering changes how cards look, so that an
+# earlier run is rendered afresh rather than extended with mismatched pages
+RUN_FORMAT_VERSION = 1
+
+
+class RunRecord(NamedTuple):
+    """What an earlier run wrote to a PDF."""
+
+    fingerprint: str
+    card_count: int
+    seed: int
+
+
+def run_record_path(output_path: Path | str) -> Path:
+    """Return where the run record of a PDF is kept.
+
+    Args:
+        output_path: Path to the generated PDF
+
+    Returns:
+        The PDF's path with a .run.json suffix
+    """
+    return Path(output_path).with_suffix(".run.json")
+
+
+def run_fingerprint(
+    config: dict[str, Any],
+    seed: int | None,
+    unique: str | None,
+    manifest: bool,
+    logo_dpi: int,
+    layout: PageLayout,
+    optimize: bool = False,
+) -> str:
+    """Fingerprint the settings that decide how a run's cards look.
+
+    card_count is left out, so that runs differing only in their number of
+    cards share a fingerprint. The logo is fingerprinted by its contents,
+    and the versions of the rendering, phrase fitting and card sampling
+    code are included, so upgrading past a change to any of them starts
+    the run over.
+
+    Args:
+        config: Validated configuration
+        seed: Seed chosen by the user, or None if the run picks its own
+        unique: Optional uniqueness mode
+        manifest: Whether the run keeps a card manifest
+        logo_dpi: Resolution the logo is embedded at
+        layout: Where the cards go on each page
+        optimize: Whether the PDF is optimized for size
+
+    Returns:
+        Hex digest of the settings
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    settings = {
+        "version": bingomatic.__version__,
+        "run_format": RUN_FORMAT_VERSION,
+        "layout_cache": LAYOUT_CACHE_VERSION,
+        "card_seed": CARD_SEED_VERSION,
+        "text_fit": FIT_VERSION,
+        "event_name": config["event_name"],
+        "bingo_squares": config["bingo_squares"],
+        "seed": seed,
+        "unique": unique,
+        "manifest": manifest,
+        "logo_dpi": logo_dpi,
+        "layout": layout,
+        "optimize": optimize,
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    with open(config["logo_location"], "rb") as f:
+        digest.update(hashlib.file_digest(f, "blake2b").digest())
+    return digest.hexdigest()
+
+
+def load_run_record(path: Path | str) -> RunRecord | None:
+    """Read a run record.
+
+    Args:
+        path: Path to the record
+
+    Returns:
+        The record, or None if there is none or it is incomplete, in which
+        case the run is rendered from scratch
+    """
+    data = read_cache(path, RUN_RECORD_VERSION)
+    try:
+        return RunRecord(
+            str(data["fingerprint"]), int(data["card_count"]), int(data["seed"])
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def save_run_record(path: Path | str, record: RunRecord) -> None:
+    """Write a run record, atomically.
+
+    Args:
+        path: Path to the record
+        record: What the run wrote
+    """
+    write_cache(path, RUN_RECORD_VERSION, record._asdict())
@@ -0,0 +1,395 @@
+"""Long-running HTTP service that renders bingo cards on demand.
+
+Requests are JSON objects shaped like the config file (see
+bingomatic.config.validate_config) and responses are the rendered PDF.
+Rendering happens in a fixed pool of worker processes that register the
+fonts once at start-up and keep their logo and phrase layout caches warm
+between requests. At most workers + queue_size requests are accepted at a
+time; beyond that the service answers 503 straight away instead of letting
+requests pile up.
+
+Clients never name files on the server: a request's logo_location is a
+file name within the service's logo directory, and anything resolving
+outside it is rejected.
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any
+
+from reportlab import rl_config
+
+from bingomatic.cards import UNIQUE_MODES, CardCapacityError, check_unique_capacity
+from bingomatic.config import DEFAULT_LOGO_DPI, get_card_count, validate_config
+from bingomatic.pdf import generate_pdf, register_fonts
+
+MAX_BODY_BYTES = 1 << 20  # Largest request body accepted
+MAX_REQUEST_CARDS = 500  # Largest card_count a single request may ask for
+RETRY_AFTER_SECONDS = 1  # Hint sent with 503 responses
+
+
+class RequestError(Exception):
+    """Raised when a card request is invalid."""
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+class ServiceBusyError(Exception):
+    """Raised when every worker and queue slot is taken."""
+
+    pass
+
+
+def _warm_worker(font_cache_dir: Path | str | None) -> None:
+    """Register the fonts once in each worker process."""
+    register_fonts(font_cache_dir)
+    # Responses are binary anyway; ASCII85-encoding the logo of every PDF in
+    # pure Python would cost more than the rest of a small request.
+    rl_config.useA85 = 0
+
+
+def _render_cards(options: dict[str, Any]) -> bytes:
+    """Render one request in a worker process and return the PDF bytes."""
+    with tempfile.TemporaryDirectory(prefix="bingomatic-") as tmp_dir:
+        output_path = Path(tmp_dir) / "cards.pdf"
+        generate_pdf(output_path, **options)
+        return output_path.read_bytes()
+
+
+def _resolve_logo(logo_location: str, logo_dir: Path | str | None) -> Path:
+    """Find a request's logo, which must be a file within logo_dir."""
+    if logo_dir is None:
+        raise RequestError(["This server has no logo directory"])
+    logo_dir = Path(logo_dir).resolve()
+    logo_path = (logo_dir / logo_location).resolve()
+    if not logo_path.is_relative_to(logo_dir):
+        raise RequestError(
+            [
+                (
+                    "Field 'logo_location' must name a file in the logo "
+                    f"directory: {logo_location}"
+                )
+            ]
+        )
+    if not logo_path.is_file():
+        raise RequestError([f"Logo file not found: {logo_location}"])
+    return logo_path
+
+
+def parse_card_request(
+    request: Any, logo_dir: Path | str | None = None
+) -> dict[str, Any]:
+    """Check a card request and turn it into generate_pdf arguments.
+
+    A request has the fields of a config file, except that
+    output_directory is optional since the PDF is returned instead of
+    written, and logo_location names a file in logo_dir rather than a path
+    on the server. It may also carry a seed and a unique mode, as accepted
+    by 'bingomatic generate'.
+
+    Args:
+        request: Decoded JSON body of the request
+        logo_dir: Directory holding the logos requests may use; without
+            one, every request is rejected
+
+    Returns:
+        Keyword arguments for generate_pdf, apart from output_path
+
+    Raises:
+        RequestError: If the request is invalid
+    """
+    if not isinstance(request, dict):
+        raise RequestError(["Request body must be a JSON object"])
+
+    errors = validate_config({"output_directory": ".", **request})
+    seed = request.get("seed")
+    if seed is not None and (
+        not isinstance(seed, int) or isinstance(seed, bool) or seed < 0
+    ):
+        errors.append("Field 'seed' must be a non-negative integer")
+    unique = request.get("unique")
+    if unique is not None and unique not in UNIQUE_MODES:
+        errors.append(f"Field 'unique' must be one of: {', '.join(UNIQUE_MODES)}")
+    if errors:
+        raise RequestError(errors)
+
+    card_count = get_card_count(request)
+    if card_count > MAX_REQUEST_CARDS:
+        raise RequestError([f"Field 'card_count' must be at most {MAX_REQUEST_CARDS}"])
+    if unique is not None:
+        try:
+            check_unique_capacity(request["bingo_squares"], card_count, unique)
+        except CardCapacityError as e:
+            raise RequestError([str(e)]) from e
+
+    logo_path = _resolve_logo(request["logo_location"], logo_dir)
+
+    return {
+        "card_count": card_count,
+        "event_name": request["event_name"],
+        "logo_path": logo_path,
+        "bingo_squares": request["bingo_squares"],
+        "seed": seed,
+        "unique": unique,
+    }
+
+
+class CardService:
+    """A pool of warm worker processes with a bounded request queue."""
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        font_cache_dir: Path | str | None = None,
+        logo_dpi: int = DEFAULT_LOGO_DPI,
+        logo_dir: Path | str | None = None,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.logo_dpi = logo_dpi
+        self.logo_dir = logo_dir
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # Workers are started from a clean process rather than forked from
+        # this one, which runs a thread per connection.
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_warm_worker,
+            initargs=(font_cache_dir,),
+        )
+        # Start every worker now so the first requests don't wait for them
+        wait([self._executor.submit(os.getpid) for _ in range(workers)])
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests being rendered or waiting for a worker."""
+        return self._in_flight
+
+    def render(self, request: Any) -> bytes:
+        """Render a card request.
+
+        Args:
+            request: Decoded JSON body of the request
+
+        Returns:
+            The rendered PDF
+
+        Raises:
+            RequestError: If the request is invalid
+            ServiceBusyError: If the queue is full
+        """
+        options = parse_card_request(request, self.logo_dir)
+        options["logo_dpi"] = self.logo_dpi
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusyError("Too many requests in flight")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(_render_cards, options).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(cancel_futures=True)
+
+
+class CardRequestHandler(BaseHTTPRequestHandler):
+    """Serves POST /cards and GET /health for a CardService."""
+
+    server_version = "bingomatic"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests only when the server was asked to."""
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    def address_string(self) -> str:
+        """Name the client, which has no address on a Unix socket."""
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: bytes,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, data: dict, **kwargs) -> None:
+        self._send(status, json.dumps(data).encode(), "application/json", **kwargs)
+
+    def _body_length(self) -> int | None:
+        """Return the request's Content-Length, or reply and return None.
+
+        The body is only read once its length is known to be within
+        MAX_BODY_BYTES. A request whose body is left unread closes the
+        connection, as the rest of the stream can't be trusted.
+        """
+        header = self.headers.get("Content-Length")
+        if header is None:
+            status = HTTPStatus.LENGTH_REQUIRED
+            error = "Content-Length is required"
+        elif not (header.isascii() and header.strip().isdigit()):
+            status = HTTPStatus.BAD_REQUEST
+            error = f"Invalid Content-Length: {header!r}"
+        elif int(header) > MAX_BODY_BYTES:
+            status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            error = f"Request body is larger than {MAX_BODY_BYTES} bytes"
+        else:
+            return int(header)
+        self.close_connection = True
+        self._send_json(status, {"errors": [error]})
+        return None
+
+    def do_GET(self) -> None:
+        """Report the service's health."""
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"errors": ["Not found"]})
+            return
+        service: CardService = self.server.service
+        self._send_json(
+            HTTPStatus.OK,
+            {
+                "status": "ok",
+                "workers": service.workers,
+                "queue_size": service.queue_size,
+                "in_flight": service.in_flight,
+            },
+        )
+
+    def do_POST(self) -> None:
+        """Render the cards described by the JSON body."""
+        if self.path != "/cards":
+            self._send_json(HTTPStatus.NOT_FOUND, {"errors": ["Not found"]})
+            return
+
+        length = self._body_length()
+        if length is None:
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, {"errors": [f"Invalid JSON body: {e}"]}
+            )
+            return
+
+        try:
+            pdf_bytes = self.server.service.render(request)
+        except RequestError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"errors": e.errors})
+        except ServiceBusyError as e:
+            self._send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"errors": [str(e)]},
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        except BrokenProcessPool:
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {"errors": ["Worker pool crashed"]}
+            )
+        except Exception as e:
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"errors": [f"Failed to generate PDF: {e}"]},
+            )
+        else:
+            self._send(HTTPStatus.OK, pdf_bytes, "application/pdf")
+
+
+class _TCPServer(ThreadingHTTPServer):
+    """HTTP server on a TCP port, one thread per connection."""
+
+    service: CardService
+    access_log = False
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        """Accept a connection with Nagle's algorithm off.
+
+        Headers and body are written separately, so with Nagle on the body
+        can wait for the client's delayed ACK of the headers.
+        """
+        connection, address = super().get_request()
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection, address
+
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    """HTTP server on a Unix socket, one thread per connection."""
+
+    daemon_threads = True
+    service: CardService
+    access_log = False
+
+
+def create_server(
+    service: CardService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    socket_path: Path | str | None = None,
+    access_log: bool = False,
+) -> ThreadingHTTPServer | UnixStreamServer:
+    """Bind an HTTP server for a card service.
+
+    Args:
+        service: Service that renders the requests
+        host: Interface to listen on
+        port: TCP port to listen on; 0 picks a free port
+        socket_path: Optional Unix socket to listen on instead of TCP
+        access_log: Whether to log every request to stderr
+
+    Returns:
+        The bound server; call serve_forever() to start handling requests
+    """
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        if socket_path.is_socket():
+            socket_path.unlink()
+        server = _UnixServer(str(socket_path), CardRequestHandler)
+    else:
+        server = _TCPServer((host, port), CardRequestHandler)
+    server.service = service
+    server.access_log = access_log
+    return server
+
+
+def default_workers() -> int:
+    """Return the default worker count: one per available CPU."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
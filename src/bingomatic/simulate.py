@@ -0,0 +1,127 @@
+"""Monte Carlo game simulation for Bingomatic.
+
+Each simulated game calls every distinct phrase once, in random order. Rather
+than replaying the calls one at a time, a game is described by the call
+number of each phrase: a line is complete at the latest call among its
+squares, and a card wins at the earliest of its twelve lines. That is the
+moment the card's coverage mask (see bingomatic.verify) first contains a
+winning line, computed for every card and a whole batch of games at once.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from bingomatic.cards import GRID_SIZE
+from bingomatic.verify import SQUARE_POSITIONS
+
+PERCENTILES = (5, 25, 50, 75, 95)
+GAMES_PER_BATCH = 64  # Games simulated together; bounds the working set
+
+_DIAGONAL = np.arange(GRID_SIZE)
+
+
+class SimulationResult(NamedTuple):
+    """Per-game outcomes of a simulation."""
+
+    first_bingo: np.ndarray  # Call number of each game's first bingo
+    first_winners: np.ndarray  # Cards completing a line on that call
+    winners_after: dict[int, np.ndarray]  # Winning cards after K calls
+
+
+def _card_grid(cards: np.ndarray, phrase_ids: np.ndarray, free_id: int) -> np.ndarray:
+    """Lay cards out as (25, n) distinct phrase IDs in grid order.
+
+    The free center square gets free_id, whose call number is always 0.
+    """
+    grid = np.full((GRID_SIZE * GRID_SIZE, len(cards)), free_id, dtype=np.intp)
+    grid[SQUARE_POSITIONS] = phrase_ids[cards].T
+    return grid
+
+
+def _win_calls(grid: np.ndarray, call_numbers: np.ndarray) -> np.ndarray:
+    """Compute the call on which each card first completes a line.
+
+    Args:
+        grid: (25, n) distinct phrase IDs, as from _card_grid
+        call_numbers: (phrases + 1, games) call number of every phrase in
+            every game, with 0 for the free square
+
+    Returns:
+        (n, games) array of winning call numbers
+    """
+    times = call_numbers.take(grid, axis=0)
+    times = times.reshape(GRID_SIZE, GRID_SIZE, *times.shape[1:])
+
+    win = times.max(axis=1).min(axis=0)  # Rows
+    np.minimum(win, times.max(axis=0).min(axis=0), out=win)  # Columns
+    np.minimum(win, times[_DIAGONAL, _DIAGONAL].max(axis=0), out=win)
+    np.minimum(win, times[_DIAGONAL, GRID_SIZE - 1 - _DIAGONAL].max(axis=0), out=win)
+    return win
+
+
+def simulate_games(
+    cards: np.ndarray,
+    bingo_squares: list[str],
+    games: int,
+    calls: tuple[int, ...] = (),
+    seed: int | None = None,
+) -> SimulationResult:
+    """Play many games against one set of cards.
+
+    Args:
+        cards: (n, 24) matrix of phrase indices, as from card_matrix
+        bingo_squares: The phrases the card indices refer to; repeated
+            phrases are called together
+        games: Number of games to simulate
+        calls: Call counts K to report the number of winners after
+        seed: Optional seed for the call orders
+
+    Returns:
+        Per-game outcomes
+    """
+    rng = np.random.default_rng(seed)
+    distinct = {}
+    phrase_ids = np.array(
+        [distinct.setdefault(phrase, len(distinct)) for phrase in bingo_squares],
+        dtype=np.intp,
+    )
+    phrase_count = len(distinct)
+    grid = _card_grid(cards, phrase_ids, free_id=phrase_count)
+    dtype = np.uint8 if phrase_count <= np.iinfo(np.uint8).max else np.uint16
+
+    first_bingo = np.empty(games, dtype=dtype)
+    first_winners = np.empty(games, dtype=np.int64)
+    winners_after = {k: np.empty(games, dtype=np.int64) for k in calls}
+
+    ranks = np.arange(1, phrase_count + 1, dtype=dtype)
+    for start in range(0, games, GAMES_PER_BATCH):
+        stop = min(start + GAMES_PER_BATCH, games)
+        call_numbers = np.zeros((phrase_count + 1, stop - start), dtype=dtype)
+        call_numbers[:phrase_count] = rng.permuted(
+            np.broadcast_to(ranks[:, None], (phrase_count, stop - start)), axis=0
+        )
+
+        win = _win_calls(grid, call_numbers)
+        first = win.min(axis=0)
+        first_bingo[start:stop] = first
+        first_winners[start:stop] = (win == first).sum(axis=0)
+        for k, winners in winners_after.items():
+            winners[start:stop] = (win <= k).sum(axis=0)
+
+    return SimulationResult(first_bingo, first_winners, winners_after)
+
+
+def percentiles(values: np.ndarray, levels: tuple[int, ...] = PERCENTILES) -> list[int]:
+    """Return the given percentiles of a per-game outcome.
+
+    Args:
+        values: One value per game
+        levels: Percentile levels between 0 and 100
+
+    Returns:
+        The observed value at each level
+    """
+    return [
+        int(value) for value in np.percentile(values, levels, method="inverted_cdf")
+    ]
@@ -0,0 +1,218 @@
+"""Fitting phrases into bingo squares.
+
+A phrase is wrapped greedily on word boundaries and shrunk from
+MAX_FONT_SIZE towards MIN_FONT_SIZE until its lines fit the square.
+Measurement only needs the glyph advances of the font, so this module
+works without ReportLab, Pillow or NumPy: the renderer measures through
+the fonts it registered with ReportLab, and the phrase check reads the
+same advances straight from the bundled TrueType file.
+"""
+
+import hashlib
+from pathlib import Path
+
+from bingomatic.imposition import SQUARE_SIZE
+from bingomatic.metrics import get_font_metrics, load_font_metrics
+
+FONTS_DIR = Path(__file__).parent / "fonts"
+
+# Font phrases are printed in
+FIT_FONT = "RobotoMono"
+FIT_FONT_PATH = FONTS_DIR / "RobotoMono-Regular.ttf"
+
+# Text rendering constants
+MIN_FONT_SIZE = 4
+MAX_FONT_SIZE = 12
+FONT_SIZE_STEP = 1  # Granularity of the font-size search; may be fractional
+SQUARE_PADDING = 4
+LINE_SPACING = 1.2  # Line height relative to the font size
+
+FIT_VERSION = 1  # Bump when wrapping or the font-size search changes output
+
+
+def load_fit_font() -> None:
+    """Read the advances of the phrase font straight from its file.
+
+    Measuring through load_fit_font gives the same widths as registering
+    the fonts with bingomatic.pdf.register_fonts, without importing
+    ReportLab.
+    """
+    load_font_metrics(FIT_FONT, FIT_FONT_PATH)
+
+
+def fit_fingerprint() -> str:
+    """Return a digest of everything that decides whether a phrase fits.
+
+    Covers the phrase font's file, the square geometry, the font-size
+    bounds and FIT_VERSION, so results kept between runs can be discarded
+    when any of them changes.
+
+    Returns:
+        Hex digest of the fitting inputs
+    """
+    with open(FIT_FONT_PATH, "rb") as font_file:
+        digest = hashlib.file_digest(font_file, lambda: hashlib.blake2b(digest_size=20))
+    settings = (
+        FIT_VERSION,
+        FIT_FONT,
+        SQUARE_SIZE,
+        SQUARE_PADDING,
+        MIN_FONT_SIZE,
+        MAX_FONT_SIZE,
+        FONT_SIZE_STEP,
+        LINE_SPACING,
+    )
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+
+def measure_words(text: str, font_name: str) -> tuple[list[str], list[float], float]:
+    """Split text into words and measure each word once.
+
+    Widths are returned in font units (1/1000 of the font size), so they can
+    be scaled to any font size without measuring again.
+
+    Args:
+        text: Text to split
+        font_name: Name of the font to use for measurement
+
+    Returns:
+        Tuple of (words, word widths, width of a single space)
+    """
+    metrics = get_font_metrics(font_name)
+    words = text.split()
+    return words, metrics.measure_many(words), metrics.measure(" ")
+
+
+def wrap_measured(
+    words: list[str],
+    widths: list[float],
+    space_width: float,
+    font_size: float,
+    max_width: float,
+) -> tuple[list[str], float]:
+    """Greedily wrap pre-measured words, tracking the running line width.
+
+    Args:
+        words: Words to wrap
+        widths: Width of each word in font units
+        space_width: Width of a space in font units
+        font_size: Font size in points
+        max_width: Maximum width in points
+
+    Returns:
+        Tuple of (wrapped lines, width of the widest line in points)
+    """
+    scale = 0.001 * font_size
+    lines = []
+    widest = 0.0
+    line_start = 0
+    line_units = 0.0
+
+    for i, word_units in enumerate(widths):
+        if i == line_start:
+            # First word on a line is always placed, even if too wide
+            line_units = word_units
+            continue
+        test_units = line_units + space_width + word_units
+        if scale * test_units <= max_width:
+            line_units = test_units
+        else:
+            lines.append(" ".join(words[line_start:i]))
+            widest = max(widest, scale * line_units)
+            line_start = i
+            line_units = word_units
+
+    if words:
+        lines.append(" ".join(words[line_start:]))
+        widest = max(widest, scale * line_units)
+
+    return lines, widest
+
+
+def wrap_text(
+    text: str, font_name: str, font_size: float, max_width: float
+) -> list[str]:
+    """Wrap text to fit within a maximum width.
+
+    Args:
+        text: Text to wrap
+        font_name: Name of the font to use for measurement
+        font_size: Font size in points
+        max_width: Maximum width in points
+
+    Returns:
+        List of lines that fit within max_width
+    """
+    words, widths, space_width = measure_words(text, font_name)
+    lines, _ = wrap_measured(words, widths, space_width, font_size, max_width)
+    return lines if lines else [text]
+
+
+def compute_text_fit(
+    text: str, max_width: float, max_height: float, font_name: str = FIT_FONT
+) -> tuple[list[str], float]:
+    """Search for the largest font size at which text fits the box.
+
+    Args:
+        text: Text to fit
+        max_width: Maximum width in points
+        max_height: Maximum height in points
+        font_name: Font name to use
+
+    Returns:
+        Tuple of (wrapped lines, font size used)
+    """
+    words, widths, space_width = measure_words(text, font_name)
+
+    # Candidate sizes from largest to smallest. Fitting only gets easier as
+    # the size shrinks, so the largest size that fits is found by bisection.
+    steps = round((MAX_FONT_SIZE - MIN_FONT_SIZE) / FONT_SIZE_STEP)
+    sizes = [MAX_FONT_SIZE - i * FONT_SIZE_STEP for i in range(steps + 1)]
+
+    best = None
+    lo, hi = 0, len(sizes)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        font_size = sizes[mid]
+        lines, widest = wrap_measured(words, widths, space_width, font_size, max_width)
+        line_height = font_size * LINE_SPACING
+        total_height = len(lines) * line_height
+
+        # Check both height constraint AND that all lines fit within width
+        if total_height <= max_height and widest <= max_width:
+            best = (lines if lines else [text], font_size)
+            hi = mid
+        else:
+            lo = mid + 1
+
+    if best is not None:
+        return best
+
+    # If we can't fit even at minimum size, return with minimum
+    lines, _ = wrap_measured(words, widths, space_width, MIN_FONT_SIZE, max_width)
+    return (lines if lines else [text]), MIN_FONT_SIZE
+
+
+def phrase_fits(text: str, font_name: str = FIT_FONT) -> bool:
+    """Check whether a phrase fits a bingo square at any allowed font size.
+
+    Fitting only gets easier as the font shrinks, so a phrase fits at some
+    size exactly when it fits at MIN_FONT_SIZE, where compute_text_fit
+    falls back to overflowing lines. The font's metrics must be loaded
+    first, by load_fit_font or by registering the fonts.
+
+    Args:
+        text: Phrase to check
+        font_name: Font name to use
+
+    Returns:
+        Whether the phrase can be printed without overflowing its square
+    """
+    content_size = SQUARE_SIZE - (SQUARE_PADDING * 2)
+    words, widths, space_width = measure_words(text, font_name)
+    lines, widest = wrap_measured(
+        words, widths, space_width, MIN_FONT_SIZE, content_size
+    )
+    total_height = len(lines) * MIN_FONT_SIZE * LINE_SPACING
+    return total_height <= content_size and widest <= content_size
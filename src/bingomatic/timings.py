@@ -0,0 +1,129 @@
+"""Per-stage timing for Bingomatic runs.
+
+Code marks its stages with ``with stage("name"):``. While a StageTimings is
+recording, each stage's wall time and call count are added to it; the rest
+of the time stage() returns a shared no-op context manager, so marking a
+stage costs one global lookup.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+_NOT_RECORDING = nullcontext()
+
+
+class StageTimings:
+    """Wall time and call count of each stage of a run."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.total_seconds = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time one call of a stage.
+
+        Args:
+            name: Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = (
+                self.seconds.get(name, 0.0) + time.perf_counter() - start
+            )
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def as_dict(self, card_count: int) -> dict:
+        """Summarize the timings.
+
+        Args:
+            card_count: Number of cards the run produced
+
+        Returns:
+            JSON-serializable summary with every stage in first-seen order
+        """
+
+        def rate(seconds: float) -> float | None:
+            return card_count / seconds if seconds > 0 else None
+
+        return {
+            "cards": card_count,
+            "total_seconds": self.total_seconds,
+            "cards_per_second": rate(self.total_seconds),
+            "stages": [
+                {
+                    "name": name,
+                    "seconds": seconds,
+                    "calls": self.calls[name],
+                    "cards_per_second": rate(seconds),
+                }
+                for name, seconds in self.seconds.items()
+            ],
+        }
+
+    def format(self, card_count: int) -> str:
+        """Render the timings as a table.
+
+        Args:
+            card_count: Number of cards the run produced
+
+        Returns:
+            One line per stage followed by the total
+        """
+        summary = self.as_dict(card_count)
+        rows = [
+            (stage["name"], str(stage["calls"]), stage["seconds"])
+            for stage in summary["stages"]
+        ]
+        rows.append(("total", "", summary["total_seconds"]))
+
+        width = max(len("Stage"), *(len(name) for name, _, _ in rows))
+        lines = [f"{'Stage':<{width}}  {'Calls':>7}  {'Seconds':>9}  {'Cards/s':>9}"]
+        for name, calls, seconds in rows:
+            cards_per_second = f"{card_count / seconds:.0f}" if seconds > 0 else "-"
+            lines.append(
+                f"{name:<{width}}  {calls:>7}  {seconds:>9.4f}  {cards_per_second:>9}"
+            )
+        return "\n".join(lines)
+
+
+_recording: StageTimings | None = None
+
+
+def stage(name: str) -> AbstractContextManager:
+    """Mark a stage of the current run.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        A context manager timing the stage while timings are recorded
+    """
+    if _recording is None:
+        return _NOT_RECORDING
+    return _recording.stage(name)
+
+
+@contextmanager
+def recording(timings: StageTimings) -> Iterator[StageTimings]:
+    """Record every stage run inside the block into timings.
+
+    Args:
+        timings: Where to add the stage timings
+
+    Yields:
+        The timings being recorded
+    """
+    global _recording
+    previous = _recording
+    _recording = timings
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.total_seconds += time.perf_counter() - start
+        _recording = previous
@@ -0,0 +1,361 @@
+"""Winner verification for Bingomatic.
+
+Every card is reduced to a 25-bit mask of its covered squares, with bit
+``row * GRID_SIZE + col`` set for each covered grid position. A card wins
+when its mask contains one of the twelve winning line masks (five rows,
+five columns and both diagonals). Cards are held as a matrix of phrase
+indices so that checking a whole run is a handful of NumPy operations.
+
+Rebuilding that matrix is vectorized too. A seeded card is drawn by
+``random.Random(card_seed(seed, card_id)).sample(...)``, so the Mersenne
+Twister behind random.Random is replayed for thousands of cards at once,
+following CPython's seeding, output and sampling steps exactly. The rare
+card the replay can't reproduce, and every card of a unique run, which
+depends on the cards before it, is drawn with CardSampler instead. A few
+cards of every replayed chunk are also drawn with CardSampler; should an
+interpreter ever sample differently, the replay disagrees with them and
+the rest of the run is drawn card by card.
+"""
+
+import math
+from collections.abc import Iterable, Sequence
+from functools import cache
+
+import numpy as np
+
+from bingomatic.cards import (
+    CENTER_SQUARE_INDEX,
+    GRID_SIZE,
+    SQUARES_PER_CARD,
+    CardSampler,
+    card_seed,
+)
+from bingomatic.manifest import MAX_PHRASES
+
+# Grid positions of a card's squares, in the order they are drawn
+SQUARE_POSITIONS = [
+    pos for pos in range(GRID_SIZE * GRID_SIZE) if pos != CENTER_SQUARE_INDEX
+]
+FREE_SQUARE_MASK = 1 << CENTER_SQUARE_INDEX
+
+
+def _line_masks() -> list[int]:
+    """Return the masks of every row, column and diagonal of the grid."""
+    rows = [
+        sum(1 << (row * GRID_SIZE + col) for col in range(GRID_SIZE))
+        for row in range(GRID_SIZE)
+    ]
+    cols = [
+        sum(1 << (row * GRID_SIZE + col) for row in range(GRID_SIZE))
+        for col in range(GRID_SIZE)
+    ]
+    diagonals = [
+        sum(1 << (i * GRID_SIZE + i) for i in range(GRID_SIZE)),
+        sum(1 << (i * GRID_SIZE + GRID_SIZE - 1 - i) for i in range(GRID_SIZE)),
+    ]
+    return rows + cols + diagonals
+
+
+WINNING_LINES = np.array(_line_masks(), dtype=np.uint32)
+_POSITION_BITS = np.array([1 << pos for pos in SQUARE_POSITIONS], dtype=np.uint32)
+
+BULK_CHUNK_CARDS = 8192  # Cards whose generators are replayed together
+CHECKED_CARDS_PER_CHUNK = 4  # Replayed cards compared against CardSampler
+
+# Mersenne Twister parameters, as in CPython's _randommodule.c
+_MT_SIZE = 624
+_MT_SHIFT = 397
+_MT_OUTPUTS = _MT_SIZE - _MT_SHIFT  # Outputs of the first twist; plenty per card
+_MT_MATRIX_A = np.uint32(0x9908B0DF)
+_MT_KEY_WORDS = 4  # card_seed gives 128-bit seeds, seeded as four 32-bit words
+
+
+@cache
+def _mt_base_state() -> np.ndarray:
+    """Return the state init_genrand(19650218) leaves, where seeding starts."""
+    state = [19650218]
+    for i in range(1, _MT_SIZE):
+        prev = state[-1]
+        state.append((1812433253 * (prev ^ (prev >> 30)) + i) & 0xFFFFFFFF)
+    return np.array(state, dtype=np.uint32)
+
+
+def _mt_outputs(keys: np.ndarray) -> np.ndarray:
+    """Replay random.Random for many seeds at once.
+
+    Args:
+        keys: (4, n) uint32 array; column i holds the seed of generator i
+            as 32-bit words, least significant first
+
+    Returns:
+        (_MT_OUTPUTS, n) uint32 array of each generator's first outputs
+    """
+    mt = np.empty((_MT_SIZE, keys.shape[1]), dtype=np.uint32)
+    mt[:] = _mt_base_state()[:, None]
+
+    # init_by_array, one row of every generator's state per step. The steps
+    # are many and each depends on the last, so they work in place.
+    salted_keys = keys + np.arange(_MT_KEY_WORDS, dtype=np.uint32)[:, None]
+    mixed = np.empty(keys.shape[1], dtype=np.uint32)
+    i = 1
+    for j in range(_MT_SIZE):
+        np.right_shift(mt[i - 1], 30, out=mixed)
+        mixed ^= mt[i - 1]
+        mixed *= np.uint32(1664525)
+        mt[i] ^= mixed
+        mt[i] += salted_keys[j % _MT_KEY_WORDS]
+        i += 1
+        if i == _MT_SIZE:
+            mt[0] = mt[-1]
+            i = 1
+    for _ in range(_MT_SIZE - 1):
+        np.right_shift(mt[i - 1], 30, out=mixed)
+        mixed ^= mt[i - 1]
+        mixed *= np.uint32(1566083941)
+        mt[i] ^= mixed
+        mt[i] -= np.uint32(i)
+        i += 1
+        if i == _MT_SIZE:
+            mt[0] = mt[-1]
+            i = 1
+    mt[0] = 0x80000000
+
+    # The first words of the twist only read words not yet twisted
+    y = (mt[:_MT_OUTPUTS] & 0x80000000) | (mt[1 : _MT_OUTPUTS + 1] & 0x7FFFFFFF)
+    y = mt[_MT_SHIFT : _MT_SHIFT + _MT_OUTPUTS] ^ (y >> 1) ^ ((y & 1) * _MT_MATRIX_A)
+
+    # Tempering
+    y ^= y >> 11
+    y ^= (y << 7) & np.uint32(0x9D2C5680)
+    y ^= (y << 15) & np.uint32(0xEFC60000)
+    y ^= y >> 18
+    return y
+
+
+def _sample_positions(
+    outputs: np.ndarray, population: int, count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Replay Random.sample(range(population), count) for many generators.
+
+    Args:
+        outputs: Generator outputs, as from _mt_outputs
+        population: Number of positions to sample from
+        count: Number of positions per sample
+
+    Returns:
+        An (n, count) array of sampled positions, and a flag per generator
+        that ran out of outputs, whose sample is then meaningless
+    """
+    n = outputs.shape[1]
+    everyone = np.arange(n)
+    next_output = np.zeros(n, dtype=np.intp)
+    exhausted = np.zeros(n, dtype=bool)
+    samples = np.empty((n, count), dtype=np.intp)
+
+    def getrandbits(bits: int, rows: np.ndarray) -> np.ndarray:
+        positions = next_output[rows]
+        exhausted[rows[positions >= _MT_OUTPUTS]] = True
+        next_output[rows] += 1
+        words = outputs[np.minimum(positions, _MT_OUTPUTS - 1), rows]
+        return (words >> np.uint32(32 - bits)).astype(np.intp)
+
+    # Random.sample keeps a pool of unpicked positions for small populations
+    # and a set of picked ones otherwise
+    setsize = 21
+    if count > 5:
+        setsize += 4 ** math.ceil(math.log(count * 3, 4))
+
+    if population <= setsize:
+        pool = np.tile(np.arange(population), (n, 1))
+        for i in range(count):
+            limit = population - i
+            bits = limit.bit_length()
+            picks = getrandbits(bits, everyone)
+            rows = everyone[(picks >= limit) & ~exhausted]
+            while rows.size:
+                picks[rows] = getrandbits(bits, rows)
+                rows = rows[(picks[rows] >= limit) & ~exhausted[rows]]
+            picks = np.minimum(picks, limit - 1)
+            samples[:, i] = pool[everyone, picks]
+            pool[everyone, picks] = pool[:, limit - 1]
+    else:
+        bits = population.bit_length()
+        for i in range(count):
+            picks = getrandbits(bits, everyone)
+            rejected = (picks >= population) | (samples[:, :i] == picks[:, None]).any(1)
+            rows = everyone[rejected & ~exhausted]
+            while rows.size:
+                redrawn = getrandbits(bits, rows)
+                picks[rows] = redrawn
+                rejected = (redrawn >= population) | (
+                    samples[rows, :i] == redrawn[:, None]
+                ).any(1)
+                rows = rows[rejected & ~exhausted[rows]]
+            samples[:, i] = picks
+    return samples, exhausted
+
+
+def _seeded_cards(sampler: CardSampler, card_ids: Sequence[int]) -> np.ndarray:
+    """Draw the cards of a seeded run without uniqueness, all at once.
+
+    Args:
+        sampler: The run's sampler, for cards the replay can't reproduce
+        card_ids: IDs of the cards to draw
+
+    Returns:
+        A (len(card_ids), 24) array of phrase indices
+    """
+    digests = b"".join(
+        card_seed(sampler.seed, card_id).to_bytes(16, "big") for card_id in card_ids
+    )
+    words = np.frombuffer(digests, dtype=">u4").reshape(-1, _MT_KEY_WORDS)
+    keys = np.ascontiguousarray(words[:, ::-1].T, dtype=np.uint32)
+
+    cards, redraw = _sample_positions(
+        _mt_outputs(keys), len(sampler.bingo_squares), sampler.count
+    )
+    # A seed whose top word is zero is seeded with fewer words
+    redraw |= words[:, 0] == 0
+    for row in np.flatnonzero(redraw):
+        cards[row] = sampler.indices(card_ids[row])
+    return cards
+
+
+def _replay_agrees(
+    sampler: CardSampler, card_ids: Sequence[int], cards: np.ndarray
+) -> bool:
+    """Check a few replayed cards against the ones CardSampler draws.
+
+    Args:
+        sampler: The run's sampler
+        card_ids: IDs of the replayed cards
+        cards: The replayed cards, as from _seeded_cards
+
+    Returns:
+        Whether every checked card matches the sampler's
+    """
+    rows = np.linspace(0, len(card_ids) - 1, CHECKED_CARDS_PER_CHUNK, dtype=np.intp)
+    return all(
+        cards[row].tolist() == sampler.indices(card_ids[row]) for row in set(rows)
+    )
+
+
+def card_matrix(
+    bingo_squares: list[str],
+    card_count: int,
+    seed: int,
+    unique: str | None = None,
+    first_card_id: int = 1,
+) -> np.ndarray:
+    """Rebuild the cards of a seeded run as a matrix of phrase indices.
+
+    Args:
+        bingo_squares: The run's list of bingo square phrases
+        card_count: Number of cards in the run
+        seed: The run seed
+        unique: Optional uniqueness mode the run was generated with
+        first_card_id: ID of the first card in the matrix
+
+    Returns:
+        A (card_count, 24) uint16 array; row i holds the indices into
+        bingo_squares of card first_card_id + i, in grid order
+
+    Raises:
+        ValueError: If bingo_squares has too many phrases to index
+    """
+    if len(bingo_squares) > MAX_PHRASES:
+        raise ValueError(
+            f"Cannot index more than {MAX_PHRASES} phrases, got {len(bingo_squares)}"
+        )
+
+    sampler = CardSampler(bingo_squares, seed=seed, unique=unique)
+    cards = np.empty((card_count, SQUARES_PER_CARD), dtype=np.uint16)
+
+    drawn = 0
+    if unique is None and len(bingo_squares) >= SQUARES_PER_CARD:
+        for start in range(0, card_count, BULK_CHUNK_CARDS):
+            stop = min(start + BULK_CHUNK_CARDS, card_count)
+            card_ids = range(first_card_id + start, first_card_id + stop)
+            chunk = _seeded_cards(sampler, card_ids)
+            if not _replay_agrees(sampler, card_ids, chunk):
+                break
+            cards[start:stop] = chunk
+            drawn = stop
+
+    # In unique mode a card depends on every card before it
+    if unique is not None:
+        for card_id in range(1, first_card_id):
+            sampler.indices(card_id)
+    for row in range(drawn, card_count):
+        cards[row] = sampler.indices(first_card_id + row)
+    return cards
+
+
+def called_flags(bingo_squares: list[str], called: Iterable[str]) -> np.ndarray:
+    """Mark which entries of bingo_squares have been called.
+
+    A called phrase covers every entry with the same text, so duplicated
+    phrases in the pool are covered together.
+
+    Args:
+        bingo_squares: The run's list of bingo square phrases
+        called: Phrases that have been called
+
+    Returns:
+        Boolean array with one flag per entry of bingo_squares
+    """
+    called = set(called)
+    return np.fromiter(
+        (phrase in called for phrase in bingo_squares),
+        dtype=bool,
+        count=len(bingo_squares),
+    )
+
+
+def coverage_masks(cards: np.ndarray, called: np.ndarray) -> np.ndarray:
+    """Compute every card's mask of covered squares.
+
+    Args:
+        cards: (n, 24) matrix of phrase indices, as from card_matrix
+        called: Boolean flag per phrase, as from called_flags
+
+    Returns:
+        uint32 array of n masks, each including the free center square
+    """
+    hits = called[cards]
+    masks = (hits * _POSITION_BITS).sum(axis=1, dtype=np.uint32)
+    return masks | np.uint32(FREE_SQUARE_MASK)
+
+
+def winning_rows(masks: np.ndarray) -> np.ndarray:
+    """Find the cards whose mask contains a completed line.
+
+    Args:
+        masks: uint32 array of coverage masks
+
+    Returns:
+        Indices into masks of every winning card, in ascending order
+    """
+    complete = (masks[:, None] & WINNING_LINES) == WINNING_LINES
+    return np.flatnonzero(complete.any(axis=1))
+
+
+def find_winners(
+    cards: np.ndarray,
+    bingo_squares: list[str],
+    called: Iterable[str],
+    first_card_id: int = 1,
+) -> list[int]:
+    """Return the ID of every card with a completed row, column or diagonal.
+
+    Args:
+        cards: (n, 24) matrix of phrase indices, as from card_matrix
+        bingo_squares: The run's list of bingo square phrases
+        called: Phrases that have been called
+        first_card_id: ID of the card in the first row of cards
+
+    Returns:
+        Winning card IDs in ascending order
+    """
+    masks = coverage_masks(cards, called_flags(bingo_squares, called))
+    return (winning_rows(masks) + first_card_id).tolist()
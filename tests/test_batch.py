@@ -0,0 +1,335 @@
+"""Unit tests for the batch module."""
+
+import re
+
+import pytest
+from PIL import Image
+
+from bingomatic.batch import BatchError, find_configs, generate_config, run_batch
+from bingomatic.cards import card_squares
+from bingomatic.config import ConfigFileNotFoundError
+from bingomatic.manifest import load_manifest
+from bingomatic.runrecord import load_run_record, run_record_path
+
+
+def _write_config(path, tmp_path, card_count=2, logo="logo.png"):
+    """Write a small valid config to path."""
+    logo_path = tmp_path / logo
+    if not logo_path.exists() and logo == "logo.png":
+        Image.new("RGB", (100, 100), color="blue").save(logo_path)
+    squares = "\n".join(f'  - "Item {i}"' for i in range(30))
+    path.write_text(
+        f'event_name: "{path.stem}"\n'
+        f'logo_location: "{logo_path}"\n'
+        f'output_directory: "{tmp_path / "output"}"\n'
+        f"card_count: {card_count}\n"
+        f"bingo_squares:\n{squares}\n"
+    )
+    return path
+
+
+class TestFindConfigs:
+    """Tests for expanding config arguments."""
+
+    def test_directory_yields_sorted_yaml_files(self, tmp_path):
+        """A directory expands to its .yaml and .yml files by name."""
+        for name in ("b.yml", "a.yaml", "notes.txt"):
+            (tmp_path / name).write_text("")
+        (tmp_path / "sub.yaml").mkdir()
+
+        assert find_configs([tmp_path]) == [tmp_path / "a.yaml", tmp_path / "b.yml"]
+
+    def test_files_kept_in_order_without_repeats(self, tmp_path):
+        """Files keep their order and configs given twice are listed once."""
+        first = tmp_path / "z.yaml"
+        second = tmp_path / "a.yaml"
+        for path in (first, second):
+            path.write_text("")
+
+        assert find_configs([first, tmp_path, second]) == [first, second]
+
+
+class TestGenerateConfig:
+    """Tests for generating one config."""
+
+    def test_generates_pdf_and_manifest(self, tmp_path):
+        """A config produces a PDF and a manifest with the chosen name."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path)
+
+        generated = generate_config(config, "cards")
+
+        assert generated.output_path == tmp_path / "output" / "cards.pdf"
+        assert generated.manifest_path == tmp_path / "output" / "cards.cards"
+        assert generated.card_count == 2
+        assert generated.output_path.exists()
+        assert generated.manifest_path.exists()
+
+    def test_missing_logo_raises(self, tmp_path):
+        """A config pointing at a missing logo fails before rendering."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, logo="gone.png")
+
+        with pytest.raises(BatchError, match="Logo file not found"):
+            generate_config(config)
+
+    def test_over_size_limit_fails_before_rendering(self, tmp_path):
+        """A run estimated to be over max_size writes nothing."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=40)
+
+        with pytest.raises(BatchError, match="would be about .* over the 10.0 kB"):
+            generate_config(config, "cards", max_size=10_000)
+
+        assert not (tmp_path / "output" / "cards.pdf").exists()
+
+    def test_split_writes_parts_within_limit(self, tmp_path):
+        """With split, a PDF over max_size is also written in parts."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=400)
+        full = generate_config(config, "full", optimize=True)
+        max_size = full.output_path.stat().st_size * 2 // 3
+
+        generated = generate_config(
+            config, "cards", optimize=True, max_size=max_size, split=True
+        )
+
+        assert len(generated.parts) >= 2
+        assert all(part.stat().st_size <= max_size for part in generated.parts)
+        assert sum(_page_count(part) for part in generated.parts) == 200
+
+    def test_parts_of_earlier_split_are_removed(self, tmp_path):
+        """A run that fits its limit leaves no stale parts behind."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=40)
+        stale = tmp_path / "output" / "cards-part1.pdf"
+        stale.parent.mkdir()
+        stale.write_bytes(b"old")
+
+        generated = generate_config(config, "cards", max_size=10**9)
+
+        assert generated.parts == ()
+        assert not stale.exists()
+
+    def test_exports_images_to_directory_or_zip(self, tmp_path):
+        """Image formats write one file per card and no run record."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=3)
+
+        generated = generate_config(config, "cards", card_format="svg", seed=4)
+        zipped = generate_config(
+            config, "cards", card_format="png", dpi=36, zip_output=True
+        )
+
+        assert generated.output_path == tmp_path / "output" / "cards"
+        assert generated.manifest_path == tmp_path / "output" / "cards-svg.cards"
+        assert len(list(generated.output_path.glob("card-*.svg"))) == 3
+        assert load_manifest(generated.manifest_path).card_count == 3
+        assert zipped.output_path == tmp_path / "output" / "cards.zip"
+        assert zipped.output_path.exists()
+        assert not run_record_path(tmp_path / "output" / "cards.pdf").exists()
+
+    def test_image_export_keeps_pdf_manifest(self, tmp_path):
+        """An export next to a PDF leaves the PDF's manifest and run alone."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=3)
+        pdf = generate_config(config, "cards")
+        pdf_cards = load_manifest(pdf.manifest_path).cards.copy()
+
+        generate_config(config, "cards", card_format="svg")
+        _set_card_count(config, 5)
+        extended = generate_config(config, "cards")
+
+        cards = load_manifest(extended.manifest_path)
+        assert extended.rendered_count == 3
+        assert (cards.cards[:2] == pdf_cards[:2]).all()
+
+    @pytest.mark.parametrize("card_format", ["pdf", "svg"])
+    def test_run_without_manifest_removes_stale_one(self, tmp_path, card_format):
+        """A manifest of an earlier run doesn't outlive its cards."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path)
+        first = generate_config(config, "cards", card_format=card_format)
+
+        again = generate_config(
+            config, "cards", card_format=card_format, manifest=False
+        )
+
+        assert again.manifest_path is None
+        assert not first.manifest_path.exists()
+
+    def test_image_export_rejects_size_limit(self, tmp_path):
+        """A size limit only makes sense for a PDF."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path)
+
+        with pytest.raises(BatchError, match="only applies to PDF"):
+            generate_config(config, "cards", card_format="png", max_size=10**6)
+
+    def test_roster_sets_cards_and_ids(self, tmp_path):
+        """A roster gives one card per row, numbered by row when resumed."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name\n" + "\n".join(f"P{i}" for i in range(7)) + "\n")
+
+        generated = generate_config(
+            config, "cards", seed=3, roster_path=roster, roster_start=4
+        )
+
+        manifest = load_manifest(generated.manifest_path)
+        assert generated.card_count == 3
+        assert manifest.first_card_id == 5
+        assert manifest.squares(6) == card_squares(
+            [f"Item {i}" for i in range(30)], 3, 6
+        )
+        assert not run_record_path(generated.output_path).exists()
+
+    def test_roster_start_past_end_raises(self, tmp_path):
+        """Resuming after the last row leaves nothing to print."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path)
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name\nAda\nGrace\n")
+
+        with pytest.raises(BatchError, match="has 2 rows, none after row 2"):
+            generate_config(config, roster_path=roster, roster_start=2)
+
+    def test_missing_config_raises(self, tmp_path):
+        """A missing config file raises the usual config error."""
+        with pytest.raises(ConfigFileNotFoundError):
+            generate_config(tmp_path / "missing.yaml")
+
+
+def _page_count(path) -> int:
+    content = path.read_bytes()
+    return content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+
+
+def _set_card_count(config, card_count):
+    text = config.read_text()
+    config.write_text(re.sub(r"card_count: \d+", f"card_count: {card_count}", text))
+
+
+class TestIncrementalGeneration:
+    """Tests for extending an earlier run instead of re-rendering it."""
+
+    def test_identical_run_is_a_no_op(self, tmp_path):
+        """Running the same config again renders nothing."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=4)
+        first = generate_config(config, "cards")
+        modified = first.output_path.stat().st_mtime_ns
+
+        again = generate_config(config, "cards")
+
+        assert first.rendered_count == 4
+        assert again.rendered_count == 0
+        assert first.output_path.stat().st_mtime_ns == modified
+
+    @pytest.mark.parametrize("unique", [None, "set"])
+    @pytest.mark.parametrize("previous_count", [4, 5])
+    def test_larger_card_count_matches_full_run(self, tmp_path, unique, previous_count):
+        """Extending a run gives the cards of rendering it all at once."""
+        config = _write_config(
+            tmp_path / "event.yaml", tmp_path, card_count=previous_count
+        )
+        generate_config(config, "cards", unique=unique, seed=3)
+        _set_card_count(config, 9)
+
+        extended = generate_config(config, "cards", unique=unique, seed=3)
+        full = generate_config(config, "full", unique=unique, seed=3)
+
+        # A half-filled last page is rendered again with the new cards
+        assert extended.rendered_count == 9 - previous_count // 2 * 2
+        assert _page_count(extended.output_path) == _page_count(full.output_path)
+        extended_cards = load_manifest(extended.manifest_path)
+        full_cards = load_manifest(full.manifest_path)
+        assert extended_cards.card_count == 9
+        assert (extended_cards.cards == full_cards.cards).all()
+
+    def test_unseeded_run_is_extended_with_its_own_seed(self, tmp_path):
+        """A run without a seed records one and reuses it when extended."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        first = generate_config(config, "cards")
+        first_card = load_manifest(first.manifest_path).squares(1)
+        seed = load_run_record(run_record_path(first.output_path)).seed
+        _set_card_count(config, 6)
+
+        extended = generate_config(config, "cards")
+
+        assert extended.rendered_count == 4
+        cards = load_manifest(extended.manifest_path)
+        assert cards.squares(1) == first_card
+        assert cards.squares(6) == card_squares(
+            [f"Item {i}" for i in range(30)], seed, 6
+        )
+
+    def test_changed_settings_render_everything(self, tmp_path):
+        """A different seed, phrase list or --force re-renders every card."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        generate_config(config, "cards", seed=1)
+        _set_card_count(config, 4)
+
+        assert generate_config(config, "cards", seed=2).rendered_count == 4
+        assert generate_config(config, "cards", seed=2, force=True).rendered_count == 4
+        assert generate_config(config, "cards", seed=2).rendered_count == 0
+
+    def test_optimize_renders_everything(self, tmp_path):
+        """Turning on optimize re-renders a run that is otherwise up to date."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        plain = generate_config(config, "cards", seed=1)
+        plain_size = plain.output_path.stat().st_size
+
+        optimized = generate_config(config, "cards", seed=1, optimize=True)
+
+        assert optimized.rendered_count == 2
+        assert optimized.output_path.stat().st_size < plain_size
+        assert (
+            generate_config(config, "cards", seed=1, optimize=True).rendered_count == 0
+        )
+
+    def test_missing_pdf_renders_everything(self, tmp_path):
+        """A record without its PDF is not trusted."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        first = generate_config(config, "cards")
+        first.output_path.unlink()
+
+        assert generate_config(config, "cards").rendered_count == 2
+
+    def test_failed_run_drops_record(self, tmp_path, monkeypatch):
+        """A run that fails half way can't be mistaken for a finished one."""
+        config = _write_config(tmp_path / "event.yaml", tmp_path, card_count=2)
+        first = generate_config(config, "cards", seed=1)
+        record_path = run_record_path(first.output_path)
+        _set_card_count(config, 4)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr("bingomatic.batch.generate_pdf", fail)
+        with pytest.raises(BatchError, match="disk full"):
+            generate_config(config, "cards", seed=1)
+
+        assert not record_path.exists()
+
+
+class TestRunBatch:
+    """Tests for running a batch of configs."""
+
+    def test_results_in_order_with_failures(self, tmp_path):
+        """Each config gets a result, failures included, in the order given."""
+        good = _write_config(tmp_path / "good.yaml", tmp_path)
+        bad = tmp_path / "bad.yaml"
+        bad.write_text("card_count: 2\n")
+
+        results = list(run_batch([good, bad], manifest=False))
+
+        assert [result.config_path for result in results] == [good, bad]
+        assert results[0].error is None
+        assert results[0].generated.output_path.name.startswith("bingo-cards-good-")
+        assert results[1].generated is None
+        assert "event_name" in results[1].error
+
+    def test_parallel_matches_serial_card_counts(self, tmp_path):
+        """Running configs in a process pool gives the same outcomes."""
+        configs = [
+            _write_config(tmp_path / f"event{i}.yaml", tmp_path, card_count=i + 1)
+            for i in range(3)
+        ]
+
+        results = list(run_batch(configs, jobs=2, manifest=False))
+
+        assert [result.generated.card_count for result in results] == [1, 2, 3]
+
+    def test_empty_batch(self):
+        """An empty batch yields nothing."""
+        assert list(run_batch([])) == []
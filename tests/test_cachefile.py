@@ -0,0 +1,62 @@
+"""Unit tests for the cachefile module."""
+
+import pytest
+
+from bingomatic.cachefile import atomic_write, read_cache, write_cache
+
+
+class TestAtomicWrite:
+    """Tests for replacing a file in one step."""
+
+    def test_creates_directory_and_replaces_file(self, tmp_path):
+        """The file gets exactly the new contents, and no temporary is left."""
+        path = tmp_path / "nested" / "file.bin"
+        atomic_write(path, b"old contents")
+        atomic_write(path, b"new")
+
+        assert path.read_bytes() == b"new"
+        assert [entry.name for entry in path.parent.iterdir()] == ["file.bin"]
+
+    def test_failed_write_leaves_old_file(self, tmp_path, monkeypatch):
+        """A write that fails midway keeps the previous file intact."""
+        path = tmp_path / "file.bin"
+        atomic_write(path, b"old")
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("bingomatic.cachefile.os.replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            atomic_write(path, b"new")
+
+        assert path.read_bytes() == b"old"
+        assert [entry.name for entry in tmp_path.iterdir()] == ["file.bin"]
+
+
+class TestReadCache:
+    """Tests for storing and reading versioned data."""
+
+    @pytest.mark.parametrize("pickled", [False, True])
+    def test_round_trips_data(self, tmp_path, pickled):
+        """Data reads back as written, as JSON or pickled."""
+        path = tmp_path / "cache"
+        data = {"phrases": ["Ünïcode", "text"]}
+        write_cache(path, 3, data, pickled=pickled)
+
+        assert read_cache(path, 3, pickled=pickled) == data
+
+    def test_other_version_reads_as_missing(self, tmp_path):
+        """Data written in another format version is ignored."""
+        path = tmp_path / "cache.json"
+        write_cache(path, 1, [1, 2])
+
+        assert read_cache(path, 2) is None
+
+    @pytest.mark.parametrize("pickled", [False, True])
+    def test_missing_or_damaged_file_reads_as_missing(self, tmp_path, pickled):
+        """Unreadable files read as None rather than raising."""
+        path = tmp_path / "cache"
+        assert read_cache(path, 1, pickled=pickled) is None
+
+        path.write_bytes(b"\x80 not json or a pickle")
+        assert read_cache(path, 1, pickled=pickled) is None
@@ -0,0 +1,174 @@
+"""Unit tests for the cards module."""
+
+import pytest
+
+from bingomatic.cards import (
+    CardCapacityError,
+    CardSampler,
+    FingerprintSet,
+    card_fingerprint,
+    card_seed,
+    card_squares,
+    check_unique_capacity,
+    select_random_squares,
+    start_sampler,
+    unique_card_capacity,
+)
+
+
+class TestCardSeed:
+    """Tests for per-card seed derivation."""
+
+    def test_is_deterministic(self):
+        """The same run seed and card ID always give the same card seed."""
+        assert card_seed(42, 7341) == card_seed(42, 7341)
+
+    def test_differs_between_cards(self):
+        """Neighbouring cards get unrelated seeds."""
+        seeds = {card_seed(42, card_id) for card_id in range(1, 1001)}
+        assert len(seeds) == 1000
+
+    def test_differs_between_runs(self):
+        """The same card ID in different runs gets a different seed."""
+        assert card_seed(1, 5) != card_seed(2, 5)
+
+
+class TestCardSquares:
+    """Tests for seeded card contents."""
+
+    def test_card_is_reproducible_in_isolation(self):
+        """A card's squares don't depend on the cards generated before it."""
+        squares = [f"Item {i}" for i in range(40)]
+        in_sequence = [card_squares(squares, 99, card_id) for card_id in range(1, 6)]
+        assert card_squares(squares, 99, 4) == in_sequence[3]
+
+    def test_returns_24_unique_items(self):
+        """A seeded card has 24 distinct squares from the pool."""
+        squares = [f"Item {i}" for i in range(40)]
+        result = card_squares(squares, 99, 1)
+        assert len(set(result)) == 24
+        assert set(result) <= set(squares)
+
+    def test_matches_select_random_squares_contract(self):
+        """Seeded selection respects a custom count."""
+        squares = [f"Item {i}" for i in range(40)]
+        assert len(card_squares(squares, 99, 1, count=10)) == 10
+        assert len(select_random_squares(squares, count=10)) == 10
+
+
+class TestUniqueCapacity:
+    """Tests for unique-card capacity checks."""
+
+    def test_minimum_pool_has_one_unique_set(self):
+        """With exactly 24 phrases every card has the same set."""
+        squares = [f"Item {i}" for i in range(24)]
+        assert unique_card_capacity(squares, "set") == 1
+
+    def test_layout_capacity_counts_orderings(self):
+        """Layout mode counts every ordering as a different card."""
+        squares = [f"Item {i}" for i in range(25)]
+        assert unique_card_capacity(squares, "layout") > unique_card_capacity(
+            squares, "set"
+        )
+
+    def test_duplicate_phrases_do_not_add_capacity(self):
+        """Repeated phrases in the pool are only counted once."""
+        squares = [f"Item {i}" for i in range(24)] + ["Item 0"]
+        assert unique_card_capacity(squares, "set") == 1
+
+    def test_check_fails_up_front(self):
+        """Asking for more unique cards than exist raises immediately."""
+        squares = [f"Item {i}" for i in range(25)]
+        with pytest.raises(CardCapacityError) as exc_info:
+            check_unique_capacity(squares, 26, "set")
+        assert "at most 25" in str(exc_info.value)
+
+
+class TestFingerprintSet:
+    """Tests for the compact fingerprint set."""
+
+    def test_add_reports_new_fingerprints(self):
+        """add returns True only the first time a fingerprint is seen."""
+        seen = FingerprintSet()
+        assert seen.add(12345)
+        assert not seen.add(12345)
+        assert 12345 in seen
+        assert len(seen) == 1
+
+    def test_grows_past_initial_capacity(self):
+        """The table grows and keeps every fingerprint."""
+        seen = FingerprintSet(capacity=4)
+        fingerprints = [card_fingerprint([str(i)], "layout") for i in range(5000)]
+        for fingerprint in fingerprints:
+            seen.add(fingerprint)
+        assert len(seen) == 5000
+        assert all(fingerprint in seen for fingerprint in fingerprints)
+
+    def test_set_fingerprint_ignores_order(self):
+        """Set mode treats reordered cards as the same card."""
+        assert card_fingerprint(["a", "b"], "set") == card_fingerprint(
+            ["b", "a"], "set"
+        )
+        assert card_fingerprint(["a", "b"], "layout") != card_fingerprint(
+            ["b", "a"], "layout"
+        )
+
+
+class TestCardSampler:
+    """Tests for choosing each card's squares."""
+
+    def test_unique_set_mode_exhausts_small_pool(self):
+        """Every possible set is produced exactly once when asked for all."""
+        squares = [f"Item {i}" for i in range(25)]
+        sampler = CardSampler(squares, seed=7, unique="set")
+        cards = {frozenset(sampler.squares(card_id)) for card_id in range(1, 26)}
+        assert len(cards) == 25
+
+    def test_unique_layout_mode_with_minimum_pool(self):
+        """Layout mode can still produce distinct cards from 24 phrases."""
+        squares = [f"Item {i}" for i in range(24)]
+        sampler = CardSampler(squares, unique="layout")
+        cards = {tuple(sampler.squares(card_id)) for card_id in range(1, 201)}
+        assert len(cards) == 200
+
+    def test_seeded_unique_run_is_reproducible(self):
+        """Replaying a seeded unique run yields the same cards."""
+        squares = [f"Item {i}" for i in range(26)]
+        first = CardSampler(squares, seed=3, unique="set")
+        second = CardSampler(squares, seed=3, unique="set")
+        assert [first.squares(i) for i in range(1, 50)] == [
+            second.squares(i) for i in range(1, 50)
+        ]
+
+    def test_seeded_sampler_matches_card_squares(self):
+        """Without uniqueness, a seeded sampler is random-access."""
+        squares = [f"Item {i}" for i in range(40)]
+        sampler = CardSampler(squares, seed=11)
+        assert sampler.squares(9) == card_squares(squares, 11, 9)
+
+    def test_indices_point_at_the_card_squares(self):
+        """indices() gives the positions in the pool of the card's squares."""
+        squares = [f"Item {i}" for i in range(40)]
+        indices = CardSampler(squares, seed=11).indices(9)
+        assert [squares[i] for i in indices] == card_squares(squares, 11, 9)
+
+
+class TestStartSampler:
+    """Tests for positioning a sampler part way through a run."""
+
+    def test_seeded_unique_slice_matches_full_run(self):
+        """Cards from first_card_id on avoid the cards replayed before them."""
+        squares = [f"Item {i}" for i in range(26)]
+        full = CardSampler(squares, seed=3, unique="set")
+        expected = [full.squares(card_id) for card_id in range(1, 31)][20:]
+
+        sampler = start_sampler(squares, 10, 21, seed=3, unique="set")
+
+        assert [sampler.squares(card_id) for card_id in range(21, 31)] == expected
+
+    def test_capacity_counts_replayed_cards(self):
+        """A slice fails if the pool can't cover the cards before it too."""
+        squares = [f"Item {i}" for i in range(25)]
+        start_sampler(squares, 5, 21, seed=3, unique="set")
+        with pytest.raises(CardCapacityError):
+            start_sampler(squares, 5, 22, seed=3, unique="set")
@@ -1,10 +1,42 @@
 """Integration tests for the CLI module."""
 
+import json
+import subprocess
+import sys
+
 import pytest
+import yaml
 from click.testing import CliRunner
 
 from bingomatic.cli import main
 
+# Light commands must not load these; they are only needed to render
+HEAVY_MODULES = ("reportlab", "PIL", "numpy")
+
+# Cumulative import time allowed for bingomatic.cli, in microseconds
+CLI_IMPORT_BUDGET_US = 150_000
+
+# Runs a CLI command, then reports which heavy modules it loaded
+LOADED_MODULES_SCRIPT = """
+import sys
+from bingomatic.cli import main
+try:
+    main(sys.argv[1:])
+finally:
+    print(",".join(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+
+def _loaded_top_level_modules(args, env=None) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", LOADED_MODULES_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    return set(result.stdout.strip().splitlines()[-1].split(","))
+
 
 @pytest.fixture
 def runner():
@@ -39,6 +71,32 @@ card_count: 2
     return config_file
 
 
+@pytest.fixture
+def full_config(tmp_path, monkeypatch):
+    """Create a complete, valid config file and point the CLI at it."""
+    from PIL import Image
+
+    logo = tmp_path / "logo.png"
+    Image.new("RGB", (100, 100), color="blue").save(logo)
+
+    bingo_items = "\n".join([f'  - "Item {i}"' for i in range(30)])
+    config_content = f"""
+event_name: "Test Event"
+logo_location: "{logo}"
+output_directory: "{tmp_path / "output"}"
+card_count: 5
+bingo_squares:
+{bingo_items}
+"""
+    config_dir = tmp_path / ".bingomatic"
+    config_dir.mkdir()
+    config_file = config_dir / "config.yaml"
+    config_file.write_text(config_content)
+
+    monkeypatch.setattr("bingomatic.config.get_config_path", lambda: config_file)
+    return config_file
+
+
 class TestValidateCommand:
     """Tests for the validate command."""
 
@@ -48,6 +106,38 @@ class TestValidateCommand:
         assert result.exit_code == 0
         assert "Validate the configuration file" in result.output
 
+    def test_validate_reports_unfittable_phrases(self, runner, full_config):
+        """validate fails on phrases too long for a square."""
+        full_config.write_text(
+            full_config.read_text().replace(
+                '"Item 0"', '"Pneumonoultramicroscopicsilicovolcanoconiosis"'
+            )
+        )
+
+        result = runner.invoke(main, ["validate"])
+
+        assert result.exit_code == 1
+        assert "1 phrases don't fit a square" in result.output
+        assert "Pneumonoultramicroscopicsilicovolcanoconiosis" in result.output
+
+    def test_validate_warns_about_duplicates(self, runner, full_config):
+        """validate passes a pool with repeats but lists them."""
+        full_config.write_text(full_config.read_text().replace('"Item 1"', '"Item 2"'))
+
+        result = runner.invoke(main, ["validate"])
+
+        assert result.exit_code == 0
+        assert "1 phrases appear more than once" in result.output
+        assert "'Item 2' (2 times)" in result.output
+        assert "Configuration valid." in result.output
+
+    def test_validate_caches_valid_config(self, runner, full_config):
+        """A valid config is kept in the cache beside config.yaml."""
+        result = runner.invoke(main, ["validate"])
+
+        assert result.exit_code == 0
+        assert len(list((full_config.parent / "config-cache").iterdir())) == 1
+
 
 class TestGenerateCommand:
     """Tests for the generate command."""
@@ -93,6 +183,369 @@ bingo_squares:
         assert result.exit_code == 1
         assert "Logo file not found" in result.output
 
+    def test_generate_with_workers(self, runner, full_config, tmp_path):
+        """generate --workers renders the run across several processes."""
+        result = runner.invoke(main, ["generate", "--workers", "2"])
+
+        assert result.exit_code == 0
+        assert "Generated 5 bingo cards" in result.output
+        assert len(list((tmp_path / "output").glob("bingo-cards-*.pdf"))) == 1
+
+    def test_generate_on_tabloid(self, runner, full_config, tmp_path):
+        """generate --page-size tabloid puts four cards on each page."""
+        result = runner.invoke(main, ["generate", "--page-size", "tabloid"])
+
+        assert result.exit_code == 0
+        content = next((tmp_path / "output").glob("*.pdf")).read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 2
+
+    def test_generate_card_too_large(self, runner, full_config):
+        """generate reports a card scale that doesn't fit the page."""
+        result = runner.invoke(main, ["generate", "--card-scale", "3"])
+
+        assert result.exit_code == 1
+        assert "does not fit" in result.output
+
+    def test_generate_optimize_reports_sizes(self, runner, full_config):
+        """generate --optimize prints the PDF's size breakdown."""
+        result = runner.invoke(main, ["generate", "--optimize"])
+
+        assert result.exit_code == 0
+        assert "PDF size: " in result.output
+        assert "font Roboto-Regular (subset" in result.output
+
+    def test_generate_over_max_size(self, runner, full_config):
+        """generate --max-size fails when the PDF can't fit."""
+        result = runner.invoke(main, ["generate", "--max-size", "1KB"])
+
+        assert result.exit_code == 1
+        assert "over the 1.0 kB limit" in result.output
+
+    def test_generate_rejects_bad_sizes(self, runner, full_config):
+        """--max-size needs a size and --split needs --max-size."""
+        bad_size = runner.invoke(main, ["generate", "--max-size", "lots"])
+        split_only = runner.invoke(main, ["generate", "--split"])
+
+        assert bad_size.exit_code == 2
+        assert "Invalid size" in bad_size.output
+        assert split_only.exit_code == 1
+        assert "--split needs --max-size" in split_only.output
+
+    def test_generate_png_cards(self, runner, full_config, tmp_path):
+        """generate --format png writes one image per card."""
+        result = runner.invoke(main, ["generate", "--format", "png", "--dpi", "36"])
+
+        assert result.exit_code == 0
+        assert "Generated 5 bingo cards" in result.output
+        (output_dir,) = [
+            path for path in (tmp_path / "output").iterdir() if path.is_dir()
+        ]
+        assert len(list(output_dir.glob("card-*.png"))) == 5
+
+    def test_generate_rejects_pdf_options_for_images(self, runner, full_config):
+        """--zip needs an image format, which --optimize can't be used with."""
+        zip_pdf = runner.invoke(main, ["generate", "--zip"])
+        optimize_svg = runner.invoke(
+            main, ["generate", "--format", "svg", "--optimize"]
+        )
+
+        assert zip_pdf.exit_code == 1
+        assert "--zip needs --format png or svg" in zip_pdf.output
+        assert optimize_svg.exit_code == 1
+        assert "only apply to PDF output" in optimize_svg.output
+
+    def test_generate_with_roster(self, runner, full_config, tmp_path):
+        """generate --roster prints one card per attendee."""
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name,badge_id\nAda,1\nGrace,2\nAlan,3\n")
+
+        result = runner.invoke(
+            main, ["generate", "--roster", str(roster), "--roster-start", "1"]
+        )
+        no_roster = runner.invoke(main, ["generate", "--roster-start", "1"])
+
+        assert result.exit_code == 0
+        assert "Generated 2 bingo cards" in result.output
+        assert no_roster.exit_code == 1
+        assert "--roster-start needs --roster" in no_roster.output
+
+    def test_generate_unique_fails_up_front_for_small_pool(self, runner, full_config):
+        """generate --unique reports an unsatisfiable card count before rendering."""
+        full_config.write_text(
+            full_config.read_text().replace("card_count: 5", "card_count: 600000")
+        )
+
+        result = runner.invoke(main, ["generate", "--unique", "set"])
+
+        assert result.exit_code == 1
+        assert "Cannot generate 600000 unique cards" in result.output
+
+    def test_generate_writes_manifest(self, runner, full_config, tmp_path):
+        """generate records the cards in a manifest next to the PDF."""
+        result = runner.invoke(main, ["generate"])
+
+        assert result.exit_code == 0
+        assert "Card manifest:" in result.output
+        assert len(list((tmp_path / "output").glob("bingo-cards-*.cards"))) == 1
+
+    def test_generate_without_manifest(self, runner, full_config, tmp_path):
+        """--no-manifest skips the manifest."""
+        result = runner.invoke(main, ["generate", "--no-manifest"])
+
+        assert result.exit_code == 0
+        assert list((tmp_path / "output").glob("*.cards")) == []
+
+    def test_generate_with_timings(self, runner, full_config):
+        """--timings prints a table of stages."""
+        result = runner.invoke(main, ["generate", "--timings"])
+
+        assert result.exit_code == 0
+        assert "load_config" in result.output
+        assert "draw_squares" in result.output
+        assert "total" in result.output
+
+    def test_generate_with_timings_json(self, runner, full_config, tmp_path):
+        """--timings-json writes the stage timings as JSON."""
+        import json
+
+        timings_path = tmp_path / "timings.json"
+        result = runner.invoke(main, ["generate", "--timings-json", str(timings_path)])
+
+        assert result.exit_code == 0
+        summary = json.loads(timings_path.read_text())
+        assert summary["cards"] == 5
+        stages = {stage["name"]: stage for stage in summary["stages"]}
+        assert stages["draw_squares"]["calls"] == 5
+
+    def test_generate_with_profile(self, runner, full_config, tmp_path):
+        """--profile writes cProfile stats that pstats can read."""
+        import pstats
+
+        profile_path = tmp_path / "run.pstats"
+        result = runner.invoke(main, ["generate", "--profile", str(profile_path)])
+
+        assert result.exit_code == 0
+        assert "Profile written to" in result.output
+        assert pstats.Stats(str(profile_path)).total_calls > 0
+
+    def test_generate_again_renders_only_new_cards(self, runner, full_config):
+        """A repeated run is a no-op, and a larger card_count adds cards."""
+        runner.invoke(main, ["generate"])
+
+        result = runner.invoke(main, ["generate"])
+        assert result.exit_code == 0
+        assert "Bingo cards up to date (5 cards)" in result.output
+
+        full_config.write_text(
+            full_config.read_text().replace("card_count: 5", "card_count: 8")
+        )
+        result = runner.invoke(main, ["generate"])
+        assert result.exit_code == 0
+        assert "Rendered 4 new bingo cards (8 total)" in result.output
+
+        result = runner.invoke(main, ["generate", "--force"])
+        assert "Generated 8 bingo cards" in result.output
+
+    def test_generate_with_seed_reports_seed(self, runner, full_config):
+        """generate --seed echoes the seed needed to regenerate cards."""
+        result = runner.invoke(main, ["generate", "--seed", "42"])
+
+        assert result.exit_code == 0
+        assert "Seed: 42" in result.output
+
+
+class TestGenerateBatch:
+    """Tests for generating several configs in one run."""
+
+    @pytest.fixture
+    def events_dir(self, full_config, tmp_path):
+        """A directory holding two copies of the full config."""
+        events = tmp_path / "events"
+        events.mkdir()
+        for name in ("berlin", "paris"):
+            (events / f"{name}.yaml").write_text(full_config.read_text())
+        return events
+
+    def test_generate_directory_of_configs(self, runner, events_dir, tmp_path):
+        """Every config in a directory is generated, each to its own PDF."""
+        result = runner.invoke(main, ["generate", str(events_dir)])
+
+        assert result.exit_code == 0
+        assert "Generated 2 of 2 configs (10 cards), 0 failed." in result.output
+        pdfs = sorted(path.name for path in (tmp_path / "output").glob("*.pdf"))
+        assert [name.rsplit("-", 3)[0] for name in pdfs] == [
+            "bingo-cards-berlin",
+            "bingo-cards-paris",
+        ]
+
+    def test_generate_batch_reports_failures(self, runner, events_dir):
+        """A broken config is reported without stopping the others."""
+        broken = events_dir / "broken.yaml"
+        broken.write_text("event_name: [unclosed")
+
+        result = runner.invoke(main, ["generate", str(events_dir)])
+
+        assert result.exit_code == 1
+        assert f"FAILED {broken}" in result.output
+        assert "Generated 2 of 3 configs (10 cards), 1 failed." in result.output
+
+    def test_generate_batch_in_parallel(self, runner, events_dir):
+        """--jobs generates configs in several processes."""
+        result = runner.invoke(main, ["generate", "--jobs", "2", str(events_dir)])
+
+        assert result.exit_code == 0
+        assert "Generated 2 of 2 configs" in result.output
+
+    def test_generate_batch_rejects_jobs_with_workers(self, runner, events_dir):
+        """--jobs and --workers can't both run processes."""
+        result = runner.invoke(
+            main, ["generate", "--jobs", "2", "--workers", "2", str(events_dir)]
+        )
+
+        assert result.exit_code == 1
+        assert "Use either --jobs or --workers" in result.output
+
+    def test_generate_empty_directory(self, runner, tmp_path):
+        """A directory without configs is an error."""
+        result = runner.invoke(main, ["generate", str(tmp_path)])
+
+        assert result.exit_code == 1
+        assert "No config files found." in result.output
+
+
+class TestCardCommand:
+    """Tests for the card command."""
+
+    def test_card_shows_help(self, runner):
+        """card --help shows usage."""
+        result = runner.invoke(main, ["card", "--help"])
+        assert result.exit_code == 0
+        assert "Regenerate a single card" in result.output
+
+    def test_card_requires_seed(self, runner, full_config):
+        """card refuses to run without the original seed."""
+        result = runner.invoke(main, ["card", "--id", "3"])
+        assert result.exit_code != 0
+        assert "--seed" in result.output
+
+    def test_card_renders_single_card(self, runner, full_config, tmp_path):
+        """card writes a one-card PDF named after the seed and ID."""
+        result = runner.invoke(main, ["card", "--id", "3", "--seed", "42"])
+
+        assert result.exit_code == 0
+        assert "Generated card #3" in result.output
+        assert (tmp_path / "output" / "bingo-card-42-3.pdf").exists()
+
+    def test_card_from_manifest(self, runner, full_config, tmp_path):
+        """card reprints a card recorded in a run's manifest."""
+        runner.invoke(main, ["generate"])
+        manifest = next((tmp_path / "output").glob("*.cards"))
+
+        result = runner.invoke(main, ["card", "--id", "2", "--manifest", str(manifest)])
+
+        assert result.exit_code == 0
+        assert (tmp_path / "output" / f"bingo-card-{manifest.stem}-2.pdf").exists()
+
+    def test_card_not_in_manifest(self, runner, full_config, tmp_path):
+        """card reports IDs the manifest doesn't cover."""
+        runner.invoke(main, ["generate"])
+        manifest = next((tmp_path / "output").glob("*.cards"))
+
+        result = runner.invoke(
+            main, ["card", "--id", "99", "--manifest", str(manifest)]
+        )
+
+        assert result.exit_code == 1
+        assert "Card #99 is not in this manifest" in result.output
+
+
+class TestVerifyCommand:
+    """Tests for the verify command."""
+
+    def test_verify_no_calls(self, runner, full_config):
+        """verify reports no winners before anything is called."""
+        result = runner.invoke(main, ["verify", "--seed", "42"])
+        assert result.exit_code == 0
+        assert "No winning cards." in result.output
+
+    def test_verify_all_called(self, runner, full_config, tmp_path):
+        """verify lists every card once every phrase is called."""
+        called = tmp_path / "called.txt"
+        called.write_text("\n".join(f"Item {i}" for i in range(30)))
+
+        result = runner.invoke(
+            main, ["verify", "--seed", "42", "--called-file", str(called)]
+        )
+
+        assert result.exit_code == 0
+        assert "Winning cards (5): #1, #2, #3, #4, #5" in result.output
+
+    def test_verify_from_manifest(self, runner, full_config, tmp_path):
+        """verify reads the cards from a run's manifest."""
+        runner.invoke(main, ["generate"])
+        manifest = next((tmp_path / "output").glob("*.cards"))
+        called = [f"Item {i}" for i in range(30)]
+
+        result = runner.invoke(main, ["verify", "--manifest", str(manifest), *called])
+
+        assert result.exit_code == 0
+        assert "Winning cards (5)" in result.output
+
+    def test_verify_needs_seed_or_manifest(self, runner, full_config):
+        """verify refuses to guess which run to check."""
+        result = runner.invoke(main, ["verify", "Item 1"])
+        assert result.exit_code == 1
+        assert "Pass either --seed or --manifest" in result.output
+
+    def test_verify_rejects_negative_seed(self, runner, full_config):
+        """Seeds are never negative, as in generate."""
+        result = runner.invoke(main, ["verify", "--seed", "-1"])
+        assert result.exit_code == 2
+        assert "--seed" in result.output
+
+    def test_verify_warns_about_unknown_phrases(self, runner, full_config):
+        """verify flags called phrases that aren't in the config."""
+        result = runner.invoke(main, ["verify", "--seed", "42", "Item 1", "Nope"])
+        assert result.exit_code == 0
+        assert "Unknown phrase: Nope" in result.output
+
+
+class TestSimulateCommand:
+    """Tests for the simulate command."""
+
+    def test_simulate_reports_percentiles(self, runner, full_config):
+        """simulate prints a percentile table for each outcome."""
+        result = runner.invoke(
+            main, ["simulate", "--games", "200", "--seed", "1", "--calls", "12"]
+        )
+
+        assert result.exit_code == 0
+        assert "Simulated 200 games with 5 cards from 30 phrases" in result.output
+        assert "p50" in result.output
+        assert "Calls to first bingo" in result.output
+        assert "Winners after 12 calls" in result.output
+
+    def test_simulate_rejects_impossible_unique_run(self, runner, full_config):
+        """simulate checks the pool can supply the unique cards."""
+        result = runner.invoke(
+            main, ["simulate", "--cards", "600000", "--unique", "set"]
+        )
+        assert result.exit_code == 1
+        assert "Cannot generate 600000 unique cards" in result.output
+
+
+class TestServeCommand:
+    """Tests for the serve command."""
+
+    def test_serve_shows_help(self, runner):
+        """serve --help describes the endpoints."""
+        result = runner.invoke(main, ["serve", "--help"])
+
+        assert result.exit_code == 0
+        assert "POST a JSON object" in result.output
+        assert "--queue-size" in result.output
+
 
 class TestMainGroup:
     """Tests for the main CLI group."""
@@ -109,3 +562,52 @@ class TestMainGroup:
         result = runner.invoke(main, ["--version"])
         assert result.exit_code == 0
         assert "version" in result.output.lower()
+
+
+class TestStartup:
+    """Tests that light commands don't pay for rendering imports."""
+
+    def test_version_skips_heavy_imports(self):
+        """--version loads none of ReportLab, Pillow or NumPy."""
+        loaded = _loaded_top_level_modules(["--version"])
+        assert loaded.isdisjoint(HEAVY_MODULES)
+
+    def test_validate_skips_heavy_imports(self, tmp_path):
+        """validate checks every phrase without ReportLab, Pillow or NumPy."""
+        import os
+
+        (tmp_path / "logo.png").write_bytes(b"")
+        phrases = [f"Phrase number {i}" for i in range(24)]
+        config = {
+            "event_name": "Test",
+            "logo_location": str(tmp_path / "logo.png"),
+            "output_directory": str(tmp_path / "output"),
+            "bingo_squares": phrases,
+        }
+        config_dir = tmp_path / ".bingomatic"
+        config_dir.mkdir()
+        (config_dir / "config.yaml").write_text(yaml.safe_dump(config))
+        env = {**os.environ, "HOME": str(tmp_path)}
+
+        # Nothing is cached yet, so every phrase is laid out by this run
+        loaded = _loaded_top_level_modules(["validate"], env=env)
+
+        fit_cache = json.loads((config_dir / "fit-cache.json").read_text())
+        assert sorted(fit_cache["data"]["phrases"]) == sorted(phrases)
+        assert "yaml" in loaded
+        assert loaded.isdisjoint(HEAVY_MODULES)
+
+    def test_cli_import_time_budget(self):
+        """Importing the CLI stays within its -X importtime budget."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import bingomatic.cli"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cumulative = [
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == "bingomatic.cli"
+        ]
+        assert cumulative[0] < CLI_IMPORT_BUDGET_US
@@ -3,15 +3,21 @@
 from pathlib import Path
 
 import pytest
+import yaml
 
+from bingomatic import config as config_module
 from bingomatic.config import (
+    YAML_LOADER,
     ConfigError,
     ConfigFileNotFoundError,
     ConfigValidationError,
     DEFAULT_CARD_COUNT,
     get_card_count,
+    get_config_cache_dir,
     get_config_dir,
     get_config_path,
+    get_layout_cache_path,
+    get_logo_dir,
     load_config,
     validate_config,
     load_and_validate_config,
@@ -34,6 +40,20 @@ class TestGetConfigPath:
         result = get_config_path()
         assert result == Path.home() / ".bingomatic" / "config.yaml"
 
+    def test_get_layout_cache_path_is_next_to_config(self):
+        """get_layout_cache_path returns a sidecar beside config.yaml."""
+        result = get_layout_cache_path()
+        assert result == Path.home() / ".bingomatic" / "layout-cache.json"
+
+    def test_get_config_cache_dir_is_next_to_config(self):
+        """get_config_cache_dir returns a directory beside config.yaml."""
+        result = get_config_cache_dir()
+        assert result == Path.home() / ".bingomatic" / "config-cache"
+
+    def test_get_logo_dir_is_next_to_config(self):
+        """get_logo_dir returns a directory beside config.yaml."""
+        assert get_logo_dir() == Path.home() / ".bingomatic" / "logos"
+
 
 class TestLoadConfig:
     """Tests for load_config function."""
@@ -67,6 +87,13 @@ class TestLoadConfig:
 
         assert "invalid YAML syntax" in str(exc_info.value)
 
+    def test_uses_libyaml_when_available(self):
+        """The C loader is used whenever PyYAML was built with libyaml."""
+        if hasattr(yaml, "CSafeLoader"):
+            assert YAML_LOADER is yaml.CSafeLoader
+        else:
+            assert YAML_LOADER is yaml.SafeLoader
+
 
 class TestValidateConfig:
     """Tests for validate_config function."""
@@ -171,6 +198,25 @@ class TestValidateConfig:
         assert any("logo_location" in e and "non-empty" in e for e in errors)
         assert any("output_directory" in e and "non-empty" in e for e in errors)
 
+    def test_validate_config_with_non_string_bingo_squares(self):
+        """validate_config names bingo_squares entries that aren't phrases."""
+        squares = [f"item{i}" for i in range(24)] + [42, None, "  "]
+        config = {
+            "event_name": "Test Event",
+            "logo_location": "logo.png",
+            "output_directory": "/output",
+            "bingo_squares": squares,
+        }
+
+        errors = validate_config(config)
+
+        assert errors == [
+            (
+                "Field 'bingo_squares' must only contain non-empty strings: "
+                "#25 (int), #26 (NoneType), #27 (empty)"
+            )
+        ]
+
 
 class TestValidateConfigMultiError:
     """Tests for multi-error collection in validate_config."""
@@ -242,6 +288,94 @@ class TestLoadAndValidateConfig:
         assert len(exc_info.value.errors) >= 1
 
 
+class TestConfigCache:
+    """Tests for the cache of validated configs."""
+
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        """Copy the valid fixture config somewhere it can be changed."""
+        path = tmp_path / "config.yaml"
+        path.write_text((FIXTURES_DIR / "valid_config.yaml").read_text())
+        return path
+
+    def test_unchanged_config_skips_validation(
+        self, tmp_path, config_path, monkeypatch
+    ):
+        """A second load of an unchanged file comes from the cache."""
+        cache_dir = tmp_path / "cache"
+        first = load_and_validate_config(config_path, cache_dir)
+
+        def fail(*args):
+            raise AssertionError("config was not served from the cache")
+
+        monkeypatch.setattr(config_module, "load_config", fail)
+        monkeypatch.setattr(config_module, "validate_config", fail)
+
+        assert load_and_validate_config(config_path, cache_dir) == first
+
+    def test_changed_config_is_loaded_again(self, tmp_path, config_path):
+        """Editing the file invalidates its cached copy."""
+        cache_dir = tmp_path / "cache"
+        load_and_validate_config(config_path, cache_dir)
+        config_path.write_text(
+            config_path.read_text().replace("DevOpsDays Austin 2026", "Other Event")
+        )
+
+        config = load_and_validate_config(config_path, cache_dir)
+
+        assert config["event_name"] == "Other Event"
+
+    def test_schema_change_validates_again(self, tmp_path, config_path, monkeypatch):
+        """A config cached under older validation rules is validated again."""
+        cache_dir = tmp_path / "cache"
+        load_and_validate_config(config_path, cache_dir)
+        monkeypatch.setattr(config_module, "CONFIG_SCHEMA_VERSION", 999)
+        validated = []
+        validate = config_module.validate_config
+
+        def counting_validate(config):
+            validated.append(config)
+            return validate(config)
+
+        monkeypatch.setattr(config_module, "validate_config", counting_validate)
+
+        load_and_validate_config(config_path, cache_dir)
+
+        assert len(validated) == 1
+
+    def test_invalid_config_is_not_cached(self, tmp_path):
+        """A config that fails validation fails again on every load."""
+        cache_dir = tmp_path / "cache"
+        invalid_config = tmp_path / "invalid_config.yaml"
+        invalid_config.write_text("event_name: ''")
+
+        for _ in range(2):
+            with pytest.raises(ConfigValidationError):
+                load_and_validate_config(invalid_config, cache_dir)
+        assert not cache_dir.exists()
+
+    def test_corrupt_cache_is_ignored(self, tmp_path, config_path):
+        """An unreadable cache entry is replaced by a fresh load."""
+        cache_dir = tmp_path / "cache"
+        load_and_validate_config(config_path, cache_dir)
+        (cache_file,) = cache_dir.iterdir()
+        cache_file.write_bytes(b"not a pickle")
+
+        config = load_and_validate_config(config_path, cache_dir)
+
+        assert config["event_name"] == "DevOpsDays Austin 2026"
+        assert cache_file.read_bytes() != b"not a pickle"
+
+    def test_unwritable_cache_dir_is_ignored(self, tmp_path, config_path):
+        """A cache directory that can't be created doesn't stop the load."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+
+        config = load_and_validate_config(config_path, blocker / "cache")
+
+        assert config["event_name"] == "DevOpsDays Austin 2026"
+
+
 class TestCardCountValidation:
     """Tests for card_count field validation."""
 
@@ -0,0 +1,234 @@
+"""Unit tests for the export module."""
+
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+from PIL import Image
+
+from bingomatic.cards import CardCapacityError, card_squares
+from bingomatic.export import (
+    CARD_HEIGHT,
+    CARD_WIDTH,
+    _ImageCanvas,
+    export_cards,
+    prepare_logo,
+    render_card,
+)
+from bingomatic.manifest import load_manifest
+from bingomatic.pdf import register_fonts
+from bingomatic.roster import Attendee
+
+SQUARES = [f"Item {i}" for i in range(30)]
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def logo_path(tmp_path):
+    """Create a small logo with transparency."""
+    path = tmp_path / "logo.png"
+    Image.new("RGBA", (200, 100), color=(200, 0, 0, 128)).save(path)
+    return path
+
+
+class TestRenderCard:
+    """Tests for rendering a single card image."""
+
+    @pytest.fixture(autouse=True)
+    def fonts(self):
+        """Register the card fonts, as export workers do."""
+        register_fonts()
+
+    def test_png_has_card_size_at_dpi(self):
+        """A PNG card covers the card and its margin at the chosen resolution."""
+        data = render_card("png", SQUARES[:24], "Party", dpi=72)
+
+        image = Image.open(io.BytesIO(data))
+        assert image.format == "PNG"
+        assert image.size == (CARD_WIDTH, CARD_HEIGHT)
+
+        doubled = Image.open(io.BytesIO(render_card("png", SQUARES[:24], dpi=144)))
+        assert doubled.size == (CARD_WIDTH * 2, CARD_HEIGHT * 2)
+
+    def test_png_draws_grid_and_text(self):
+        """The grid lines and phrases are drawn in black on white."""
+        blank = Image.open(io.BytesIO(render_card("png", None, dpi=72)))
+        card = Image.open(io.BytesIO(render_card("png", SQUARES[:24], dpi=72)))
+
+        assert blank.getextrema() == ((0, 255),) * 3
+        # Phrases add dark pixels to the squares
+        dark = sum(card.convert("L").histogram()[:128])
+        assert dark > sum(blank.convert("L").histogram()[:128])
+
+    def test_png_draws_logo(self, logo_path):
+        """The logo is blended into the center square."""
+        logo = prepare_logo(logo_path, "png", 72)
+        image = Image.open(io.BytesIO(render_card("png", None, logo=logo, dpi=72)))
+
+        # The grid sits above an 18pt margin and the 54pt footer
+        center = (CARD_WIDTH // 2, CARD_HEIGHT - (18 + 54 + 180))
+        red, green, blue = image.getpixel(center)
+        assert red > green and red > blue
+
+    def test_svg_is_valid_and_escapes_text(self):
+        """SVG cards parse as XML and carry each phrase as text."""
+        squares = ["Fish & <chips>"] + SQUARES[:23]
+        data = render_card("svg", squares, "Q&A night", card_id=7)
+
+        root = ElementTree.fromstring(data)
+        texts = [element.text for element in root.iter(f"{SVG}text")]
+        assert "<chips>" in texts  # The phrase wraps onto two lines
+        assert "Q&A night" in texts
+        assert "#7" in texts
+        assert root.get("viewBox") == f"0 0 {CARD_WIDTH} {CARD_HEIGHT}"
+
+    def test_prints_attendee_on_name_field(self):
+        """An attendee's name goes on the name line and their badge below it."""
+        data = render_card("svg", None, attendee=Attendee("Ada Lovelace", "B-17"))
+
+        texts = {
+            element.text: element
+            for element in ElementTree.fromstring(data).iter(f"{SVG}text")
+        }
+        assert texts["Ada Lovelace"].get("y") == texts["Name:"].get("y")
+        assert "Badge B-17" in texts
+
+    def test_long_attendee_name_is_shortened(self):
+        """A name too long for the line is set smaller and cut short."""
+        attendee = Attendee("Bartholomew " * 20)
+        root = ElementTree.fromstring(render_card("svg", None, attendee=attendee))
+
+        (name,) = [
+            element
+            for element in root.iter(f"{SVG}text")
+            if element.text.startswith("Bartholomew")
+        ]
+        assert name.text.endswith("\u2026")
+        assert float(name.get("font-size")) == 4
+
+    def test_svg_embeds_logo(self, logo_path):
+        """An SVG logo is embedded as a PNG data URI."""
+        logo = prepare_logo(logo_path, "svg", 72)
+        root = ElementTree.fromstring(render_card("svg", None, logo=logo))
+
+        (image,) = root.iter(f"{SVG}image")
+        assert image.get("href").startswith("data:image/png;base64,")
+
+
+class TestImageCanvas:
+    """Tests for the canvas base class of the image formats."""
+
+    def test_incomplete_canvas_fails_at_creation(self):
+        """A canvas missing a drawing call can't be created at all."""
+
+        class NoTextCanvas(_ImageCanvas):
+            def line(self, x1, y1, x2, y2):
+                pass
+
+            def rect(self, x, y, width, height, fill=0, stroke=1):
+                pass
+
+            def drawImage(self, image, x, y, width, height, **kwargs):
+                pass
+
+            def to_bytes(self):
+                return b""
+
+        with pytest.raises(TypeError, match="_text"):
+            NoTextCanvas()
+
+
+class TestExportCards:
+    """Tests for exporting a run as image files."""
+
+    def test_writes_one_file_per_card(self, tmp_path):
+        """Cards are named after their IDs in a new directory."""
+        output = export_cards(tmp_path / "cards", 3, "svg", bingo_squares=SQUARES)
+
+        assert sorted(path.name for path in output.iterdir()) == [
+            "card-0001.svg",
+            "card-0002.svg",
+            "card-0003.svg",
+        ]
+
+    def test_seeded_cards_match_pdf_cards(self, tmp_path):
+        """A seeded export has the squares card_squares gives each ID."""
+        output = export_cards(
+            tmp_path / "cards", 2, "svg", bingo_squares=SQUARES, seed=5, first_card_id=9
+        )
+
+        root = ElementTree.fromstring((output / "card-0010.svg").read_bytes())
+        texts = {element.text for element in root.iter(f"{SVG}text")}
+        assert set(card_squares(SQUARES, 5, 10)) <= texts
+        assert "#10" in texts
+
+    def test_writes_zip(self, tmp_path, logo_path):
+        """A .zip output holds every card, written by worker processes."""
+        output = export_cards(
+            tmp_path / "cards.zip",
+            4,
+            "png",
+            dpi=36,
+            logo_path=logo_path,
+            bingo_squares=SQUARES,
+            workers=2,
+        )
+
+        with zipfile.ZipFile(output) as archive:
+            names = archive.namelist()
+            image = Image.open(io.BytesIO(archive.read("card-0004.png")))
+        assert names == [f"card-000{i}.png" for i in range(1, 5)]
+        assert image.size == (CARD_WIDTH // 2, CARD_HEIGHT // 2)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_removes_stale_cards(self, tmp_path):
+        """A smaller export into the same directory leaves no old cards."""
+        export_cards(tmp_path / "cards", 3, "svg", bingo_squares=SQUARES)
+        (tmp_path / "cards" / "notes.txt").write_text("keep")
+
+        output = export_cards(tmp_path / "cards", 1, "svg", bingo_squares=SQUARES)
+
+        assert sorted(path.name for path in output.iterdir()) == [
+            "card-0001.svg",
+            "notes.txt",
+        ]
+
+    def test_writes_manifest(self, tmp_path):
+        """The manifest records the squares of every exported card."""
+        manifest_path = tmp_path / "cards.cards"
+        export_cards(
+            tmp_path / "cards",
+            3,
+            "svg",
+            bingo_squares=SQUARES,
+            seed=1,
+            manifest_path=manifest_path,
+        )
+
+        manifest = load_manifest(manifest_path)
+        assert manifest.card_count == 3
+        assert manifest.squares(2) == card_squares(SQUARES, 1, 2)
+
+    def test_pairs_attendees_with_cards(self, tmp_path):
+        """Each card gets the next attendee, across worker chunks."""
+        attendees = [Attendee(f"Person {i}") for i in range(30)]
+        output = export_cards(
+            tmp_path / "cards", 30, "svg", attendees=iter(attendees), workers=2
+        )
+
+        root = ElementTree.fromstring((output / "card-0027.svg").read_bytes())
+        assert "Person 26" in {element.text for element in root.iter(f"{SVG}text")}
+
+    def test_unknown_format_raises(self, tmp_path):
+        """Only PNG and SVG cards can be exported."""
+        with pytest.raises(ValueError, match="Unknown card format"):
+            export_cards(tmp_path / "cards", 1, "gif")
+
+    def test_unique_checks_capacity(self, tmp_path):
+        """A pool too small for unique cards fails before writing anything."""
+        with pytest.raises(CardCapacityError):
+            export_cards(
+                tmp_path / "cards", 2, "svg", bingo_squares=SQUARES[:24], unique="set"
+            )
+        assert not (tmp_path / "cards").exists()
@@ -0,0 +1,118 @@
+"""Unit tests for the fontcache module."""
+
+import pytest
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from bingomatic import fontcache, pdf
+from bingomatic.fontcache import font_cache_key, load_ttfont, register_font
+
+ROBOTO = pdf.FONTS_DIR / "Roboto-Regular.ttf"
+TEXTS = ["", "Kubernetes", "Uses OpenTelemetry in prod", "Café ünïcode"]
+
+
+class TestFontCacheKey:
+    """Tests for cache keys."""
+
+    def test_key_depends_on_font_bytes(self):
+        """Different font files get different keys."""
+        data = ROBOTO.read_bytes()
+        assert font_cache_key(data) == font_cache_key(data)
+        assert font_cache_key(data) != font_cache_key(data + b"\0")
+
+    def test_key_depends_on_reportlab_version(self, monkeypatch):
+        """Upgrading ReportLab invalidates every entry."""
+        data = ROBOTO.read_bytes()
+        before = font_cache_key(data)
+        monkeypatch.setattr(fontcache.reportlab, "Version", "0.0.0")
+        assert font_cache_key(data) != before
+
+
+class TestLoadTTFont:
+    """Tests for loading fonts through the cache."""
+
+    def test_miss_writes_entry(self, tmp_path):
+        """The first load parses the font and saves it."""
+        font = load_ttfont("CacheTest", ROBOTO, tmp_path)
+        assert isinstance(font, TTFont)
+        assert [path.suffix for path in tmp_path.iterdir()] == [".pickle"]
+
+    def test_hit_matches_parsed_font(self, tmp_path):
+        """A cached font has the same attributes and metrics as a parsed one."""
+        load_ttfont("CacheTest", ROBOTO, tmp_path)
+        cached = load_ttfont("CacheTest", ROBOTO, tmp_path)
+        parsed = TTFont("CacheTest", str(ROBOTO))
+
+        assert vars(cached).keys() == vars(parsed).keys()
+        assert vars(cached.face).keys() == vars(parsed.face).keys()
+        assert cached.face.charWidths == parsed.face.charWidths
+        for text in TEXTS:
+            assert cached.stringWidth(text, 10) == parsed.stringWidth(text, 10)
+
+    def test_hit_does_not_parse(self, tmp_path, monkeypatch):
+        """A cached font is restored without constructing a TTFont."""
+        load_ttfont("CacheTest", ROBOTO, tmp_path)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("font was parsed")
+
+        monkeypatch.setattr(TTFont, "__init__", fail)
+        load_ttfont("CacheTest", ROBOTO, tmp_path)
+
+    def test_hit_records_current_path(self, tmp_path):
+        """A font copied elsewhere reports the path it was loaded from."""
+        copy = tmp_path / "Copy.ttf"
+        copy.write_bytes(ROBOTO.read_bytes())
+        load_ttfont("CacheTest", ROBOTO, tmp_path / "cache")
+        font = load_ttfont("CacheTest", copy, tmp_path / "cache")
+        assert font.face.filename == str(copy)
+
+    def test_corrupt_entry_is_reparsed(self, tmp_path):
+        """A damaged cache entry falls back to parsing and is replaced."""
+        load_ttfont("CacheTest", ROBOTO, tmp_path)
+        (entry,) = tmp_path.iterdir()
+        entry.write_bytes(b"not a pickle")
+
+        font = load_ttfont("CacheTest", ROBOTO, tmp_path)
+        parsed = TTFont("CacheTest", str(ROBOTO))
+        assert font.stringWidth("Kubernetes", 10) == parsed.stringWidth(
+            "Kubernetes", 10
+        )
+        assert entry.read_bytes() != b"not a pickle"
+
+    def test_unwritable_cache_is_ignored(self, tmp_path):
+        """A cache directory that can't be created doesn't stop loading."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        font = load_ttfont("CacheTest", ROBOTO, blocker / "cache")
+        assert isinstance(font, TTFont)
+
+    def test_missing_font_raises(self, tmp_path):
+        """A missing font file is an error, with or without a cache."""
+        with pytest.raises(OSError):
+            load_ttfont("CacheTest", tmp_path / "missing.ttf", tmp_path)
+
+
+class TestRegisterFont:
+    """Tests for registering cached fonts."""
+
+    def test_registers_cached_font(self, tmp_path):
+        """A font restored from the cache is registered for measurement."""
+        register_font("CachedRoboto", ROBOTO, tmp_path)
+        register_font("CachedRoboto", ROBOTO, tmp_path)
+        assert pdfmetrics.stringWidth("Hi", "CachedRoboto", 10) > 0
+
+    def test_cached_fonts_render(self, tmp_path, monkeypatch):
+        """Fonts restored from the cache render a valid PDF."""
+        for _ in range(2):
+            monkeypatch.setattr(pdf, "_fonts_registered", False)
+            pdf.register_fonts(tmp_path / "cache")
+
+        output = pdf.generate_pdf(
+            tmp_path / "cards.pdf",
+            card_count=2,
+            event_name="Test",
+            bingo_squares=[f"Item {i}" for i in range(30)],
+            font_cache_dir=tmp_path / "cache",
+        )
+        assert output.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,82 @@
+"""Unit tests for the imposition module."""
+
+import pytest
+
+from bingomatic.imposition import (
+    CELL_HEIGHT,
+    CELL_WIDTH,
+    FOOTER_SPACE,
+    PAGE_SIZES,
+    ImpositionError,
+    page_layout,
+)
+
+
+def _cells_overlap(layout, first, second):
+    scale = layout.scale
+    (x1, y1), (x2, y2) = layout.positions[first], layout.positions[second]
+    return abs(x1 - x2) < CELL_WIDTH * scale and abs(y1 - y2) < CELL_HEIGHT * scale
+
+
+class TestPageLayout:
+    """Tests for placing cards on a page."""
+
+    def test_letter_matches_two_up_landscape(self):
+        """The default layout is the classic two cards on landscape letter."""
+        layout = page_layout()
+
+        # Two 5" grids half an inch apart, centered between the header and
+        # the name field
+        assert layout.page_size == (792, 612)
+        assert layout.positions == ((18, 135), (414, 135))
+
+    def test_tabloid_fits_four_cards(self):
+        """Tabloid holds two rows of two cards, printed portrait."""
+        layout = page_layout("tabloid")
+
+        assert layout.page_size == (792, 1224)
+        assert layout.cards_per_page == 4
+
+    def test_positions_read_top_row_first(self):
+        """Cards run left to right along the top row, then the next row."""
+        positions = page_layout("13x19").positions
+
+        assert positions[0][1] == positions[1][1] > positions[2][1]
+        assert positions[0][0] < positions[1][0]
+
+    @pytest.mark.parametrize("page_size", list(PAGE_SIZES))
+    def test_cards_stay_within_margins(self, page_size):
+        """No card's cell crosses the margin of any page size."""
+        layout = page_layout(page_size, margin=18)
+        width, height = layout.page_size
+
+        for x, y in layout.positions:
+            assert 18 <= x and x + CELL_WIDTH <= width - 18
+            assert (
+                18 <= y - FOOTER_SPACE and y + CELL_HEIGHT - FOOTER_SPACE <= height - 18
+            )
+
+    def test_smaller_cards_fit_more_per_page(self):
+        """Scaling cards down packs more of them without overlapping."""
+        layout = page_layout("tabloid", scale=0.6)
+
+        assert layout.cards_per_page > 4
+        assert not any(
+            _cells_overlap(layout, first, second)
+            for first in range(layout.cards_per_page)
+            for second in range(first)
+        )
+
+    def test_accepts_page_dimensions(self):
+        """A (width, height) in points works like a named size."""
+        assert page_layout((612, 792)) == page_layout("letter")
+
+    def test_card_too_large_for_page(self):
+        """A card larger than the page is an error."""
+        with pytest.raises(ImpositionError, match="does not fit"):
+            page_layout("letter", scale=2)
+
+    def test_unknown_page_size(self):
+        """Page sizes are looked up by name."""
+        with pytest.raises(ImpositionError, match="Unknown page size"):
+            page_layout("legal")
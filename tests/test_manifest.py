@@ -0,0 +1,176 @@
+"""Unit tests for the manifest module."""
+
+import numpy as np
+import pytest
+
+from bingomatic.manifest import (
+    ManifestError,
+    ManifestWriter,
+    load_manifest,
+)
+from bingomatic.pdf import generate_pdf
+
+SQUARES = [f"Item {i}" for i in range(30)]
+
+
+def _write(path, cards, squares=SQUARES, first_card_id=1):
+    with ManifestWriter(path, squares, first_card_id) as writer:
+        for card in cards:
+            writer.append(card)
+    return path
+
+
+class TestManifestRoundTrip:
+    """Tests for writing and reading manifests."""
+
+    def test_cards_round_trip(self, tmp_path):
+        """Every card reads back with the squares it was written with."""
+        cards = [SQUARES[i : i + 24] for i in range(5)]
+        manifest = load_manifest(_write(tmp_path / "run.cards", cards))
+
+        assert manifest.card_count == 5
+        assert manifest.phrases == SQUARES
+        assert [manifest.squares(card_id) for card_id in range(1, 6)] == cards
+
+    def test_cards_are_memory_mapped(self, tmp_path):
+        """The card matrix is a read-only uint16 view of the file."""
+        manifest = load_manifest(_write(tmp_path / "run.cards", [SQUARES[:24]]))
+
+        assert isinstance(manifest.cards, np.memmap)
+        assert manifest.cards.dtype == np.dtype("<u2")
+        assert manifest.cards.shape == (1, 24)
+        assert not manifest.cards.flags.writeable
+
+    def test_matrix_is_aligned(self, tmp_path):
+        """The matrix starts on a 64-byte boundary of the file."""
+        manifest = load_manifest(_write(tmp_path / "run.cards", [SQUARES[:24]]))
+        assert manifest.cards.offset % 64 == 0
+
+    def test_unicode_phrases(self, tmp_path):
+        """Phrases survive the UTF-8 phrase table intact."""
+        squares = [f"Café ☕ {i}" for i in range(24)]
+        manifest = load_manifest(_write(tmp_path / "run.cards", [squares], squares))
+        assert manifest.squares(1) == squares
+
+    def test_empty_manifest(self, tmp_path):
+        """A manifest with no cards still loads."""
+        manifest = load_manifest(_write(tmp_path / "run.cards", []))
+        assert manifest.card_count == 0
+        assert manifest.cards.shape == (0, 24)
+
+    def test_first_card_id(self, tmp_path):
+        """Cards are addressed by ID relative to the first card."""
+        cards = [SQUARES[i : i + 24] for i in range(3)]
+        manifest = load_manifest(
+            _write(tmp_path / "run.cards", cards, first_card_id=10)
+        )
+
+        assert manifest.squares(11) == cards[1]
+        with pytest.raises(KeyError):
+            manifest.squares(1)
+
+    def test_extend_appends_another_manifest(self, tmp_path):
+        """extend copies every card of a manifest with the same phrases."""
+        first = [SQUARES[:24]] * 2
+        second = [SQUARES[6:]] * 3
+        part = load_manifest(_write(tmp_path / "part.cards", second))
+
+        with ManifestWriter(tmp_path / "all.cards", SQUARES) as writer:
+            for card in first:
+                writer.append(card)
+            writer.extend(part)
+
+        manifest = load_manifest(tmp_path / "all.cards")
+        assert [manifest.squares(i) for i in range(1, 6)] == first + second
+
+    def test_extend_leading_cards(self, tmp_path):
+        """extend with a card count copies only the first cards."""
+        cards = [SQUARES[i : i + 24] for i in range(5)]
+        part = load_manifest(_write(tmp_path / "part.cards", cards))
+
+        with ManifestWriter(tmp_path / "all.cards", SQUARES) as writer:
+            writer.extend(part, 3)
+
+        manifest = load_manifest(tmp_path / "all.cards")
+        assert manifest.card_count == 3
+        assert [manifest.squares(i) for i in range(1, 4)] == cards[:3]
+
+
+class TestManifestErrors:
+    """Tests for manifest validation."""
+
+    def test_unknown_phrase(self, tmp_path):
+        """Cards can only use phrases from the phrase table."""
+        with pytest.raises(ManifestError, match="not in manifest"):
+            _write(tmp_path / "run.cards", [SQUARES[:23] + ["Nope"]])
+        assert not (tmp_path / "run.cards").exists()
+
+    def test_wrong_card_size(self, tmp_path):
+        """Cards must have exactly 24 squares."""
+        with pytest.raises(ManifestError, match="Expected 24 squares"):
+            _write(tmp_path / "run.cards", [SQUARES[:10]])
+
+    def test_not_a_manifest(self, tmp_path):
+        """Other files are rejected."""
+        path = tmp_path / "run.cards"
+        path.write_bytes(b"%PDF-1.4\n" * 10)
+        with pytest.raises(ManifestError, match="Not a card manifest"):
+            load_manifest(path)
+
+    def test_truncated_manifest(self, tmp_path):
+        """A manifest missing part of its card matrix is rejected."""
+        path = _write(tmp_path / "run.cards", [SQUARES[:24]] * 3)
+        path.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(ManifestError, match="truncated"):
+            load_manifest(path)
+
+    def test_missing_manifest(self, tmp_path):
+        """A missing manifest raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_manifest(tmp_path / "missing.cards")
+
+
+class TestGeneratePdfManifest:
+    """Tests for manifests written by generate_pdf."""
+
+    def test_records_seeded_cards(self, tmp_path):
+        """The manifest holds the squares chosen for every card."""
+        from bingomatic.cards import card_squares
+
+        generate_pdf(
+            tmp_path / "run.pdf",
+            card_count=5,
+            bingo_squares=SQUARES,
+            seed=9,
+            manifest_path=tmp_path / "run.cards",
+        )
+
+        manifest = load_manifest(tmp_path / "run.cards")
+        assert manifest.card_count == 5
+        assert manifest.squares(4) == card_squares(SQUARES, 9, 4)
+
+    def test_records_unseeded_cards(self, tmp_path, monkeypatch):
+        """Unseeded runs are recorded too, with their IDs printed."""
+        drawn_ids = []
+        monkeypatch.setattr(
+            "bingomatic.pdf._draw_card_id",
+            lambda canvas, card_id, x, y: drawn_ids.append(card_id),
+        )
+
+        generate_pdf(
+            tmp_path / "run.pdf",
+            card_count=3,
+            bingo_squares=SQUARES,
+            manifest_path=tmp_path / "run.cards",
+        )
+
+        manifest = load_manifest(tmp_path / "run.cards")
+        assert manifest.card_count == 3
+        assert drawn_ids == [1, 2, 3]
+
+    def test_requires_bingo_squares(self, tmp_path):
+        """A manifest can't be written for cards without squares."""
+        with pytest.raises(ValueError, match="needs bingo_squares"):
+            generate_pdf(
+                tmp_path / "run.pdf", card_count=2, manifest_path=tmp_path / "x.cards"
+            )
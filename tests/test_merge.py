@@ -0,0 +1,163 @@
+"""Unit tests for the merge module."""
+
+import re
+
+import pytest
+
+from bingomatic.merge import (
+    PdfMergeError,
+    PdfMerger,
+    merge_pdfs,
+    read_pdf_objects,
+    split_pdf,
+)
+from bingomatic.pdf import generate_pdf
+
+
+def _page_count(path) -> int:
+    content = path.read_bytes()
+    return content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+
+
+def _write_pdf(path, bodies):
+    """Write a PDF with a classic xref table from object bodies 1, 2, ..."""
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(bodies, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref_start = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(bodies) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(bodies) + 1)
+    data += b"startxref\n%d\n%%%%EOF\n" % xref_start
+    path.write_bytes(bytes(data))
+    return path
+
+
+class TestMergePdfs:
+    """Tests for merging ReportLab-generated PDFs."""
+
+    def test_merged_file_contains_all_pages(self, tmp_path):
+        """Pages from every input appear in the merged file."""
+        first = generate_pdf(tmp_path / "a.pdf", card_count=4)
+        second = generate_pdf(tmp_path / "b.pdf", card_count=3)
+
+        merged = merge_pdfs([first, second], tmp_path / "merged.pdf")
+
+        assert _page_count(merged) == 4
+
+    def test_merged_file_has_single_page_tree(self, tmp_path):
+        """The merged file has one page tree and one catalog."""
+        first = generate_pdf(tmp_path / "a.pdf", card_count=2)
+        second = generate_pdf(tmp_path / "b.pdf", card_count=2)
+
+        merged = merge_pdfs([first, second], tmp_path / "merged.pdf")
+
+        content = merged.read_bytes()
+        assert content.count(b"/Type /Pages") == 1
+        assert content.count(b"/Type /Catalog") == 1
+        assert content.rstrip().endswith(b"%%EOF")
+
+    def test_merger_reports_page_count(self, tmp_path):
+        """PdfMerger tracks how many pages it has written."""
+        shard = generate_pdf(tmp_path / "a.pdf", card_count=6)
+
+        with PdfMerger(tmp_path / "merged.pdf") as merger:
+            assert merger.append(shard) == 3
+            assert merger.append(shard) == 3
+            assert merger.page_count == 6
+
+    def test_append_leading_pages(self, tmp_path):
+        """page_count takes only the first pages of an input."""
+        shard = generate_pdf(tmp_path / "a.pdf", card_count=6)
+
+        with PdfMerger(tmp_path / "merged.pdf") as merger:
+            assert merger.append(shard, 2) == 2
+
+        assert _page_count(tmp_path / "merged.pdf") == 2
+
+    def test_append_page_range(self, tmp_path):
+        """first_page and page_count take pages from the middle of an input."""
+        shard = generate_pdf(tmp_path / "a.pdf", card_count=10)
+
+        with PdfMerger(tmp_path / "merged.pdf") as merger:
+            assert merger.append(shard, 2, first_page=3) == 2
+            assert merger.append(shard, first_page=4) == 1
+
+        assert _page_count(tmp_path / "merged.pdf") == 3
+
+    def test_shared_resources_are_written_once(self, tmp_path):
+        """Fonts and forms repeated across inputs are not copied."""
+        first = generate_pdf(tmp_path / "a.pdf", card_count=4, seed=1)
+        second = generate_pdf(tmp_path / "b.pdf", card_count=4, seed=2, first_card_id=5)
+
+        merged = merge_pdfs([first, second], tmp_path / "merged.pdf")
+
+        content = merged.read_bytes()
+        assert _page_count(merged) == 4
+        assert content.count(b"/FontFile2") == first.read_bytes().count(b"/FontFile2")
+        assert content.count(b"/Subtype /Form") == 1
+        assert len(content) < first.stat().st_size + second.stat().st_size * 0.6
+
+    def test_reference_cycle_is_kept(self, tmp_path):
+        """Objects referring back to their page are renumbered consistently."""
+        shard = _write_pdf(
+            tmp_path / "cycle.pdf",
+            [
+                b"<< /Type /Catalog /Pages 2 0 R >>",
+                b"<< /Type /Pages /Count 1 /Kids [ 3 0 R ] >>",
+                b"<< /Type /Page /Parent 2 0 R /Annots [ 4 0 R ] >>",
+                b"<< /Type /Annot /Subtype /Text /P 3 0 R >>",
+            ],
+        )
+
+        merged = merge_pdfs([shard, shard], tmp_path / "merged.pdf")
+
+        objects, _ = read_pdf_objects(merged)
+        pages = [num for num, body in objects.items() if b"/Type /Page " in body]
+        annots = [num for num, body in objects.items() if b"/Annot" in body]
+        assert len(pages) == 2
+        for page in pages:
+            (annot,) = re.findall(rb"/Annots \[ (\d+) 0 R", objects[page])
+            assert b"/P %d 0 R" % page in objects[int(annot)]
+        assert len(annots) == 4  # Two pages, each with its annotation
+
+    def test_rejects_non_pdf_input(self, tmp_path):
+        """A file that isn't a PDF raises PdfMergeError."""
+        bogus = tmp_path / "bogus.pdf"
+        bogus.write_text("not a pdf")
+
+        with pytest.raises(PdfMergeError):
+            merge_pdfs([bogus], tmp_path / "merged.pdf")
+
+
+class TestSplitPdf:
+    """Tests for splitting a PDF to fit a size limit."""
+
+    def test_parts_fit_limit_and_keep_every_page(self, tmp_path):
+        """Every part is under the limit and together they hold every page."""
+        pdf = generate_pdf(
+            tmp_path / "cards.pdf",
+            card_count=400,
+            bingo_squares=[f"Item {i}" for i in range(30)],
+        )
+        max_bytes = pdf.stat().st_size * 2 // 3
+
+        parts = split_pdf(pdf, max_bytes)
+
+        assert [part.name for part in parts[:2]] == [
+            "cards-part1.pdf",
+            "cards-part2.pdf",
+        ]
+        assert len(parts) >= 2
+        assert all(part.stat().st_size <= max_bytes for part in parts)
+        assert sum(_page_count(part) for part in parts) == 200
+        assert pdf.exists()
+
+    def test_page_larger_than_limit(self, tmp_path):
+        """A limit no single page fits in raises PdfMergeError."""
+        pdf = generate_pdf(tmp_path / "cards.pdf", card_count=2)
+
+        with pytest.raises(PdfMergeError, match="alone takes more than"):
+            split_pdf(pdf, 1000)
@@ -0,0 +1,99 @@
+"""Unit tests for the metrics module."""
+
+import pytest
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from bingomatic.metrics import (
+    FontMetrics,
+    get_font_metrics,
+    load_font_metrics,
+    measure_pool,
+    read_ttf_advances,
+)
+from bingomatic.pdf import FONTS_DIR, register_fonts
+
+FONT_FILES = ["Roboto-Regular.ttf", "Roboto-Bold.ttf", "RobotoMono-Regular.ttf"]
+
+
+class TestFontMetrics:
+    """Tests for glyph-advance tables."""
+
+    def test_roboto_mono_is_monospace(self):
+        """RobotoMono is detected as a monospace font."""
+        register_fonts()
+        assert get_font_metrics("RobotoMono").is_monospace
+
+    def test_roboto_is_proportional(self):
+        """Roboto is not treated as monospace."""
+        register_fonts()
+        assert not get_font_metrics("Roboto").is_monospace
+
+    def test_measure_matches_reportlab(self):
+        """Measurements match pdfmetrics.stringWidth for every font."""
+        register_fonts()
+        texts = ["", "Kubernetes", "Uses OpenTelemetry in prod", "Café ünïcode"]
+        for font_name in ["Roboto", "Roboto-Bold", "RobotoMono"]:
+            metrics = get_font_metrics(font_name)
+            for text in texts:
+                expected = pdfmetrics.stringWidth(text, font_name, 1000)
+                assert metrics.measure(text) == expected
+
+    def test_non_truetype_font_falls_back_to_reportlab(self):
+        """Standard Type 1 fonts are measured through ReportLab."""
+        metrics = FontMetrics("Helvetica")
+        assert not metrics.is_monospace
+        assert metrics.measure("Hello") == pdfmetrics.stringWidth(
+            "Hello", "Helvetica", 1000
+        )
+
+
+class TestReadTtfAdvances:
+    """Tests for reading advances straight from a TrueType file."""
+
+    @pytest.mark.parametrize("file_name", FONT_FILES)
+    def test_matches_reportlab_face(self, file_name):
+        """The table equals the one ReportLab parses from the same file."""
+        font_path = FONTS_DIR / file_name
+        face = TTFont("Test", str(font_path)).face
+
+        advances, default_width = read_ttf_advances(font_path.read_bytes())
+
+        assert advances == face.charWidths
+        assert default_width == face.defaultWidth
+
+    def test_load_font_metrics_needs_no_registration(self):
+        """A font never registered with ReportLab can still be measured."""
+        metrics = load_font_metrics("UnregisteredMono", FONTS_DIR / FONT_FILES[2])
+
+        assert get_font_metrics("UnregisteredMono") is metrics
+        assert metrics.is_monospace
+        assert metrics.measure("Kubernetes") == 10 * metrics.mono_advance
+
+    def test_rejects_font_without_character_map(self):
+        """A font with no Unicode character map is reported, not misread."""
+        font_data = bytearray((FONTS_DIR / FONT_FILES[2]).read_bytes())
+        cmap = font_data.index(b"cmap")
+        offset = int.from_bytes(font_data[cmap + 8 : cmap + 12], "big")
+        font_data[offset + 2 : offset + 4] = b"\0\0"
+
+        with pytest.raises(ValueError, match="character map"):
+            read_ttf_advances(bytes(font_data))
+
+
+class TestMeasurePool:
+    """Tests for batched measurement."""
+
+    def test_measures_in_input_order(self):
+        """measure_pool returns one width per string, in order."""
+        register_fonts()
+        widths = measure_pool(["a", "abc", "ab"], "RobotoMono")
+        advance = get_font_metrics("RobotoMono").mono_advance
+        assert widths == [advance, 3 * advance, 2 * advance]
+
+    def test_proportional_pool_matches_single_measurement(self):
+        """Batched widths equal individual measurements for proportional fonts."""
+        register_fonts()
+        texts = ["DevOpsDays", "CI/CD", "GitOps"]
+        metrics = get_font_metrics("Roboto")
+        assert measure_pool(texts, "Roboto") == [metrics.measure(t) for t in texts]
@@ -0,0 +1,227 @@
+"""Unit tests for the parallel module."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from bingomatic.imposition import page_layout
+from bingomatic.manifest import load_manifest
+from bingomatic.parallel import (
+    STREAM_CHUNK_CARDS,
+    chunk_card_count,
+    generate_pdf_parallel,
+    split_card_count,
+)
+from bingomatic.pdf import generate_pdf
+
+# Renders a streamed run in a fresh interpreter and prints its peak RSS
+PEAK_RSS_SCRIPT = """
+import resource, sys
+from bingomatic.parallel import generate_pdf_parallel
+generate_pdf_parallel(
+    sys.argv[2],
+    int(sys.argv[1]),
+    bingo_squares=[f"Conference phrase number {i}" for i in range(24)],
+    chunk_cards=int(sys.argv[3]),
+)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def _streamed_peak_rss(
+    card_count: int, output_path, chunk_cards: int = STREAM_CHUNK_CARDS
+) -> int:
+    args = [str(card_count), str(output_path), str(chunk_cards)]
+    result = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_SCRIPT, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return int(result.stdout.strip())
+
+
+class TestSplitCardCount:
+    """Tests for splitting a run into shards."""
+
+    def test_counts_add_up(self):
+        """Shard sizes always sum to the requested card count."""
+        for card_count in [1, 2, 7, 100, 20001]:
+            for shards in [1, 2, 3, 8]:
+                assert sum(split_card_count(card_count, shards)) == card_count
+
+    def test_only_last_shard_has_odd_count(self):
+        """Every shard but the last holds whole pages."""
+        counts = split_card_count(9, 3)
+        assert all(count % 2 == 0 for count in counts[:-1])
+
+    def test_never_more_shards_than_pages(self):
+        """Small runs are not split into empty shards."""
+        assert split_card_count(3, 8) == [2, 1]
+
+    def test_shards_hold_whole_pages_of_larger_layouts(self):
+        """With four cards per page, shards split on four-card pages."""
+        assert split_card_count(10, 2, cards_per_page=4) == [8, 2]
+
+
+class TestChunkCardCount:
+    """Tests for splitting a run into fixed-size chunks."""
+
+    def test_chunks_are_bounded(self):
+        """No chunk holds more than the requested number of cards."""
+        counts = chunk_card_count(2501, 1000)
+        assert counts == [1000, 1000, 501]
+
+    def test_odd_chunk_size_rounds_up_to_whole_pages(self):
+        """Chunks always hold whole pages."""
+        assert chunk_card_count(6, 3) == [4, 2]
+
+    def test_chunks_round_up_to_larger_pages(self):
+        """Chunks hold whole pages of the layout in use."""
+        assert chunk_card_count(10, 5, cards_per_page=4) == [8, 2]
+
+
+class TestGeneratePdfParallel:
+    """Tests for multiprocess PDF generation."""
+
+    def test_generates_all_pages(self, tmp_path):
+        """The merged output has one page per two cards."""
+        output_path = tmp_path / "test.pdf"
+
+        generate_pdf_parallel(
+            output_path,
+            card_count=7,
+            workers=2,
+            event_name="Test Event",
+            bingo_squares=[f"Item {i}" for i in range(30)],
+        )
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 4
+
+    def test_shards_share_the_layout(self, tmp_path):
+        """Every shard is imposed with the run's layout."""
+        output_path = tmp_path / "test.pdf"
+
+        generate_pdf_parallel(
+            output_path, card_count=9, chunk_cards=4, layout=page_layout("tabloid")
+        )
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 3
+        assert b"/MediaBox [ 0 0 792 1224 ]" in content
+
+    def test_leaves_no_shards_behind(self, tmp_path):
+        """Temporary shard files are removed after merging."""
+        output_path = tmp_path / "test.pdf"
+
+        generate_pdf_parallel(output_path, card_count=8, workers=2)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["test.pdf"]
+
+    def test_chunked_run_has_all_pages(self, tmp_path):
+        """A chunked run streams every page into the output."""
+        output_path = tmp_path / "test.pdf"
+
+        generate_pdf_parallel(output_path, card_count=9, chunk_cards=4)
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 5
+
+    def test_chunked_manifest_matches_single_run(self, tmp_path):
+        """Shard manifests combine into the same manifest as one process."""
+        squares = [f"Item {i}" for i in range(30)]
+
+        generate_pdf_parallel(
+            tmp_path / "chunked.pdf",
+            card_count=9,
+            chunk_cards=4,
+            bingo_squares=squares,
+            seed=5,
+            manifest_path=tmp_path / "chunked.cards",
+        )
+        generate_pdf(
+            tmp_path / "single.pdf",
+            card_count=9,
+            bingo_squares=squares,
+            seed=5,
+            manifest_path=tmp_path / "single.cards",
+        )
+
+        chunked = load_manifest(tmp_path / "chunked.cards")
+        single = load_manifest(tmp_path / "single.cards")
+        assert chunked.card_count == 9
+        assert np.array_equal(chunked.cards, single.cards)
+        assert sorted(p.suffix for p in tmp_path.iterdir()) == [
+            ".cards",
+            ".cards",
+            ".pdf",
+            ".pdf",
+        ]
+
+    @pytest.mark.parametrize("chunk_cards", [None, 4])
+    def test_unique_slice_matches_full_run(self, tmp_path, chunk_cards):
+        """A unique run started part way gives the full run's later cards."""
+        squares = [f"Item {i}" for i in range(26)]
+        options = {"chunk_cards": chunk_cards, "bingo_squares": squares, "seed": 5}
+
+        generate_pdf_parallel(
+            tmp_path / "full.pdf",
+            card_count=20,
+            unique="set",
+            manifest_path=tmp_path / "full.cards",
+            **options,
+        )
+        generate_pdf_parallel(
+            tmp_path / "tail.pdf",
+            card_count=9,
+            unique="set",
+            first_card_id=12,
+            manifest_path=tmp_path / "tail.cards",
+            **options,
+        )
+
+        full = load_manifest(tmp_path / "full.cards")
+        tail = load_manifest(tmp_path / "tail.cards")
+        assert np.array_equal(tail.cards, full.cards[11:])
+
+    def test_shards_read_their_own_roster_rows(self, tmp_path, monkeypatch):
+        """Each shard prints the attendees of its own cards, by card ID."""
+        roster = tmp_path / "roster.csv"
+        names = [f"Person {i}" for i in range(12)]
+        roster.write_text("name\n" + "\n".join(names) + "\n")
+        printed = []
+        monkeypatch.setattr(
+            "bingomatic.pdf._draw_attendee",
+            lambda canvas, attendee, grid_x, grid_y: printed.append(attendee.name),
+        )
+
+        generate_pdf_parallel(
+            tmp_path / "cards.pdf",
+            9,
+            chunk_cards=4,
+            first_card_id=4,
+            roster_path=roster,
+        )
+
+        assert printed == names[3:]
+
+    def test_streamed_peak_memory_is_flat(self, tmp_path):
+        """Peak memory stays flat as small streamed chunks pile up."""
+        small = _streamed_peak_rss(100, tmp_path / "small.pdf", chunk_cards=50)
+        large = _streamed_peak_rss(2_000, tmp_path / "large.pdf", chunk_cards=50)
+
+        assert large < small * 1.1
+
+    @pytest.mark.slow
+    def test_streamed_peak_memory_is_flat_at_scale(self, tmp_path):
+        """Peak memory for 50k streamed full cards stays close to that for 1k."""
+        small = _streamed_peak_rss(1_000, tmp_path / "small.pdf")
+        large = _streamed_peak_rss(50_000, tmp_path / "large.pdf")
+
+        assert large < small * 1.25
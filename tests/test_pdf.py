@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from bingomatic.imposition import page_layout
 from bingomatic.pdf import (
     FONTS_DIR,
     GRID_SIZE,
@@ -13,13 +14,19 @@ from bingomatic.pdf import (
     MAX_FONT_SIZE,
     SQUARE_SIZE,
     SQUARE_PADDING,
+    LOGO_DPI,
+    LOGO_SIZE,
+    LayoutCache,
+    _cached_logo,
     _fit_text_in_square,
-    _wrap_text,
-    calculate_grid_positions,
+    clear_layout_cache,
     generate_pdf,
+    layout_cache_info,
+    load_logo,
     register_fonts,
     select_random_squares,
 )
+from bingomatic.textfit import wrap_text
 
 
 class TestFontRegistration:
@@ -77,6 +84,15 @@ class TestSelectRandomSquares:
         unique_results = set(results)
         assert len(unique_results) > 1
 
+    def test_uses_supplied_rng(self):
+        """select_random_squares draws from the generator it is given."""
+        import random
+
+        squares = [f"Item {i}" for i in range(30)]
+        first = select_random_squares(squares, rng=random.Random(42))
+        second = select_random_squares(squares, rng=random.Random(42))
+        assert first == second
+
     def test_respects_custom_count(self):
         """select_random_squares respects custom count parameter."""
         squares = [f"Item {i}" for i in range(30)]
@@ -104,39 +120,6 @@ class TestConstants:
         assert GRID_TOTAL == 360
 
 
-class TestCalculateGridPositions:
-    """Tests for calculate_grid_positions function."""
-
-    def test_returns_four_values(self):
-        """calculate_grid_positions returns left_x, left_y, right_x, right_y."""
-        result = calculate_grid_positions(792, 612)  # Letter landscape
-        assert len(result) == 4
-
-    def test_grids_are_horizontally_centered(self):
-        """Grids are centered horizontally on the page."""
-        page_width = 792  # Letter landscape width
-        page_height = 612
-        left_x, _, right_x, _ = calculate_grid_positions(page_width, page_height)
-
-        # Left margin should equal right margin
-        left_margin = left_x
-        right_margin = page_width - (right_x + GRID_TOTAL)
-
-        assert abs(left_margin - right_margin) < 1  # Allow small floating point diff
-
-    def test_grids_have_correct_gap(self):
-        """Grids have 0.5 inch (36 point) gap between them."""
-        left_x, _, right_x, _ = calculate_grid_positions(792, 612)
-
-        actual_gap = right_x - (left_x + GRID_TOTAL)
-        assert actual_gap == GAP
-
-    def test_grids_have_same_y_position(self):
-        """Both grids have the same vertical position."""
-        _, left_y, _, right_y = calculate_grid_positions(792, 612)
-        assert left_y == right_y
-
-
 class TestGeneratePdf:
     """Tests for generate_pdf function."""
 
@@ -195,6 +178,55 @@ class TestGeneratePdf:
             page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
             assert page_count == 1
 
+    def test_tabloid_layout_puts_four_cards_per_page(self, tmp_path):
+        """A tabloid layout halves the page count of letter."""
+        output_path = tmp_path / "test.pdf"
+
+        generate_pdf(
+            output_path,
+            card_count=8,
+            bingo_squares=[f"Item {i}" for i in range(30)],
+            layout=page_layout("tabloid"),
+        )
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 2
+        assert b"/MediaBox [ 0 0 792 1224 ]" in content
+
+    def test_scaled_cards(self, tmp_path):
+        """Cards can be drawn smaller than 5 inches to fit more per page."""
+        output_path = tmp_path / "test.pdf"
+        layout = page_layout("letter", scale=0.6)
+
+        generate_pdf(
+            output_path,
+            card_count=layout.cards_per_page,
+            event_name="Scaled",
+            bingo_squares=[f"Item {i}" for i in range(30)],
+            seed=1,
+            layout=layout,
+        )
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert layout.cards_per_page > 2
+        assert page_count == 1
+
+    def test_optimize_writes_binary_streams(self, tmp_path):
+        """optimize drops ASCII85 encoding without changing the global setting."""
+        from reportlab import rl_config
+
+        use_a85 = rl_config.useA85
+        plain = generate_pdf(tmp_path / "plain.pdf", card_count=20, seed=1)
+        optimized = generate_pdf(
+            tmp_path / "optimized.pdf", card_count=20, seed=1, optimize=True
+        )
+
+        assert b"/ASCII85Decode" not in optimized.read_bytes()
+        assert optimized.stat().st_size < plain.stat().st_size
+        assert rl_config.useA85 == use_a85
+
     def test_accepts_path_object(self, tmp_path):
         """generate_pdf accepts Path object for output_path."""
         output_path = tmp_path / "test.pdf"
@@ -245,14 +277,108 @@ class TestGeneratePdf:
         assert "Logo file not found" in str(exc_info.value)
 
 
-def _create_test_image(path: Path) -> None:
+def _create_test_image(path: Path, size: int = 100) -> None:
     """Create a simple test PNG image."""
     from PIL import Image
 
-    img = Image.new("RGB", (100, 100), color="red")
+    img = Image.new("RGB", (size, size), color="red")
     img.save(path)
 
 
+class TestLoadLogo:
+    """Tests for logo loading and downsampling."""
+
+    def test_downsamples_large_logo_to_print_size(self, tmp_path):
+        """A large logo is shrunk to the printed size at the target DPI."""
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path, size=3000)
+
+        logo = load_logo(logo_path)
+
+        expected = -(-LOGO_SIZE * LOGO_DPI // 72)  # ceil
+        assert logo.getSize() == (expected, expected)
+
+    def test_respects_custom_dpi(self, tmp_path):
+        """A lower DPI produces a smaller embedded image."""
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path, size=3000)
+
+        assert load_logo(logo_path, dpi=72).getSize() == (LOGO_SIZE, LOGO_SIZE)
+
+    def test_does_not_upsample_small_logo(self, tmp_path):
+        """A logo already below print resolution keeps its size."""
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path, size=50)
+
+        assert load_logo(logo_path).getSize() == (50, 50)
+
+    def test_cached_logo_is_decoded_once(self, tmp_path):
+        """Repeated runs in one process reuse the decoded logo until it changes."""
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path)
+
+        first = _cached_logo(logo_path, dpi=72)
+        assert _cached_logo(logo_path, dpi=72) is first
+        assert _cached_logo(logo_path, dpi=300) is not first
+
+        _create_test_image(logo_path, size=50)
+        assert _cached_logo(logo_path, dpi=72).getSize() == (50, 50)
+
+    def test_raises_error_for_invalid_image(self, tmp_path):
+        """A file that is not an image raises ValueError."""
+        logo_path = tmp_path / "logo.png"
+        logo_path.write_text("not an image")
+
+        with pytest.raises(ValueError) as exc_info:
+            load_logo(logo_path)
+
+        assert "not a valid image" in str(exc_info.value)
+
+    def test_logo_is_embedded_once(self, tmp_path):
+        """Every card references a single embedded logo image."""
+        output_path = tmp_path / "test.pdf"
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path)
+
+        generate_pdf(output_path, card_count=6, logo_path=logo_path)
+
+        content = output_path.read_bytes()
+        assert content.count(b"/Subtype /Image") == 1
+
+    def test_generates_single_card_from_seeded_run(self, tmp_path):
+        """A single card of a seeded run can be rendered on its own."""
+        output_path = tmp_path / "card.pdf"
+
+        generate_pdf(
+            output_path,
+            card_count=1,
+            bingo_squares=[f"Item {i}" for i in range(30)],
+            seed=42,
+            first_card_id=7341,
+        )
+
+        content = output_path.read_bytes()
+        page_count = content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+        assert page_count == 1
+
+    def test_card_template_is_defined_once(self, tmp_path):
+        """Static card artwork is recorded in a single form XObject."""
+        output_path = tmp_path / "test.pdf"
+        logo_path = tmp_path / "logo.png"
+        _create_test_image(logo_path)
+
+        generate_pdf(
+            output_path,
+            card_count=6,
+            event_name="Test Event",
+            logo_path=logo_path,
+            bingo_squares=[f"Item {i}" for i in range(24)],
+        )
+
+        content = output_path.read_bytes()
+        assert content.count(b"/Subtype /Form") == 1
+
+
 class TestTextFitting:
     """Tests for text fitting algorithm."""
 
@@ -308,8 +434,99 @@ class TestTextFitting:
                 line_width = pdfmetrics.stringWidth(line, "RobotoMono", font_size)
                 assert line_width <= max_width, f"Line '{line}' exceeds max_width"
 
-    def test_wrap_text_splits_on_words(self):
-        """_wrap_text should split text on word boundaries."""
+    def test_fit_returns_largest_fitting_size(self):
+        """The font-size search returns the largest size that fits."""
+        from reportlab.pdfbase import pdfmetrics
+
         register_fonts()
-        lines = _wrap_text("Hello World Test", "RobotoMono", 12, 50)
-        assert len(lines) > 1
+        clear_layout_cache()
+        text = "Uses OpenTelemetry in prod"
+        _, font_size = _fit_text_in_square(text, 64, 64)
+        assert font_size < MAX_FONT_SIZE
+
+        # One size up must fail either the width or the height check
+        larger = font_size + 1
+        larger_lines = wrap_text(text, "RobotoMono", larger, 64)
+        too_tall = len(larger_lines) * larger * 1.2 > 64
+        too_wide = any(
+            pdfmetrics.stringWidth(line, "RobotoMono", larger) > 64
+            for line in larger_lines
+        )
+        assert too_tall or too_wide
+
+
+class TestLayoutCache:
+    """Tests for the phrase layout cache."""
+
+    def test_repeated_fit_is_a_cache_hit(self):
+        """Fitting the same phrase twice only lays it out once."""
+        register_fonts()
+        clear_layout_cache()
+        first = _fit_text_in_square("Uses OpenTelemetry in prod", 64, 64)
+        second = _fit_text_in_square("Uses OpenTelemetry in prod", 64, 64)
+
+        info = layout_cache_info()
+        assert first == second
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_different_box_size_is_a_miss(self):
+        """The box size is part of the cache key."""
+        register_fonts()
+        clear_layout_cache()
+        _fit_text_in_square("Kubernetes", 64, 64)
+        _fit_text_in_square("Kubernetes", 40, 40)
+        assert layout_cache_info().misses == 2
+
+    def test_fit_version_is_part_of_key(self, monkeypatch):
+        """Layouts fitted by an earlier fitter are fitted again."""
+        register_fonts()
+        clear_layout_cache()
+        _fit_text_in_square("Kubernetes", 64, 64)
+        monkeypatch.setattr("bingomatic.pdf.FIT_VERSION", 999)
+        _fit_text_in_square("Kubernetes", 64, 64)
+        assert layout_cache_info().misses == 2
+
+    def test_evicts_least_recently_used(self):
+        """The cache never grows beyond maxsize."""
+        cache = LayoutCache(maxsize=2)
+        cache.put(("a",), ["a"], 12)
+        cache.put(("b",), ["b"], 12)
+        cache.get(("a",))
+        cache.put(("c",), ["c"], 12)
+
+        assert cache.info().currsize == 2
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == (["a"], 12)
+
+    def test_sidecar_round_trip(self, tmp_path):
+        """Entries saved to a sidecar are restored by load."""
+        sidecar = tmp_path / "layout-cache.json"
+        cache = LayoutCache()
+        cache.put(("Hi", "RobotoMono", 64, 64, 4, 12), ["Hi"], 12)
+        cache.save(sidecar)
+
+        restored = LayoutCache()
+        assert restored.load(sidecar) == 1
+        assert restored.get(("Hi", "RobotoMono", 64, 64, 4, 12)) == (["Hi"], 12)
+
+    def test_corrupt_sidecar_is_ignored(self, tmp_path):
+        """A corrupt sidecar is treated as an empty cache."""
+        sidecar = tmp_path / "layout-cache.json"
+        sidecar.write_text("{not json")
+        assert LayoutCache().load(sidecar) == 0
+
+    def test_generate_pdf_writes_sidecar(self, tmp_path):
+        """generate_pdf persists layouts when given a sidecar path."""
+        sidecar = tmp_path / "layout-cache.json"
+        squares = [f"Item {i}" for i in range(24)]
+
+        generate_pdf(
+            tmp_path / "test.pdf",
+            card_count=2,
+            bingo_squares=squares,
+            layout_cache_path=sidecar,
+        )
+
+        assert sidecar.exists()
+        assert LayoutCache().load(sidecar) >= 24
@@ -0,0 +1,82 @@
+"""Unit tests for the pdfsize module."""
+
+import pytest
+
+from bingomatic.pdf import generate_pdf
+from bingomatic.pdfsize import (
+    SIZE_CATEGORIES,
+    format_size,
+    format_size_report,
+    parse_size,
+    size_report,
+)
+
+
+class TestParseSize:
+    """Tests for reading sizes from the command line."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("50MB", 50_000_000),
+            ("50 mb", 50_000_000),
+            ("1.5G", 1_500_000_000),
+            ("200KiB", 204_800),
+            ("4096", 4096),
+        ],
+    )
+    def test_units(self, text, expected):
+        """Decimal and binary suffixes are both understood."""
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "MB", "50XB", "-5MB"])
+    def test_invalid(self, text):
+        """Anything else is rejected."""
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size(text)
+
+    def test_format_size(self):
+        """Sizes are shown in the largest unit that fits."""
+        assert format_size(512) == "512 B"
+        assert format_size(1_830_000) == "1.8 MB"
+
+
+class TestSizeReport:
+    """Tests for breaking a PDF's size down."""
+
+    @pytest.fixture
+    def pdf(self, tmp_path):
+        return generate_pdf(
+            tmp_path / "cards.pdf",
+            card_count=10,
+            event_name="Test Event",
+            bingo_squares=[f"Item {i}" for i in range(30)],
+            seed=1,
+        )
+
+    def test_categories_add_up_to_file_size(self, pdf):
+        """Every byte of the file is counted in exactly one category."""
+        report = size_report(pdf)
+
+        assert report.total == pdf.stat().st_size
+        assert sum(report.categories.values()) == report.total
+        assert report.page_count == 5
+        assert report.categories["content"] > 0
+        assert report.categories["fonts"] > 0
+
+    def test_embedded_fonts_are_subset(self, pdf):
+        """The bundled fonts are embedded as subsets."""
+        report = size_report(pdf)
+        embedded = {font.name for font in report.fonts if font.embedded}
+
+        assert {"Roboto-Regular", "Roboto-Bold"} <= embedded
+        assert report.full_fonts == []
+
+    def test_format_lists_categories_and_fonts(self, pdf):
+        """The formatted report has a line per category and per font."""
+        text = format_size_report(size_report(pdf))
+
+        assert text.startswith("PDF size: ")
+        for category in SIZE_CATEGORIES:
+            assert f"  {category} " in text
+        assert "font Roboto-Regular (subset" in text
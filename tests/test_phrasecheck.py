@@ -0,0 +1,93 @@
+"""Unit tests for the phrasecheck module."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from bingomatic.phrasecheck import check_phrases, find_duplicates
+
+TOO_LONG = "Pneumonoultramicroscopicsilicovolcanoconiosis"
+POOL = [f"Phrase {i}" for i in range(30)] + [TOO_LONG]
+
+# Checks a pool in a fresh interpreter and reports which heavy modules loaded
+CHECK_SCRIPT = """
+import sys
+from bingomatic.phrasecheck import check_phrases
+report = check_phrases([f"Phrase {i}" for i in range(30)], cache_path=sys.argv[1])
+print(report.checked, *[name in sys.modules for name in ("reportlab", "PIL", "numpy")])
+"""
+
+
+class TestFindDuplicates:
+    """Tests for finding repeated phrases."""
+
+    def test_counts_phrases_listed_twice(self):
+        """Repeats are reported once each, as first spelled, with a count."""
+        phrases = ["On call", "Deploy", "On  call", "Deploy", "Deploy", "Pager"]
+
+        assert find_duplicates(phrases) == {"On call": 2, "Deploy": 3}
+
+    def test_unique_pool_has_none(self):
+        """A pool without repeats has no duplicates."""
+        assert find_duplicates(POOL) == {}
+
+
+class TestCheckPhrases:
+    """Tests for checking a phrase pool."""
+
+    def test_reports_unfittable_phrases(self):
+        """Phrases that overflow at the smallest size are reported once."""
+        report = check_phrases(POOL + [TOO_LONG])
+
+        assert report.unfittable == [TOO_LONG]
+        assert report.duplicates == {TOO_LONG: 2}
+        assert report.checked == len(POOL)
+
+    def test_cache_skips_known_phrases(self, tmp_path):
+        """A second check only lays out phrases added since the first."""
+        cache_path = tmp_path / "fit-cache.json"
+        check_phrases(POOL, cache_path=cache_path)
+
+        report = check_phrases(POOL + ["New phrase"], cache_path=cache_path)
+
+        assert report.checked == 1
+        assert report.unfittable == [TOO_LONG]
+
+    def test_out_of_date_cache_is_ignored(self, tmp_path):
+        """A cache in another format is rebuilt rather than trusted."""
+        cache_path = tmp_path / "fit-cache.json"
+        cache_path.write_text(json.dumps({"version": 0, "phrases": {TOO_LONG: True}}))
+
+        report = check_phrases(POOL, cache_path=cache_path)
+
+        assert report.unfittable == [TOO_LONG]
+        assert report.checked == len(POOL)
+
+    def test_cache_from_another_fitter_is_ignored(self, tmp_path, monkeypatch):
+        """Results from another font, square or fitter are checked again."""
+        cache_path = tmp_path / "fit-cache.json"
+        check_phrases(POOL, cache_path=cache_path)
+        monkeypatch.setattr("bingomatic.textfit.FIT_VERSION", 999)
+
+        report = check_phrases(POOL, cache_path=cache_path)
+
+        assert report.checked == len(POOL)
+
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_check_skips_heavy_imports(self, tmp_path, cached):
+        """Checking loads neither ReportLab, Pillow nor NumPy, cached or not."""
+        cache_path = tmp_path / "fit-cache.json"
+        if cached:
+            check_phrases(POOL, cache_path=cache_path)
+
+        result = subprocess.run(
+            [sys.executable, "-c", CHECK_SCRIPT, str(cache_path)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        checked = "0" if cached else "30"
+        assert result.stdout.split() == [checked, "False", "False", "False"]
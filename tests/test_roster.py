@@ -0,0 +1,85 @@
+"""Unit tests for the roster module."""
+
+import pytest
+
+from bingomatic.roster import Attendee, RosterError, count_roster, read_roster
+
+
+def _write_roster(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+class TestCountRoster:
+    """Tests for counting and checking a roster."""
+
+    def test_counts_rows_skipping_blank_lines(self, tmp_path):
+        """Every non-blank row after the header is an attendee."""
+        roster = _write_roster(
+            tmp_path / "roster.csv", "name,badge_id\nAda,1\n\nGrace,2\n,\nAlan,3\n"
+        )
+
+        assert count_roster(roster) == 3
+
+    def test_missing_name_column_raises(self, tmp_path):
+        """A roster must name its name column."""
+        roster = _write_roster(tmp_path / "roster.csv", "person,badge_id\nAda,1\n")
+
+        with pytest.raises(RosterError, match="no 'name' column"):
+            count_roster(roster)
+
+    def test_row_without_name_raises(self, tmp_path):
+        """A row with a badge but no name is reported with its line number."""
+        roster = _write_roster(tmp_path / "roster.csv", "name,badge_id\nAda,1\n,2\n")
+
+        with pytest.raises(RosterError, match="Line 3 of the roster has no name"):
+            count_roster(roster)
+
+    def test_missing_file_raises(self, tmp_path):
+        """An unreadable roster raises RosterError."""
+        with pytest.raises(RosterError, match="Cannot read roster"):
+            count_roster(tmp_path / "missing.csv")
+
+
+class TestReadRoster:
+    """Tests for streaming attendees from a roster."""
+
+    def test_reads_names_and_badges(self, tmp_path):
+        """Columns are found by header, in any case and order, after a BOM."""
+        roster = _write_roster(
+            tmp_path / "roster.csv",
+            "\ufeffBadge_ID, Name ,team\n17, Ada Lovelace ,x\n,Grace Hopper,y\n",
+        )
+
+        assert list(read_roster(roster)) == [
+            Attendee("Ada Lovelace", "17"),
+            Attendee("Grace Hopper", None),
+        ]
+
+    def test_badge_column_is_optional(self, tmp_path):
+        """Without a badge_id column attendees have no badge ID."""
+        roster = _write_roster(tmp_path / "roster.csv", "name\nAda\n")
+
+        assert list(read_roster(roster)) == [Attendee("Ada")]
+
+    def test_start_skips_rows(self, tmp_path):
+        """Reading resumes after the given number of rows."""
+        names = "\n".join(f"Person {i}" for i in range(10))
+        roster = _write_roster(tmp_path / "roster.csv", f"name\n{names}\n")
+
+        attendees = read_roster(roster, start=7)
+
+        assert [attendee.name for attendee in attendees] == [
+            "Person 7",
+            "Person 8",
+            "Person 9",
+        ]
+
+    def test_reads_lazily(self, tmp_path):
+        """Rows are only read as attendees are taken."""
+        roster = _write_roster(tmp_path / "roster.csv", "name\nAda\n")
+        attendees = read_roster(roster)
+        roster.unlink()
+
+        with pytest.raises(RosterError):
+            next(attendees)
@@ -0,0 +1,121 @@
+"""Unit tests for the runrecord module."""
+
+from PIL import Image
+
+from bingomatic.imposition import page_layout
+from bingomatic.runrecord import (
+    RUN_RECORD_VERSION,
+    RunRecord,
+    load_run_record,
+    run_fingerprint,
+    run_record_path,
+    save_run_record,
+)
+
+
+def _config(tmp_path, **overrides):
+    logo = tmp_path / "logo.png"
+    if not logo.exists():
+        Image.new("RGB", (10, 10), color="blue").save(logo)
+    config = {
+        "event_name": "Test Event",
+        "logo_location": str(logo),
+        "output_directory": str(tmp_path),
+        "card_count": 10,
+        "bingo_squares": [f"Item {i}" for i in range(30)],
+    }
+    config.update(overrides)
+    return config
+
+
+def _fingerprint(
+    config,
+    seed=None,
+    unique=None,
+    manifest=True,
+    logo_dpi=300,
+    layout=None,
+    optimize=False,
+):
+    layout = layout or page_layout()
+    return run_fingerprint(config, seed, unique, manifest, logo_dpi, layout, optimize)
+
+
+class TestRunFingerprint:
+    """Tests for fingerprinting run settings."""
+
+    def test_ignores_card_count(self, tmp_path):
+        """Runs differing only in card_count share a fingerprint."""
+        assert _fingerprint(_config(tmp_path)) == _fingerprint(
+            _config(tmp_path, card_count=800)
+        )
+
+    def test_covers_cards_and_options(self, tmp_path):
+        """Anything that changes the cards changes the fingerprint."""
+        config = _config(tmp_path)
+        base = _fingerprint(config)
+        variants = [
+            _fingerprint(_config(tmp_path, event_name="Other")),
+            _fingerprint(_config(tmp_path, bingo_squares=["x"] * 30)),
+            _fingerprint(config, seed=1),
+            _fingerprint(config, unique="set"),
+            _fingerprint(config, manifest=False),
+            _fingerprint(config, logo_dpi=150),
+            _fingerprint(config, layout=page_layout("tabloid")),
+            _fingerprint(config, optimize=True),
+        ]
+        assert base not in variants
+        assert len(set(variants)) == len(variants)
+
+    def test_covers_code_versions(self, tmp_path, monkeypatch):
+        """A change to rendering, fitting or sampling changes the fingerprint."""
+        config = _config(tmp_path)
+        before = _fingerprint(config)
+        names = [
+            "RUN_FORMAT_VERSION",
+            "LAYOUT_CACHE_VERSION",
+            "CARD_SEED_VERSION",
+            "FIT_VERSION",
+        ]
+        for name in names:
+            with monkeypatch.context() as patch:
+                patch.setattr(f"bingomatic.runrecord.{name}", 999)
+                assert _fingerprint(config) != before
+        assert _fingerprint(config) == before
+
+    def test_covers_logo_contents(self, tmp_path):
+        """Replacing the logo image changes the fingerprint."""
+        config = _config(tmp_path)
+        before = _fingerprint(config)
+        Image.new("RGB", (10, 10), color="red").save(config["logo_location"])
+        assert _fingerprint(config) != before
+
+
+class TestRunRecordFile:
+    """Tests for reading and writing run records."""
+
+    def test_round_trip(self, tmp_path):
+        """A saved record loads back unchanged."""
+        path = run_record_path(tmp_path / "bingo-cards-2025-12-25.pdf")
+        record = RunRecord("abc", 500, 42)
+
+        save_run_record(path, record)
+
+        assert path.name == "bingo-cards-2025-12-25.run.json"
+        assert load_run_record(path) == record
+
+    def test_missing_or_damaged_record_is_ignored(self, tmp_path):
+        """Unusable records read as None."""
+        path = tmp_path / "cards.run.json"
+        assert load_run_record(path) is None
+
+        path.write_text("{not json")
+        assert load_run_record(path) is None
+
+        path.write_text('{"version": 999, "fingerprint": "a"}')
+        assert load_run_record(path) is None
+
+        path.write_text(
+            f'{{"version": {RUN_RECORD_VERSION}, "data": {{"fingerprint": "a"}}}}'
+        )
+        assert load_run_record(path) is None
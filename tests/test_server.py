@@ -0,0 +1,262 @@
+"""Unit tests for the server module."""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+from PIL import Image
+
+from bingomatic.server import (
+    MAX_BODY_BYTES,
+    MAX_REQUEST_CARDS,
+    CardService,
+    RequestError,
+    create_server,
+    parse_card_request,
+)
+
+
+@pytest.fixture(scope="module")
+def logo_dir(tmp_path_factory):
+    """A logo directory holding one logo."""
+    logo_dir = tmp_path_factory.mktemp("logos")
+    Image.new("RGB", (100, 100), color="blue").save(logo_dir / "logo.png")
+    return logo_dir
+
+
+@pytest.fixture
+def card_request():
+    """A valid card request using a logo from the logo directory."""
+    return {
+        "event_name": "Test Event",
+        "logo_location": "logo.png",
+        "bingo_squares": [f"Item {i}" for i in range(30)],
+        "card_count": 2,
+    }
+
+
+@pytest.fixture(scope="module")
+def service(logo_dir):
+    """A card service with one worker and no queue."""
+    service = CardService(workers=1, queue_size=0, logo_dir=logo_dir)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def server(service):
+    """An HTTP server on a free port, handling requests in a thread."""
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _raw_request(server, request):
+    """Send raw request bytes and return the response's status code."""
+    with socket.create_connection(server.server_address) as client:
+        client.sendall(request)
+        status_line = client.makefile("rb").readline()
+    return int(status_line.split()[1])
+
+
+def _request(server, method, path, body=None):
+    """Send a request and return (status, headers, body)."""
+    connection = http.client.HTTPConnection(*server.server_address)
+    try:
+        connection.request(method, path, body)
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+class TestParseCardRequest:
+    """Tests for validating card requests."""
+
+    def test_valid_request(self, card_request, logo_dir):
+        """A config-shaped request becomes generate_pdf arguments."""
+        options = parse_card_request(
+            {**card_request, "seed": 7, "unique": "set"}, logo_dir
+        )
+
+        assert options["card_count"] == 2
+        assert options["event_name"] == "Test Event"
+        assert options["logo_path"] == (logo_dir / "logo.png").resolve()
+        assert options["seed"] == 7
+        assert options["unique"] == "set"
+
+    def test_output_directory_is_optional(self, card_request, logo_dir):
+        """output_directory may be left out, but is accepted if present."""
+        parse_card_request({**card_request, "output_directory": "/tmp"}, logo_dir)
+
+    def test_reports_every_config_error(self):
+        """Config validation errors are all reported."""
+        with pytest.raises(RequestError) as exc_info:
+            parse_card_request({"card_count": 0})
+
+        errors = exc_info.value.errors
+        assert "Missing required field: event_name" in errors
+        assert "Field 'card_count' must be a positive integer (>= 1)" in errors
+
+    def test_rejects_bad_seed_and_unique(self, card_request, logo_dir):
+        """seed and unique are checked like the generate options."""
+        with pytest.raises(RequestError) as exc_info:
+            parse_card_request({**card_request, "seed": -1, "unique": "nope"}, logo_dir)
+
+        assert len(exc_info.value.errors) == 2
+
+    def test_rejects_large_requests(self, card_request, logo_dir):
+        """A single request can't ask for more than MAX_REQUEST_CARDS."""
+        with pytest.raises(RequestError, match="at most"):
+            parse_card_request(
+                {**card_request, "card_count": MAX_REQUEST_CARDS + 1}, logo_dir
+            )
+
+    def test_rejects_missing_logo(self, card_request, logo_dir):
+        """A logo that isn't in the logo directory is reported before rendering."""
+        with pytest.raises(RequestError, match="Logo file not found: none.png"):
+            parse_card_request({**card_request, "logo_location": "none.png"}, logo_dir)
+
+    def test_rejects_logos_outside_logo_dir(self, card_request, logo_dir, tmp_path):
+        """Clients can't make the server read files outside the logo directory."""
+        secret = tmp_path / "secret.png"
+        Image.new("RGB", (10, 10)).save(secret)
+        escape = logo_dir / "escape.png"
+        escape.unlink(missing_ok=True)
+        escape.symlink_to(secret)
+
+        for location in [str(secret), "../secret.png", "escape.png", "/etc/passwd"]:
+            with pytest.raises(RequestError, match="must name a file in the logo"):
+                parse_card_request(
+                    {**card_request, "logo_location": location}, logo_dir
+                )
+
+    def test_accepts_absolute_path_inside_logo_dir(self, card_request, logo_dir):
+        """A full path is fine as long as it lies in the logo directory."""
+        location = str(logo_dir / "logo.png")
+        options = parse_card_request(
+            {**card_request, "logo_location": location}, logo_dir
+        )
+
+        assert options["logo_path"] == (logo_dir / "logo.png").resolve()
+
+    def test_rejects_logos_without_logo_dir(self, card_request):
+        """A service without a logo directory accepts no logo at all."""
+        with pytest.raises(RequestError, match="no logo directory"):
+            parse_card_request(card_request)
+
+    def test_rejects_non_object(self):
+        """The body must be a JSON object."""
+        with pytest.raises(RequestError, match="JSON object"):
+            parse_card_request(["not", "an", "object"])
+
+
+class TestCardServer:
+    """Tests for the HTTP service."""
+
+    def test_renders_pdf(self, server, card_request):
+        """POST /cards returns the rendered PDF."""
+        status, headers, body = _request(
+            server, "POST", "/cards", json.dumps(card_request)
+        )
+
+        assert status == 200
+        assert headers["Content-Type"] == "application/pdf"
+        assert body.startswith(b"%PDF")
+
+    def test_invalid_request_is_400(self, server):
+        """Invalid configs are rejected with their errors."""
+        status, _, body = _request(server, "POST", "/cards", json.dumps({}))
+
+        assert status == 400
+        assert "Missing required field: event_name" in json.loads(body)["errors"]
+
+    def test_invalid_json_is_400(self, server):
+        """A body that isn't JSON is rejected."""
+        status, _, body = _request(server, "POST", "/cards", "{not json")
+
+        assert status == 400
+        assert json.loads(body)["errors"][0].startswith("Invalid JSON body")
+
+    def test_missing_content_length_is_411(self, server):
+        """A body of unstated length is refused rather than read."""
+        status = _raw_request(server, b"POST /cards HTTP/1.1\r\nHost: x\r\n\r\n")
+        assert status == 411
+
+    def test_invalid_content_length_is_400(self, server):
+        """Non-numeric and negative lengths are rejected."""
+        for length in [b"abc", b"-5", b"1e3"]:
+            status = _raw_request(
+                server,
+                b"POST /cards HTTP/1.1\r\nHost: x\r\nContent-Length: "
+                + length
+                + b"\r\n\r\n{}",
+            )
+            assert status == 400
+
+    def test_oversized_body_is_413(self, server):
+        """A declared length over the limit is refused without reading it."""
+        length = str(MAX_BODY_BYTES + 1).encode()
+        status = _raw_request(
+            server,
+            b"POST /cards HTTP/1.1\r\nHost: x\r\nContent-Length: "
+            + length
+            + b"\r\n\r\n",
+        )
+        assert status == 413
+
+    def test_full_queue_is_503(self, server, service, card_request):
+        """With every slot taken, requests are turned away immediately."""
+        service._slots.acquire()
+        try:
+            status, headers, _ = _request(
+                server, "POST", "/cards", json.dumps(card_request)
+            )
+        finally:
+            service._slots.release()
+
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+
+    def test_health(self, server):
+        """GET /health describes the worker pool."""
+        status, _, body = _request(server, "GET", "/health")
+
+        assert status == 200
+        assert json.loads(body) == {
+            "status": "ok",
+            "workers": 1,
+            "queue_size": 0,
+            "in_flight": 0,
+        }
+
+    def test_unknown_path_is_404(self, server):
+        """Only /cards and /health are served."""
+        assert _request(server, "GET", "/nope")[0] == 404
+        assert _request(server, "POST", "/nope", "{}")[0] == 404
+
+    def test_unix_socket(self, service, tmp_path):
+        """The service can listen on a Unix socket instead of a port."""
+        socket_path = tmp_path / "bingomatic.sock"
+        server = create_server(service, socket_path=socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(socket_path))
+                client.sendall(
+                    b"GET /health HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+                )
+                response = b""
+                while chunk := client.recv(4096):
+                    response += chunk
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.startswith(b"HTTP/1.1 200")
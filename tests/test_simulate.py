@@ -0,0 +1,78 @@
+"""Unit tests for the simulate module."""
+
+import numpy as np
+
+from bingomatic.simulate import percentiles, simulate_games
+from bingomatic.verify import card_matrix, find_winners
+
+SQUARES = [f"Item {i}" for i in range(40)]
+
+
+def _call_order(seed: int, phrase_count: int) -> list[int]:
+    """Replay the call order of the first simulated game for a seed."""
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, phrase_count + 1, dtype=np.uint8)
+    call_numbers = rng.permuted(ranks[:, None], axis=0)[:, 0]
+    return np.argsort(call_numbers).tolist()
+
+
+class TestSimulateGames:
+    """Tests for simulated games."""
+
+    def test_matches_verify(self):
+        """A simulated game agrees with checking its calls one by one."""
+        cards = card_matrix(SQUARES, 200, seed=4)
+        result = simulate_games(cards, SQUARES, games=1, calls=(20,), seed=9)
+        called = [SQUARES[i] for i in _call_order(9, len(SQUARES))]
+
+        first = int(result.first_bingo[0])
+        assert find_winners(cards, SQUARES, called[: first - 1]) == []
+        winners = find_winners(cards, SQUARES, called[:first])
+        assert len(winners) == result.first_winners[0]
+        assert (
+            len(find_winners(cards, SQUARES, called[:20]))
+            == (result.winners_after[20][0])
+        )
+
+    def test_first_bingo_needs_at_least_four_calls(self):
+        """Even through the free square a line needs four calls."""
+        cards = card_matrix(SQUARES, 100, seed=1)
+        result = simulate_games(cards, SQUARES, games=500, seed=2)
+        assert result.first_bingo.min() >= 4
+        assert (result.first_winners >= 1).all()
+
+    def test_every_card_wins_once_everything_is_called(self):
+        """All cards have won after every phrase is called."""
+        cards = card_matrix(SQUARES, 50, seed=1)
+        result = simulate_games(cards, SQUARES, games=10, calls=(40,), seed=2)
+        assert (result.winners_after[40] == 50).all()
+
+    def test_is_reproducible(self):
+        """The same seed replays the same games."""
+        cards = card_matrix(SQUARES, 50, seed=1)
+        first = simulate_games(cards, SQUARES, games=100, seed=3)
+        second = simulate_games(cards, SQUARES, games=100, seed=3)
+        assert np.array_equal(first.first_bingo, second.first_bingo)
+
+    def test_spans_several_batches(self):
+        """Results are filled in for every game, not just the first batch."""
+        cards = card_matrix(SQUARES, 20, seed=1)
+        result = simulate_games(cards, SQUARES, games=150, seed=5)
+        assert len(result.first_bingo) == 150
+        assert result.first_bingo.min() >= 4
+
+    def test_repeated_phrases_are_called_together(self):
+        """A pool with duplicates is simulated over its distinct phrases."""
+        squares = SQUARES[:30] + SQUARES[:10]
+        cards = card_matrix(squares, 20, seed=1)
+        result = simulate_games(cards, squares, games=20, calls=(30,), seed=5)
+        assert (result.winners_after[30] == 20).all()
+
+
+class TestPercentiles:
+    """Tests for percentile reporting."""
+
+    def test_reports_observed_values(self):
+        """Percentiles are values that actually occurred."""
+        values = np.array([4, 5, 5, 6, 9])
+        assert percentiles(values, (0, 50, 100)) == [4, 5, 9]
@@ -0,0 +1,134 @@
+"""Unit tests for the textfit module."""
+
+import subprocess
+import sys
+
+import pytest
+
+from bingomatic.imposition import SQUARE_SIZE
+from bingomatic.metrics import get_font_metrics
+from bingomatic.pdf import register_fonts
+from bingomatic.textfit import (
+    FIT_FONT,
+    LINE_SPACING,
+    MIN_FONT_SIZE,
+    SQUARE_PADDING,
+    compute_text_fit,
+    fit_fingerprint,
+    load_fit_font,
+    phrase_fits,
+    wrap_text,
+)
+
+CONTENT_SIZE = SQUARE_SIZE - (SQUARE_PADDING * 2)
+
+# Fits a phrase in a fresh interpreter and reports which heavy modules loaded
+FIT_SCRIPT = """
+import sys
+from bingomatic.textfit import load_fit_font, phrase_fits
+load_fit_font()
+phrase_fits("Uses OpenTelemetry in prod")
+print(*[name in sys.modules for name in ("reportlab", "PIL", "numpy")])
+"""
+
+
+class TestWrapText:
+    """Tests for wrapping text on word boundaries."""
+
+    def test_splits_on_words(self):
+        """wrap_text should split text on word boundaries."""
+        register_fonts()
+        lines = wrap_text("Hello World Test", FIT_FONT, 12, 50)
+        assert len(lines) > 1
+
+    def test_places_overlong_word_on_its_own_line(self):
+        """A word wider than max_width still gets a line of its own."""
+        register_fonts()
+        lines = wrap_text("a Supercalifragilistic b", FIT_FONT, 12, 50)
+        assert lines == ["a", "Supercalifragilistic", "b"]
+
+
+class TestComputeTextFit:
+    """Tests for the font-size search."""
+
+    def test_supports_fractional_font_sizes(self, monkeypatch):
+        """A fractional FONT_SIZE_STEP yields sizes between whole points."""
+        register_fonts()
+        monkeypatch.setattr("bingomatic.textfit.FONT_SIZE_STEP", 0.1)
+        _, whole_size = compute_text_fit("OpenTelemetry", 64, 64)
+        monkeypatch.setattr("bingomatic.textfit.FONT_SIZE_STEP", 1)
+        _, coarse_size = compute_text_fit("OpenTelemetry", 64, 64)
+
+        assert coarse_size <= whole_size < coarse_size + 1
+        assert whole_size != int(whole_size)
+
+
+class TestPhraseFits:
+    """Tests for checking a phrase against its square."""
+
+    def test_agrees_with_fitter(self):
+        """phrase_fits is false exactly when the fitter overflows its box."""
+        register_fonts()
+
+        assert phrase_fits("Uses OpenTelemetry in prod")
+        assert not phrase_fits("Pneumonoultramicroscopicsilicovolcanoconiosis")
+        assert not phrase_fits(" ".join(["word"] * 80))
+        lines, font_size = compute_text_fit(
+            " ".join(["word"] * 80), CONTENT_SIZE, CONTENT_SIZE
+        )
+        assert font_size == MIN_FONT_SIZE
+        assert len(lines) * font_size * LINE_SPACING > CONTENT_SIZE
+
+    def test_fit_font_measures_like_registered_font(self):
+        """Advances read from the font file match the registered font's."""
+        register_fonts()
+        registered = get_font_metrics(FIT_FONT)
+        load_fit_font()
+        loaded = get_font_metrics(FIT_FONT)
+
+        assert loaded is not registered
+        assert loaded.advances == registered.advances
+        assert loaded.default_width == registered.default_width
+
+    def test_fitting_skips_heavy_imports(self):
+        """Fitting a phrase loads neither ReportLab, Pillow nor NumPy."""
+        result = subprocess.run(
+            [sys.executable, "-c", FIT_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.split() == ["False", "False", "False"]
+
+
+class TestFitFingerprint:
+    """Tests for the digest of the fitting inputs."""
+
+    def test_is_stable(self):
+        """The same inputs give the same fingerprint."""
+        assert fit_fingerprint() == fit_fingerprint()
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "FIT_VERSION",
+            "SQUARE_SIZE",
+            "SQUARE_PADDING",
+            "MIN_FONT_SIZE",
+            "MAX_FONT_SIZE",
+        ],
+    )
+    def test_covers_fitting_inputs(self, monkeypatch, name):
+        """Changing the fitter, the square or the size bounds changes it."""
+        before = fit_fingerprint()
+        monkeypatch.setattr(f"bingomatic.textfit.{name}", 999)
+        assert fit_fingerprint() != before
+
+    def test_covers_font_file(self, tmp_path, monkeypatch):
+        """Replacing the font file changes the fingerprint."""
+        before = fit_fingerprint()
+        font_path = tmp_path / "font.ttf"
+        font_path.write_bytes(b"not the bundled font")
+        monkeypatch.setattr("bingomatic.textfit.FIT_FONT_PATH", font_path)
+        assert fit_fingerprint() != before
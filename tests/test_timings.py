@@ -0,0 +1,85 @@
+"""Unit tests for the timings module."""
+
+from bingomatic.pdf import generate_pdf
+from bingomatic.timings import StageTimings, recording, stage
+
+
+class TestStage:
+    """Tests for marking stages."""
+
+    def test_no_op_when_not_recording(self):
+        """Stages outside a recording are not timed anywhere."""
+        timings = StageTimings()
+        with stage("idle"):
+            pass
+        assert timings.calls == {}
+
+    def test_counts_calls_and_time(self):
+        """Each call of a stage is counted and its time accumulated."""
+        timings = StageTimings()
+        with recording(timings):
+            for _ in range(3):
+                with stage("work"):
+                    sum(range(1000))
+
+        assert timings.calls == {"work": 3}
+        assert timings.seconds["work"] > 0
+        assert timings.total_seconds >= timings.seconds["work"]
+
+    def test_recording_is_restored(self):
+        """Stages after a recording ends are no longer timed."""
+        timings = StageTimings()
+        with recording(timings):
+            pass
+        with stage("late"):
+            pass
+        assert "late" not in timings.calls
+
+
+class TestStageTimingsReport:
+    """Tests for summarizing timings."""
+
+    def test_as_dict_reports_cards_per_second(self):
+        """Stage rates are cards divided by the stage's wall time."""
+        timings = StageTimings()
+        timings.seconds = {"draw": 2.0}
+        timings.calls = {"draw": 10}
+        timings.total_seconds = 4.0
+
+        summary = timings.as_dict(card_count=10)
+
+        assert summary["cards_per_second"] == 2.5
+        assert summary["stages"] == [
+            {"name": "draw", "seconds": 2.0, "calls": 10, "cards_per_second": 5.0}
+        ]
+
+    def test_format_lists_every_stage(self):
+        """The table has a row per stage plus the total."""
+        timings = StageTimings()
+        timings.seconds = {"load": 0.5, "draw": 1.5}
+        timings.calls = {"load": 1, "draw": 4}
+        timings.total_seconds = 2.0
+
+        lines = timings.format(card_count=4).splitlines()
+
+        assert lines[0].split() == ["Stage", "Calls", "Seconds", "Cards/s"]
+        assert [line.split()[0] for line in lines[1:]] == ["load", "draw", "total"]
+
+
+class TestGeneratePdfStages:
+    """Tests for the stages marked by generate_pdf."""
+
+    def test_generate_pdf_stages(self, tmp_path):
+        """A run records its setup, per-card and save stages."""
+        timings = StageTimings()
+        with recording(timings):
+            generate_pdf(
+                tmp_path / "test.pdf",
+                card_count=4,
+                bingo_squares=[f"Item {i}" for i in range(30)],
+            )
+
+        assert timings.calls["register_fonts"] == 1
+        assert timings.calls["choose_squares"] == 4
+        assert timings.calls["draw_squares"] == 4
+        assert timings.calls["save_pdf"] == 1
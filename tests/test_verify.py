@@ -0,0 +1,145 @@
+"""Unit tests for the verify module."""
+
+import numpy as np
+
+from bingomatic import verify
+from bingomatic.cards import CardSampler
+from bingomatic.verify import (
+    FREE_SQUARE_MASK,
+    SQUARE_POSITIONS,
+    WINNING_LINES,
+    called_flags,
+    card_matrix,
+    coverage_masks,
+    find_winners,
+    winning_rows,
+)
+
+SQUARES = [f"Item {i}" for i in range(40)]
+
+
+def _called_positions(card, positions):
+    """Return the phrases on a card at the given grid positions."""
+    by_position = dict(zip(SQUARE_POSITIONS, card, strict=True))
+    return [by_position[pos] for pos in positions if pos in by_position]
+
+
+class TestWinningLines:
+    """Tests for the winning line masks."""
+
+    def test_twelve_lines_of_five(self):
+        """There are five rows, five columns and two diagonals."""
+        assert len(WINNING_LINES) == 12
+        assert all(int(line).bit_count() == 5 for line in WINNING_LINES)
+
+    def test_diagonals_cross_the_free_square(self):
+        """Both diagonals pass through the center square."""
+        assert all(int(line) & FREE_SQUARE_MASK for line in WINNING_LINES[-2:])
+
+
+class TestCardMatrix:
+    """Tests for rebuilding a run's cards."""
+
+    def test_matches_sampler(self):
+        """Each row holds the indices of the matching card's squares."""
+        cards = card_matrix(SQUARES, 10, seed=5)
+        sampler = CardSampler(SQUARES, seed=5)
+        assert cards.shape == (10, 24)
+        assert cards.dtype == np.uint16
+        assert [SQUARES[i] for i in cards[6]] == sampler.squares(7)
+
+    def test_bulk_replay_matches_sampler_for_any_pool(self):
+        """Small and large pools, across chunks, give the sampler's cards."""
+        for pool_size in [24, 277, 278, 1000]:
+            squares = [f"Phrase {i}" for i in range(pool_size)]
+            cards = card_matrix(squares, 300, seed=3, first_card_id=8190)
+            sampler = CardSampler(squares, seed=3)
+            expected = [sampler.indices(card_id) for card_id in range(8190, 8490)]
+            assert cards.tolist() == expected
+
+    def test_cards_outrunning_the_replay_use_the_sampler(self, monkeypatch):
+        """Cards needing more outputs than were replayed are drawn one by one."""
+        monkeypatch.setattr("bingomatic.verify._MT_OUTPUTS", 26)
+        squares = [f"Phrase {i}" for i in range(257)]
+
+        cards = card_matrix(squares, 50, seed=9)
+
+        sampler = CardSampler(squares, seed=9)
+        assert cards.tolist() == [sampler.indices(card_id) for card_id in range(1, 51)]
+
+    def test_replay_disagreeing_with_sampler_is_abandoned(self, monkeypatch):
+        """If the replay stops matching random.Random, the sampler draws."""
+        replay = verify._mt_outputs
+        monkeypatch.setattr("bingomatic.verify._mt_outputs", lambda keys: ~replay(keys))
+
+        cards = card_matrix(SQUARES, 50, seed=9)
+
+        sampler = CardSampler(SQUARES, seed=9)
+        assert cards.tolist() == [sampler.indices(card_id) for card_id in range(1, 51)]
+
+    def test_unique_offset_replays_earlier_cards(self):
+        """A later slice of a unique run matches the full run."""
+        squares = [f"Item {i}" for i in range(26)]
+        full = card_matrix(squares, 30, seed=3, unique="set")
+        tail = card_matrix(squares, 10, seed=3, unique="set", first_card_id=21)
+        assert np.array_equal(full[20:], tail)
+
+
+class TestFindWinners:
+    """Tests for winner detection."""
+
+    def test_no_calls_no_winners(self):
+        """The free square alone never wins."""
+        cards = card_matrix(SQUARES, 50, seed=1)
+        assert find_winners(cards, SQUARES, []) == []
+
+    def test_all_calls_every_card_wins(self):
+        """Calling every phrase completes every card."""
+        cards = card_matrix(SQUARES, 50, seed=1)
+        assert find_winners(cards, SQUARES, SQUARES) == list(range(1, 51))
+
+    def test_row_wins(self):
+        """Covering a full row wins."""
+        cards = card_matrix(SQUARES, 20, seed=1)
+        card = [SQUARES[i] for i in cards[3]]
+        called = _called_positions(card, range(5, 10))
+        assert 4 in find_winners(cards, SQUARES, called)
+
+    def test_column_wins(self):
+        """Covering a full column wins."""
+        cards = card_matrix(SQUARES, 20, seed=1)
+        card = [SQUARES[i] for i in cards[3]]
+        called = _called_positions(card, range(1, 25, 5))
+        assert 4 in find_winners(cards, SQUARES, called)
+
+    def test_diagonal_wins_with_free_square(self):
+        """Four diagonal calls plus the free square win."""
+        cards = card_matrix(SQUARES, 20, seed=1)
+        card = [SQUARES[i] for i in cards[3]]
+        called = _called_positions(card, [0, 6, 18, 24])
+        assert len(called) == 4
+        assert 4 in find_winners(cards, SQUARES, called)
+
+    def test_incomplete_line_does_not_win(self):
+        """Four squares of a row without the free square don't win."""
+        cards = card_matrix(SQUARES, 1, seed=1)
+        card = [SQUARES[i] for i in cards[0]]
+        called = _called_positions(card, range(4))
+        masks = coverage_masks(cards, called_flags(SQUARES, called))
+        assert len(winning_rows(masks)) == 0
+
+    def test_first_card_id_offsets_results(self):
+        """Winner IDs are offset by the ID of the first row."""
+        cards = card_matrix(SQUARES, 3, seed=1, first_card_id=100)
+        assert find_winners(cards, SQUARES, SQUARES, first_card_id=100) == [
+            100,
+            101,
+            102,
+        ]
+
+    def test_duplicate_phrases_are_covered_together(self):
+        """Calling a repeated phrase covers each of its entries."""
+        squares = ["Same"] * 5 + [f"Item {i}" for i in range(20)]
+        flags = called_flags(squares, ["Same"])
+        assert flags[:5].all()
+        assert not flags[5:].any()